@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+ARCHIVE_FORMATS = ("none", "zip", "tar")
+ARCHIVES_DIRNAME = "archives"
+# The earliest timestamp a zip entry can carry; tar entries use the epoch.
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+ZIP_LEVEL = 9
+# Already-compressed payloads are stored; deflating them only costs time.
+STORED_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".gz", ".zip"}
+
+
+def archive_relative_path(slug: str, archive_format: str) -> str:
+    return f"{ARCHIVES_DIRNAME}/{slug}.{archive_format}"
+
+
+def _zip_bytes(entries: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in sorted(entries):
+            info = zipfile.ZipInfo(name, date_time=ZIP_TIMESTAMP)
+            info.create_system = 3
+            info.external_attr = 0o644 << 16
+            if Path(name).suffix.lower() in STORED_SUFFIXES:
+                info.compress_type = zipfile.ZIP_STORED
+                archive.writestr(info, entries[name])
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, entries[name], compresslevel=ZIP_LEVEL)
+    return buffer.getvalue()
+
+
+def _tar_bytes(entries: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w", format=tarfile.USTAR_FORMAT) as archive:
+        for name in sorted(entries):
+            info = tarfile.TarInfo(name)
+            info.size = len(entries[name])
+            info.mode = 0o644
+            info.mtime = 0
+            archive.addfile(info, io.BytesIO(entries[name]))
+    return buffer.getvalue()
+
+
+def build_archive(entries: dict[str, bytes | Path], archive_format: str) -> bytes:
+    """Pack entries (archive name -> bytes, or a file to read) reproducibly.
+
+    Entry order, timestamps, modes and compression are fixed, so identical
+    inputs always give identical archive bytes.
+    """
+    payloads = {
+        name: value.read_bytes() if isinstance(value, Path) else value
+        for name, value in entries.items()
+    }
+    if archive_format == "zip":
+        return _zip_bytes(payloads)
+    if archive_format == "tar":
+        return _tar_bytes(payloads)
+    raise ValueError(f"Unknown archive format: {archive_format}")
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+ASSET_MODES = ("copy", "link", "reference")
+ASSETS_DIRNAME = "assets"
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def asset_relative_path(digest: str, suffix: str) -> str:
+    return f"{ASSETS_DIRNAME}/{digest}{suffix.lower()}"
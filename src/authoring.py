@@ -11,6 +11,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Iterable
 
+from src import source_cache
 
 HEADING_PATTERN = re.compile(r"^(?P<level>#+)\s+(?P<title>.+?)\s*$")
 SLUG_PATTERN = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
@@ -1044,6 +1045,10 @@ def json_dumps(payload: Any) -> str:
 
 
 def parse_meta_yaml(path: Path) -> dict[str, Any]:
+    return source_cache.cached_load("meta_yaml", path, _read_meta_yaml)
+
+
+def _read_meta_yaml(path: Path) -> dict[str, Any]:
     text = path.read_text(encoding="utf-8")
     if text.strip().startswith("{"):
         import json
@@ -1092,6 +1097,10 @@ def _parse_scalar(value: str) -> Any:
 def load_spec_fields(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {}
+    return source_cache.cached_load("spec_fields", path, _read_spec_fields)
+
+
+def _read_spec_fields(path: Path) -> dict[str, Any]:
     text = path.read_text(encoding="utf-8").strip()
     if not text:
         return {}
@@ -1179,6 +1188,10 @@ def _dedupe_sorted_embedded_entries(entries: list[EmbeddedEntry]) -> list[Embedd
 def load_short_description(path: Path) -> str:
     if not path.exists():
         return ""
+    return source_cache.cached_load("short_description", path, _read_short_description)
+
+
+def _read_short_description(path: Path) -> str:
     return path.read_text(encoding="utf-8").strip()
 
 
@@ -1243,6 +1256,26 @@ def build_run_id(slug: str) -> str:
     return f"{timestamp}-{slug}"
 
 
+def new_run_dir(runs_root: Path, slug: str) -> Path:
+    """Create and return a run directory no earlier stage has used.
+
+    Cached LLM responses return within the same second, so stages that
+    would share a run ID get a -2, -3, ... suffix instead of overwriting
+    each other's logs.
+    """
+    runs_root.mkdir(parents=True, exist_ok=True)
+    run_id = build_run_id(slug)
+    suffix = 1
+    while True:
+        run_dir = runs_root / (run_id if suffix == 1 else f"{run_id}-{suffix}")
+        try:
+            run_dir.mkdir()
+        except FileExistsError:
+            suffix += 1
+            continue
+        return run_dir
+
+
 def extract_output_sections(output_text: str) -> tuple[str, str]:
     marker = "---SHORT_DESCRIPTION---"
     if marker in output_text:
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+import platform
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from src.exporter import ExportOptions
+from src.generator import EMBEDDED_ENTRY_LIMIT, EMBEDDED_ENTRY_TYPES, GENERATOR_VERSION, build_site_data
+from src.search import SEARCH_DIRNAME, SearchIndex
+
+BENCH_VERSION = 2
+DEFAULT_OUTPUT = Path("dist") / "bench_results.json"
+BENCH_MARKER = ".botparts-bench"
+SEARCH_QUERIES = 50
+_WORDS = (
+    "amber", "archive", "bastion", "cinder", "compass", "drift", "ember", "fable", "garden", "harbor",
+    "hollow", "ivory", "lantern", "meadow", "mirror", "nomad", "orchard", "quiet", "raven", "relic",
+    "signal", "silver", "summit", "thistle", "tide", "umber", "vigil", "willow", "winter", "zephyr",
+)
+
+
+@dataclass(frozen=True)
+class CorpusConfig:
+    characters: int = 100
+    variants: int = 1
+    entries_per_type: int = 2
+    png_bytes: int = 16 * 1024
+    seed: int = 0
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, rng.randint(6, 14)) for _ in range(sentences))
+
+
+def synthetic_png(size_bytes: int, seed: int) -> bytes:
+    # Noise pixels do not compress, so the file lands close to size_bytes.
+    rng = random.Random(seed)
+    side = max(1, int((max(size_bytes, 3) / 3) ** 0.5))
+    rows = b"".join(b"\x00" + rng.randbytes(side * 3) for _ in range(side))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def generate_corpus(workspace_root: Path, config: CorpusConfig) -> list[str]:
+    """Write a deterministic synthetic sources/ tree and return its slugs."""
+    sources_root = workspace_root / "sources"
+    characters_root = sources_root / "characters"
+    image_root = sources_root / "image_inputs"
+    characters_root.mkdir(parents=True, exist_ok=True)
+    image_root.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(config.seed)
+
+    entries_per_type = min(config.entries_per_type, EMBEDDED_ENTRY_LIMIT)
+    slugs: list[str] = []
+    for index in range(1, config.characters + 1):
+        slug = f"bench-{index:06d}"
+        slugs.append(slug)
+        character_dir = characters_root / slug
+        canonical_dir = character_dir / "canonical"
+        canonical_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()}"
+        spec_fields: dict[str, Any] = {
+            "slug": slug,
+            "name": name,
+            "description": _paragraph(rng, 4),
+            "personality": _paragraph(rng, 3),
+            "scenario": _paragraph(rng, 2),
+            "first_mes": _paragraph(rng, 3),
+            "mes_example": _paragraph(rng, 2),
+            "alternate_greetings": [_paragraph(rng, 2) for _ in range(2)],
+            "tags": sorted({rng.choice(_WORDS) for _ in range(4)}),
+        }
+        (canonical_dir / "spec_v2_fields.md").write_text(json.dumps(spec_fields, indent=2), encoding="utf-8")
+        (canonical_dir / "shortDescription.md").write_text(_sentence(rng, 10) + "\n", encoding="utf-8")
+        (character_dir / "meta.yaml").write_text(
+            f"slug: {slug}\ndisplayName: {name}\nstatus: draft\n",
+            encoding="utf-8",
+        )
+        _write_entries(character_dir, rng, entries_per_type)
+        for variant_index in range(1, config.variants + 1):
+            variant_dir = character_dir / "variants" / f"variant-{variant_index:02d}"
+            variant_dir.mkdir(parents=True, exist_ok=True)
+            (variant_dir / "spec_v2_fields.md").write_text(
+                json.dumps({"personality": _paragraph(rng, 2)}, indent=2),
+                encoding="utf-8",
+            )
+        if config.png_bytes > 0:
+            (image_root / f"{slug}.png").write_bytes(synthetic_png(config.png_bytes, config.seed + index))
+    return slugs
+
+
+def _write_entries(character_dir: Path, rng: random.Random, entries_per_type: int) -> None:
+    for entry_type in EMBEDDED_ENTRY_TYPES:
+        type_dir = character_dir / "fragments" / "entries" / entry_type
+        type_dir.mkdir(parents=True, exist_ok=True)
+        for entry_index in range(1, entries_per_type + 1):
+            title = f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()}"
+            (type_dir / f"entry_{entry_index:02d}.md").write_text(
+                f"---\ntitle: {title}\n---\n\n{_paragraph(rng, 2)}\n",
+                encoding="utf-8",
+            )
+
+
+def peak_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is kilobytes on Linux but bytes on macOS.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _dist_bytes(workspace_root: Path) -> int:
+    site_root = workspace_root / "dist" / "src"
+    return sum(path.stat().st_size for path in site_root.rglob("*.json") if path.is_file())
+
+
+def _timed_build(
+    workspace_root: Path,
+    characters: int,
+    jobs: int,
+    search_lorebooks: bool,
+    json_profile: str,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    summary = build_site_data(
+        workspace_root,
+        incremental=True,
+        jobs=jobs,
+        export_options=ExportOptions(json_profile=json_profile),
+        profile=True,
+        search_lorebooks=search_lorebooks,
+    )
+    seconds = time.perf_counter() - started
+    profile = summary.profile
+    if profile is None:
+        raise RuntimeError("Benchmark builds must run with profiling enabled.")
+    exported = sum(1 for timing in profile.slugs.values() if not timing.skipped)
+    return {
+        "seconds": round(seconds, 6),
+        "charactersPerSecond": round(characters / seconds, 3) if seconds else None,
+        "charactersExported": exported,
+        "files": profile.files,
+        "filesWritten": profile.files_written,
+        "bytesWritten": profile.bytes_written,
+        "jsonBytes": _dist_bytes(workspace_root),
+        "phases": {name: round(timing.seconds, 6) for name, timing in profile.phases.items()},
+    }
+
+
+def _time_search(workspace_root: Path, seed: int, queries: int = SEARCH_QUERIES) -> dict[str, Any]:
+    index = SearchIndex(workspace_root / "dist" / "src" / "data" / SEARCH_DIRNAME)
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    for _ in range(queries):
+        query = f"{rng.choice(_WORDS)} {rng.choice(_WORDS)}"
+        started = time.perf_counter()
+        index.search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    ordered = sorted(latencies)
+    return {
+        "indexBytes": index.size_bytes(),
+        "shards": len(index.header["shards"]),
+        "queries": queries,
+        # The first query also pays for loading its shards.
+        "firstQueryMs": round(latencies[0], 3),
+        "meanQueryMs": round(sum(latencies) / len(latencies), 3),
+        "p95QueryMs": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+    }
+
+
+def run_benchmark(
+    workspace_root: Path,
+    config: CorpusConfig,
+    jobs: int = 1,
+    search_lorebooks: bool = False,
+    json_profile: str = "pretty",
+) -> dict[str, Any]:
+    """Time cold, warm (no-op) and single-edit incremental builds of a synthetic corpus."""
+    marker = workspace_root / BENCH_MARKER
+    if not marker.exists() and any(workspace_root.iterdir()):
+        # Never wipe a real authoring workspace or anything else bp bench did not create.
+        raise ValueError(f"{workspace_root} is not empty and was not created by bp bench.")
+    for name in ("sources", "dist"):
+        if (workspace_root / name).exists():
+            shutil.rmtree(workspace_root / name)
+    marker.write_text("Synthetic benchmark workspace; sources/ and dist/ are regenerated.\n", encoding="utf-8")
+    started = time.perf_counter()
+    slugs = generate_corpus(workspace_root, config)
+    generate_seconds = time.perf_counter() - started
+
+    runs = {
+        "cold": _timed_build(workspace_root, len(slugs), jobs, search_lorebooks, json_profile),
+        "warm": _timed_build(workspace_root, len(slugs), jobs, search_lorebooks, json_profile),
+    }
+    if slugs:
+        spec_path = workspace_root / "sources" / "characters" / slugs[len(slugs) // 2] / "canonical" / "spec_v2_fields.md"
+        spec_fields = json.loads(spec_path.read_text(encoding="utf-8"))
+        spec_fields["personality"] = spec_fields["personality"] + " Edited for the benchmark."
+        spec_path.write_text(json.dumps(spec_fields, indent=2), encoding="utf-8")
+        runs["edit"] = _timed_build(workspace_root, len(slugs), jobs, search_lorebooks, json_profile)
+    search_results = _time_search(workspace_root, config.seed)
+
+    return {
+        "version": BENCH_VERSION,
+        "generatorVersion": GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "jobs": jobs,
+        "searchLorebooks": search_lorebooks,
+        "jsonProfile": json_profile,
+        "corpus": asdict(config),
+        "generateSeconds": round(generate_seconds, 6),
+        "runs": runs,
+        "search": search_results,
+        # ru_maxrss never goes down, so this is the peak for the whole process so far,
+        # not for this benchmark alone.
+        "processPeakRssKb": peak_rss_kb(),
+    }
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    lines: list[str] = []
+    if baseline.get("corpus") != current.get("corpus"):
+        lines.append("Warning: baseline was recorded with a different corpus configuration.")
+    for name, run in current.get("runs", {}).items():
+        previous = baseline.get("runs", {}).get(name)
+        if not previous or not previous.get("seconds"):
+            continue
+        change = (run["seconds"] - previous["seconds"]) / previous["seconds"] * 100
+        lines.append(f"{name}: {previous['seconds']:.3f}s -> {run['seconds']:.3f}s ({change:+.1f}%)")
+    previous_cold = baseline.get("runs", {}).get("cold") or {}
+    cold = current.get("runs", {}).get("cold") or {}
+    if previous_cold.get("jsonBytes") and cold.get("jsonBytes"):
+        saved = previous_cold["jsonBytes"] - cold["jsonBytes"]
+        lines.append(
+            f"JSON bytes ({baseline.get('jsonProfile', 'pretty')} -> {current.get('jsonProfile', 'pretty')}): "
+            f"{previous_cold['jsonBytes']} -> {cold['jsonBytes']} ({saved} bytes saved)"
+        )
+        write_phases = ("export.serialize", "export.write")
+        before = sum(previous_cold.get("phases", {}).get(name, 0.0) for name in write_phases)
+        after = sum(cold.get("phases", {}).get(name, 0.0) for name in write_phases)
+        lines.append(f"cold serialize+write: {before:.3f}s -> {after:.3f}s")
+    if baseline.get("search") and current.get("search"):
+        lines.append(
+            f"search: {baseline['search']['meanQueryMs']:.3f}ms -> {current['search']['meanQueryMs']:.3f}ms mean, "
+            f"{baseline['search']['indexBytes']} -> {current['search']['indexBytes']} index bytes"
+        )
+    # Version 1 results called the same process-wide figure peakRssKb.
+    previous_rss = baseline.get("processPeakRssKb", baseline.get("peakRssKb"))
+    if previous_rss and current.get("processPeakRssKb"):
+        lines.append(f"process peak RSS: {previous_rss} KB -> {current['processPeakRssKb']} KB")
+    return lines
+
+
+def run_and_record(
+    config: CorpusConfig,
+    output_path: Path,
+    jobs: int = 1,
+    workspace_root: Path | None = None,
+    baseline_path: Path | None = None,
+    search_lorebooks: bool = False,
+    json_profile: str = "pretty",
+) -> dict[str, Any]:
+    options = {"jobs": jobs, "search_lorebooks": search_lorebooks, "json_profile": json_profile}
+    if workspace_root is not None:
+        workspace_root.mkdir(parents=True, exist_ok=True)
+        results = run_benchmark(workspace_root, config, **options)
+    else:
+        with tempfile.TemporaryDirectory(prefix="botparts-bench-") as temp_dir:
+            results = run_benchmark(Path(temp_dir), config, **options)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    for name, run in results["runs"].items():
+        print(
+            f"{name}: {run['seconds']:.3f}s ({run['charactersPerSecond']} characters/s, "
+            f"{run['charactersExported']} exported, {run['filesWritten']} files written, "
+            f"{run['jsonBytes']} JSON bytes)"
+        )
+    print(
+        f"search: {results['search']['meanQueryMs']:.3f}ms mean query, "
+        f"{results['search']['indexBytes']} index bytes"
+    )
+    if results["processPeakRssKb"] is not None:
+        print(f"process peak RSS: {results['processPeakRssKb']} KB")
+    if baseline_path is not None:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        for line in compare_results(baseline, results):
+            print(line)
+    print(f"Results written to {output_path}")
+    return results
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import copy
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from src.emitter import json_text
+
+SPEC_V2_TEMPLATE_PATH = Path(__file__).resolve().parent / "spec_v2_template.json"
+# Stands in for a shared subtree while the card shell is serialized. An
+# authored string equal to the marker serializes to the same token, so
+# dumps() falls back to plain serialization unless it appears exactly once.
+FRAGMENT_MARKER = "\x00botparts-fragment"
+
+
+@lru_cache(maxsize=1)
+def _parsed_template() -> dict[str, Any]:
+    return json.loads(SPEC_V2_TEMPLATE_PATH.read_text(encoding="utf-8"))
+
+
+def load_spec_v2_template() -> dict[str, Any]:
+    return copy.deepcopy(_parsed_template())
+
+
+def _coerce_string(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _coerce_string_list(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value if str(item).strip()]
+    return []
+
+
+class CardRenderer:
+    """Renders the spec_v2 cards of one character.
+
+    One base card is built per field set; prose-variant cards are shallow
+    overlays of it, and a lorebook shared between cards is serialized once and
+    spliced into each card's JSON text.
+    """
+
+    def __init__(
+        self,
+        slug: str,
+        short_description: str | None,
+        fallback_name: str,
+        fallback_description: str,
+        fallback_tags: list[str],
+        json_profile: str = "pretty",
+    ) -> None:
+        self._slug = slug
+        self._json_profile = json_profile
+        self._short_description = short_description
+        self._fallback_name = fallback_name
+        self._fallback_description = fallback_description
+        self._fallback_tags = fallback_tags
+        # Keyed by id(); the book itself is kept alive so ids are never reused.
+        self._fragments: dict[int, tuple[dict[str, Any], str]] = {}
+
+    def base_card(
+        self,
+        spec_fields: dict[str, Any],
+        embedded_book: dict[str, Any] | None,
+        variant_slug: str | None = None,
+        lorebook_ref: str | None = None,
+    ) -> dict[str, Any]:
+        # With a lorebook_ref the book lives in a shared file and is not embedded.
+        card = load_spec_v2_template()
+        data = card.get("data")
+        if not isinstance(data, dict):
+            data = {}
+            card["data"] = data
+
+        data["name"] = _coerce_string(spec_fields.get("name") or self._fallback_name)
+        data["description"] = _coerce_string(spec_fields.get("description") or self._fallback_description)
+        data["personality"] = _coerce_string(spec_fields.get("personality"))
+        data["scenario"] = _coerce_string(spec_fields.get("scenario"))
+        data["first_mes"] = _coerce_string(spec_fields.get("first_mes"))
+        data["mes_example"] = _coerce_string(spec_fields.get("mes_example"))
+        data["creator_notes"] = _coerce_string(spec_fields.get("creator_notes"))
+        data["system_prompt"] = _coerce_string(spec_fields.get("system_prompt"))
+        data["post_history_instructions"] = _coerce_string(spec_fields.get("post_history_instructions"))
+        data["alternate_greetings"] = _coerce_string_list(spec_fields.get("alternate_greetings"))
+        data["tags"] = _coerce_string_list(spec_fields.get("tags") or self._fallback_tags)
+        data["creator"] = _coerce_string(spec_fields.get("creator"))
+        data["character_version"] = _coerce_string(spec_fields.get("character_version"))
+
+        extensions = data.get("extensions")
+        if not isinstance(extensions, dict):
+            extensions = {}
+        botparts = extensions.get("botparts")
+        if not isinstance(botparts, dict):
+            botparts = {}
+        botparts["slug"] = self._slug
+        if variant_slug:
+            botparts["variant"] = variant_slug
+        if self._short_description:
+            botparts["shortDescription"] = self._short_description
+        if lorebook_ref:
+            botparts["lorebookRef"] = lorebook_ref
+        extensions["botparts"] = botparts
+        data["extensions"] = extensions
+
+        if embedded_book and not lorebook_ref:
+            data["character_book"] = embedded_book
+
+        return card
+
+    def prose_card(
+        self,
+        base_card: dict[str, Any],
+        prose_variant: str,
+        first_mes: str | None = None,
+    ) -> dict[str, Any]:
+        # Only the dicts on the path to the changed keys are copied; every
+        # other subtree (lorebook included) is shared with the base card.
+        card = dict(base_card)
+        data = dict(card["data"])
+        extensions = dict(data["extensions"])
+        botparts = dict(extensions["botparts"])
+        botparts["proseVariant"] = prose_variant
+        extensions["botparts"] = botparts
+        data["extensions"] = extensions
+        if first_mes is not None:
+            data["first_mes"] = first_mes
+        card["data"] = data
+        return card
+
+    def dumps(self, card: dict[str, Any]) -> str:
+        data = card.get("data")
+        book = data.get("character_book") if isinstance(data, dict) else None
+        if not isinstance(book, dict):
+            return json_text(card, self._json_profile) + "\n"
+        shell_data = dict(data)
+        shell_data["character_book"] = FRAGMENT_MARKER
+        shell = dict(card)
+        shell["data"] = shell_data
+        text = json_text(shell, self._json_profile)
+        token = json.dumps(FRAGMENT_MARKER)
+        if text.count(token) != 1:
+            return json_text(card, self._json_profile) + "\n"
+        start = text.index(token)
+        line_start = text.rfind("\n", 0, start) + 1
+        line = text[line_start:start]
+        # Compact text has no newlines, so the book is spliced in unindented.
+        indent = line[: len(line) - len(line.lstrip(" "))]
+        fragment = self._fragment_text(book).replace("\n", "\n" + indent)
+        return text[:start] + fragment + text[start + len(token) :] + "\n"
+
+    def lorebook_text(self, book: dict[str, Any]) -> str:
+        return self._fragment_text(book) + "\n"
+
+    def _fragment_text(self, book: dict[str, Any]) -> str:
+        cached = self._fragments.get(id(book))
+        if cached is not None and cached[0] is book:
+            return cached[1]
+        text = json_text(book, self._json_profile)
+        self._fragments[id(book)] = (book, text)
+        return text
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from src.emitter import Emitter, dumps_json
+
+CATALOGUE_FILENAME = "catalogue.json"
+CATALOGUE_DIRNAME = "catalogue"
+INDEX_FILENAME = "index.json"
+PAGED_CATALOGUE_VERSION = 1
+TAG_INDEX_FILENAME = "tag_index.json"
+TAG_INDEX_VERSION = 1
+TAG_INDEX_ENCODINGS = ("list", "delta", "bitmap")
+
+
+def page_filename(number: int) -> str:
+    return f"page-{number:04d}.json"
+
+
+def _pages(entries: Iterable[dict[str, Any]], page_size: int) -> Iterator[list[dict[str, Any]]]:
+    page: list[dict[str, Any]] = []
+    for entry in entries:
+        page.append(entry)
+        if len(page) == page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def write_catalogue(
+    emitter: Emitter,
+    data_root: Path,
+    entries: list[dict[str, Any]],
+    page_size: int = 0,
+    generated_at: str | None = None,
+) -> None:
+    """Write the site catalogue, either as one file or as fixed-size pages.
+
+    Entries must already be in slug order. With page_size > 0 the catalogue is
+    written as catalogue/page-NNNN.json plus a catalogue/index.json listing
+    each page's slug range, entry count and sha256, so the site can fetch only
+    the pages it shows. Pages are serialized one at a time.
+    """
+    if page_size <= 0:
+        payload: dict[str, Any] = {"entries": entries}
+        if generated_at is not None:
+            payload["generatedAt"] = generated_at
+        emitter.write_json(data_root / CATALOGUE_FILENAME, payload)
+        return
+
+    catalogue_root = data_root / CATALOGUE_DIRNAME
+    pages: list[dict[str, Any]] = []
+    for number, page_entries in enumerate(_pages(entries, page_size), start=1):
+        text = dumps_json({"page": number, "entries": page_entries}, emitter.json_profile)
+        emitter.write_text(catalogue_root / page_filename(number), text)
+        pages.append(
+            {
+                "path": page_filename(number),
+                "count": len(page_entries),
+                "firstSlug": page_entries[0]["slug"],
+                "lastSlug": page_entries[-1]["slug"],
+                "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            }
+        )
+    index_payload: dict[str, Any] = {
+        "version": PAGED_CATALOGUE_VERSION,
+        "pageSize": page_size,
+        "totalEntries": sum(page["count"] for page in pages),
+        "pages": pages,
+    }
+    if generated_at is not None:
+        index_payload["generatedAt"] = generated_at
+    emitter.write_json(catalogue_root / INDEX_FILENAME, index_payload)
+
+
+def encode_postings(ordinals: list[int], encoding: str) -> list[int] | str:
+    # ordinals are ascending catalogue positions.
+    if encoding == "delta":
+        return [ordinal - previous for previous, ordinal in zip([0, *ordinals], ordinals)]
+    if encoding == "bitmap":
+        bitmap = bytearray((ordinals[-1] // 8 + 1) if ordinals else 0)
+        for ordinal in ordinals:
+            bitmap[ordinal // 8] |= 1 << (ordinal % 8)
+        return base64.b64encode(bytes(bitmap)).decode("ascii")
+    return list(ordinals)
+
+
+def decode_postings(postings: list[int] | str, encoding: str) -> list[int]:
+    if encoding == "delta":
+        ordinals: list[int] = []
+        total = 0
+        for gap in postings:
+            total += int(gap)
+            ordinals.append(total)
+        return ordinals
+    if encoding == "bitmap":
+        bitmap = base64.b64decode(str(postings))
+        return [
+            index * 8 + bit
+            for index, byte in enumerate(bitmap)
+            for bit in range(8)
+            if byte & (1 << bit)
+        ]
+    return [int(ordinal) for ordinal in postings]
+
+
+def build_tag_index(entries: list[dict[str, Any]], encoding: str = "list") -> dict[str, Any]:
+    """Invert catalogue tags into posting lists of catalogue ordinals.
+
+    Ordinals index into "slugs", which is the catalogue's slug order (so with
+    a paged catalogue, ordinal // pageSize is the page). Spoiler tags get
+    their own map so the site can keep them hidden by default.
+    """
+    if encoding not in TAG_INDEX_ENCODINGS:
+        raise ValueError(f"Unknown tag index encoding: {encoding}")
+    postings: dict[str, dict[str, list[int]]] = {"tags": {}, "spoilerTags": {}}
+    for ordinal, entry in enumerate(entries):
+        for field_name, index in postings.items():
+            for tag in sorted(set(entry.get(field_name) or [])):
+                index.setdefault(tag, []).append(ordinal)
+    payload: dict[str, Any] = {
+        "version": TAG_INDEX_VERSION,
+        "encoding": encoding,
+        "slugs": [entry["slug"] for entry in entries],
+    }
+    for field_name, counts_name in (("tags", "tagCounts"), ("spoilerTags", "spoilerTagCounts")):
+        index = postings[field_name]
+        payload[field_name] = {tag: encode_postings(index[tag], encoding) for tag in sorted(index)}
+        payload[counts_name] = {tag: len(index[tag]) for tag in sorted(index)}
+    return payload
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import difflib
+import json
 import os
 import sys
 import threading
@@ -10,8 +11,19 @@ from pathlib import Path
 from typing import Any, Iterable
 
 from src import authoring
+from src import bench
+from src import llm_bench
+from src import llm_cache
 from src import llm_client
-from src.generator import EMBEDDED_ENTRY_TYPES, build_site_data
+from src.emitter import JSON_PROFILES
+from src.generator import (
+    EMBEDDED_ENTRY_TYPES,
+    add_build_arguments,
+    build_kwargs_from_args,
+    build_site_data,
+    parse_jobs,
+    watch_build,
+)
 from src.secrets import load_secrets_file
 
 EMBEDDED_ENTRY_MAX = 2
@@ -22,22 +34,7 @@ def main(argv: Iterable[str] | None = None) -> int:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     build_parser = subparsers.add_parser("build", help="Run deterministic build.")
-    build_parser.add_argument(
-        "--placeholders",
-        type=_parse_placeholders,
-        default=None,
-        help="Number of placeholder profiles to emit.",
-    )
-    build_parser.add_argument(
-        "--include-timestamps",
-        action="store_true",
-        help="Include timestamps in the report and catalogue.json.",
-    )
-    build_parser.add_argument(
-        "--strict-scope",
-        action="store_true",
-        help="Treat missing world packs or promotion gate failures as errors.",
-    )
+    add_build_arguments(build_parser)
 
     author_parser = subparsers.add_parser("author", help="Authoring workflows.")
     author_subparsers = author_parser.add_subparsers(dest="author_command", required=True)
@@ -53,6 +50,11 @@ def main(argv: Iterable[str] | None = None) -> int:
         action="store_true",
         help="Skip automatic build after authoring completes.",
     )
+    author_canonical.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignore cached LLM responses (BOTPARTS_LLM_CACHE_DIR) for this run; fresh responses still refresh it.",
+    )
 
     author_variants = author_subparsers.add_parser(
         "variants",
@@ -64,6 +66,11 @@ def main(argv: Iterable[str] | None = None) -> int:
         action="store_true",
         help="Skip automatic build after authoring completes.",
     )
+    author_variants.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignore cached LLM responses (BOTPARTS_LLM_CACHE_DIR) for this run; fresh responses still refresh it.",
+    )
 
     author_schema = author_subparsers.add_parser(
         "schema",
@@ -82,6 +89,11 @@ def main(argv: Iterable[str] | None = None) -> int:
         action="store_true",
         help="Skip automatic build after authoring completes.",
     )
+    author_schema.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignore cached LLM responses (BOTPARTS_LLM_CACHE_DIR) for this run; fresh responses still refresh it.",
+    )
 
     author_schema_folder = author_subparsers.add_parser(
         "schema-folder",
@@ -99,6 +111,11 @@ def main(argv: Iterable[str] | None = None) -> int:
         action="store_true",
         help="Skip automatic build after authoring completes.",
     )
+    author_schema_folder.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignore cached LLM responses (BOTPARTS_LLM_CACHE_DIR) for this run; fresh responses still refresh it.",
+    )
 
     clean_parser = subparsers.add_parser(
         "author-clean",
@@ -115,6 +132,58 @@ def main(argv: Iterable[str] | None = None) -> int:
         help="Skip DELETE confirmation prompt.",
     )
 
+    bench_parser = subparsers.add_parser("bench", help="Benchmark builds against a synthetic corpus.")
+    bench_parser.add_argument("--characters", type=int, default=100, help="Number of synthetic characters.")
+    bench_parser.add_argument("--variants", type=int, default=1, help="Variants per character.")
+    bench_parser.add_argument(
+        "--entries",
+        type=int,
+        default=2,
+        help="Embedded entries per entry type (capped at the exporter limit).",
+    )
+    bench_parser.add_argument("--png-bytes", type=int, default=16 * 1024, help="Approximate avatar size in bytes.")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Corpus random seed.")
+    bench_parser.add_argument(
+        "--jobs",
+        type=parse_jobs,
+        default=1,
+        help="Export characters across N worker processes (0 = one per CPU).",
+    )
+    bench_parser.add_argument(
+        "--workspace",
+        default=None,
+        help="Keep the synthetic workspace in this directory instead of a temp dir.",
+    )
+    bench_parser.add_argument(
+        "--output",
+        default=None,
+        help=f"Where to write the JSON results (default: {bench.DEFAULT_OUTPUT}, or {llm_bench.DEFAULT_OUTPUT} with --llm-calls).",
+    )
+    bench_parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare against.")
+    bench_parser.add_argument(
+        "--search-lorebooks",
+        action="store_true",
+        help="Index lorebook contents in the search index during benchmark builds.",
+    )
+    bench_parser.add_argument(
+        "--json-profile",
+        choices=JSON_PROFILES,
+        default="pretty",
+        help="JSON layout used by benchmark builds (compare against a pretty --baseline for bytes saved).",
+    )
+    bench_parser.add_argument(
+        "--llm-calls",
+        type=int,
+        default=0,
+        help="Instead of builds, time N LLM client calls unpooled vs pooled against a local stand-in server.",
+    )
+    bench_parser.add_argument(
+        "--llm-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated server latency per LLM call for --llm-calls.",
+    )
+
     audit_parser = subparsers.add_parser("audit", help="Audit authored sources.")
     audit_subparsers = audit_parser.add_subparsers(dest="audit_command", required=False)
     audit_character = audit_subparsers.add_parser("character", help="Audit a single character.")
@@ -131,6 +200,8 @@ def main(argv: Iterable[str] | None = None) -> int:
         return _run_author_clean(args)
     if args.command == "audit":
         return _run_audit(args)
+    if args.command == "bench":
+        return _run_bench(args)
     return 1
 
 
@@ -147,19 +218,61 @@ def _parse_placeholders(value: str | None) -> int:
 
 
 def _run_build(args: argparse.Namespace) -> int:
-    placeholders_env = os.environ.get("BOTPARTS_PLACEHOLDERS")
-    placeholders = args.placeholders
-    if placeholders is None:
-        placeholders = _parse_placeholders(placeholders_env)
-    strict_env = os.environ.get("BOTPARTS_SCOPE_STRICT", "0")
-    strict_scopes = args.strict_scope or strict_env == "1"
+    build_kwargs = build_kwargs_from_args(args)
+    if args.watch:
+        print("Watching sources/, prompts/ and the card template (Ctrl+C to stop)...")
+        try:
+            watch_build(Path.cwd(), build_kwargs)
+        except KeyboardInterrupt:
+            print("Watch stopped.")
+        return 0
     with _Spinner("build"):
-        build_site_data(
-            Path.cwd(),
-            placeholders=placeholders,
-            include_timestamps=args.include_timestamps,
-            strict_scopes=strict_scopes,
+        build_site_data(Path.cwd(), incremental=args.incremental, **build_kwargs)
+    return 0
+
+
+def _run_bench(args: argparse.Namespace) -> int:
+    if args.llm_calls:
+        return _run_llm_bench(args)
+    config = bench.CorpusConfig(
+        characters=args.characters,
+        variants=args.variants,
+        entries_per_type=args.entries,
+        png_bytes=args.png_bytes,
+        seed=args.seed,
+    )
+    try:
+        bench.run_and_record(
+            config,
+            Path(args.output or bench.DEFAULT_OUTPUT),
+            jobs=args.jobs,
+            workspace_root=Path(args.workspace) if args.workspace else None,
+            baseline_path=Path(args.baseline) if args.baseline else None,
+            search_lorebooks=args.search_lorebooks,
+            json_profile=args.json_profile,
+        )
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    return 0
+
+
+def _run_llm_bench(args: argparse.Namespace) -> int:
+    try:
+        results = llm_bench.run_llm_benchmark(args.llm_calls, latency_s=args.llm_latency_ms / 1000)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    output_path = Path(args.output or llm_bench.DEFAULT_OUTPUT)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    for name in ("unpooled", "pooled"):
+        run = results[name]
+        print(
+            f"{name}: {run['meanCallMs']:.3f}ms mean, {run['p95CallMs']:.3f}ms p95 per call "
+            f"({run['calls']} calls, {run['connections']} connections)"
         )
+    print(f"Results written to {output_path}")
     return 0
 
 
@@ -197,14 +310,15 @@ def _run_author(args: argparse.Namespace) -> int:
     sources_root = workspace / "sources"
     prompts_root = workspace / "prompts"
 
-    if args.author_command == "variants":
-        result = _run_author_variants(args, sources_root, prompts_root)
-    elif args.author_command == "schema":
-        result = _run_author_schema(args, sources_root, prompts_root)
-    elif args.author_command == "schema-folder":
-        result = _run_author_schema_folder(args, sources_root, prompts_root)
-    else:
-        result = _run_author_canonical(args, sources_root, prompts_root)
+    with llm_cache.bypass_response_cache(args.no_llm_cache):
+        if args.author_command == "variants":
+            result = _run_author_variants(args, sources_root, prompts_root)
+        elif args.author_command == "schema":
+            result = _run_author_schema(args, sources_root, prompts_root)
+        elif args.author_command == "schema-folder":
+            result = _run_author_schema_folder(args, sources_root, prompts_root)
+        else:
+            result = _run_author_canonical(args, sources_root, prompts_root)
 
     if result == 0 and not args.no_auto_build:
         return _maybe_auto_build(args)
@@ -251,10 +365,9 @@ def _run_author_canonical(
             prompt_paths.append(optional_prompt)
     staging_snapshot = (character_dir / "staging_snapshot.md").read_text(encoding="utf-8")
     compiled_elaboration = _compile_prompt(prompt_paths, staging_snapshot, "CONCEPT SNIPPET")
-    llm_result = _invoke_llm(compiled_elaboration, label="Elaboration")
+    run_dir = authoring.new_run_dir(character_dir / "runs", slug)
+    llm_result = _invoke_llm(compiled_elaboration, label="Elaboration", partial_output=run_dir / "output.md")
     elaboration = llm_result.output_text
-    run_id = authoring.build_run_id(slug)
-    run_dir = character_dir / "runs" / run_id
     authoring.write_run_log(
         run_dir,
         prompt_paths,
@@ -263,7 +376,7 @@ def _run_author_canonical(
         input_payload=staging_snapshot,
         output_text=elaboration,
     )
-    preliminary_path = authoring.ensure_preliminary_draft(character_dir, elaboration, run_id=run_id)
+    preliminary_path = authoring.ensure_preliminary_draft(character_dir, elaboration, run_id=run_dir.name)
 
     preliminary_rel = preliminary_path.relative_to(Path.cwd())
     run_output_rel = (run_dir / "output.md").relative_to(Path.cwd())
@@ -273,9 +386,9 @@ def _run_author_canonical(
     input("Press enter once draft edits are saved...")
     draft_input = preliminary_path.read_text(encoding="utf-8")
     compiled_extraction = _compile_prompt([extract_prompt], draft_input, "DRAFT")
-    llm_result = _invoke_llm(compiled_extraction, label="Extraction")
+    run_dir = authoring.new_run_dir(character_dir / "runs", slug)
+    llm_result = _invoke_llm(compiled_extraction, label="Extraction", partial_output=run_dir / "output.md")
     extracted = llm_result.output_text
-    run_dir = character_dir / "runs" / authoring.build_run_id(slug)
     authoring.write_run_log(
         run_dir,
         [extract_prompt],
@@ -483,14 +596,19 @@ def _run_author_schema_file(
 
         elaboration_input = _build_schema_elaboration_input(draft)
         compiled_elaboration = _compile_prompt(prompt_paths, elaboration_input, "CONCEPT SNIPPET")
-        llm_result = _invoke_llm(compiled_elaboration, label="Elaboration")
+        elaboration_run_dirs = [
+            authoring.new_run_dir(character_dir / "runs", slug) for _, slug, character_dir in character_dirs
+        ]
+        llm_result = _invoke_llm(
+            compiled_elaboration,
+            label="Elaboration",
+            partial_output=elaboration_run_dirs[0] / "output.md",
+        )
         elaboration = llm_result.output_text
         if voice_prompt is not None and voice_prompt.name == "third_person_user_v1.md":
             elaboration = authoring.sanitize_second_person_pronouns(elaboration)
         _enforce_third_person_user_voice(voice_prompt, elaboration, "Elaboration")
-        for _, slug, character_dir in character_dirs:
-            run_id = authoring.build_run_id(slug)
-            run_dir = character_dir / "runs" / run_id
+        for run_dir in elaboration_run_dirs:
             authoring.write_run_log(
                 run_dir,
                 prompt_paths,
@@ -547,8 +665,12 @@ def _run_author_schema_file(
             idiosyncrasy_input,
             "IDIOSYNCRASY INPUT",
         )
-        llm_result = _invoke_llm(compiled_idiosyncrasy, label="Idiosyncrasy module")
-        run_dir = character_dirs[0][2] / "runs" / authoring.build_run_id(character_dirs[0][1])
+        run_dir = authoring.new_run_dir(character_dirs[0][2] / "runs", character_dirs[0][1])
+        llm_result = _invoke_llm(
+            compiled_idiosyncrasy,
+            label="Idiosyncrasy module",
+            partial_output=run_dir / "output.md",
+        )
         authoring.write_run_log(
             run_dir,
             [idiosyncrasy_prompt],
@@ -567,7 +689,8 @@ def _run_author_schema_file(
                 prose_variant,
             )
             compiled_extraction = _compile_prompt([extract_prompt], extraction_input, "DRAFT")
-            llm_result = _invoke_llm(compiled_extraction, label="Extraction")
+            run_dir = authoring.new_run_dir(character_dir / "runs", slug)
+            llm_result = _invoke_llm(compiled_extraction, label="Extraction", partial_output=run_dir / "output.md")
             extracted = llm_result.output_text
             if voice_prompt is not None and voice_prompt.name == "third_person_user_v1.md":
                 extracted = authoring.sanitize_second_person_pronouns(extracted)
@@ -576,7 +699,6 @@ def _run_author_schema_file(
                 extracted,
                 f"Extraction output for {slug}",
             )
-            run_dir = character_dir / "runs" / authoring.build_run_id(slug)
             authoring.write_run_log(
                 run_dir,
                 [extract_prompt],
@@ -1005,19 +1127,29 @@ def _apply_variant_edits(
     wait_for_edit: bool = True,
 ) -> list[tuple[str, str]]:
     canonical_text = canonical_path.read_text(encoding="utf-8")
-    applied: list[tuple[str, str]] = []
-    for _, variant_slug, description in planned_variants:
+    # Every rewrite depends only on the canonical text, so all variants are
+    # requested concurrently up front and then reviewed one at a time.
+    compiled_prompts = [
+        _compile_variant_prompt([prompt_path], canonical_text, description)
+        for _, _, description in planned_variants
+    ]
+    if not wait_for_edit:
+        for _, variant_slug, _ in planned_variants:
+            print(f"Working on variant '{variant_slug}'...")
+    llm_results = _invoke_llm_many(compiled_prompts, label="Variant rewrites")
+    drafted: list[tuple[str, str, Path]] = []
+    for (_, variant_slug, description), compiled_prompt, llm_result in zip(
+        planned_variants, compiled_prompts, llm_results
+    ):
+        if isinstance(llm_result, BaseException):
+            continue
         variant_dir = character_dir / "variants" / variant_slug
         variant_dir.mkdir(parents=True, exist_ok=True)
         spec_path = variant_dir / "spec_v2_fields.md"
 
         input_payload = _format_variant_prompt_payload(canonical_text, description)
-        compiled_prompt = _compile_variant_prompt([prompt_path], canonical_text, description)
-        if not wait_for_edit:
-            print(f"Working on variant '{variant_slug}'...")
-        llm_result = _invoke_llm(compiled_prompt, label=f"Variant rewrite ({variant_slug})")
         spec_path.write_text(llm_result.output_text.rstrip() + "\n", encoding="utf-8")
-        run_dir = variant_dir / "runs" / authoring.build_run_id(variant_slug)
+        run_dir = authoring.new_run_dir(variant_dir / "runs", variant_slug)
         authoring.write_run_log(
             run_dir,
             [prompt_path],
@@ -1026,7 +1158,15 @@ def _apply_variant_edits(
             input_payload=input_payload,
             output_text=llm_result.output_text,
         )
+        drafted.append((variant_slug, description, spec_path))
+    # Successful rewrites are written before a failure is raised, so their
+    # drafts and run logs are not lost with it.
+    for llm_result in llm_results:
+        if isinstance(llm_result, BaseException):
+            raise llm_result
 
+    applied: list[tuple[str, str]] = []
+    for variant_slug, description, spec_path in drafted:
         if wait_for_edit:
             variant_rel = spec_path.relative_to(Path.cwd())
             print(f"Edit variant draft: {variant_rel.as_posix()}")
@@ -1092,14 +1232,54 @@ def _summarize_embedded_entries(entries_root: Path) -> str:
     return "\n".join(summaries).strip()
 
 
-def _invoke_llm(compiled_prompt: str, label: str = "LLM request") -> llm_client.LLMResult:
+def _invoke_llm(
+    compiled_prompt: str,
+    label: str = "LLM request",
+    partial_output: Path | None = None,
+) -> llm_client.LLMResult:
     config = llm_client.load_llm_config()
-    with _Spinner(label):
-        result = llm_client.invoke_llm(compiled_prompt, config)
+    spinner = _Spinner(label)
+    stream_log: list[Any] = []
+
+    def on_delta(delta: str, progress: llm_client.StreamProgress) -> None:
+        # Streamed text lands in the run's output.md as it arrives, so a
+        # failed or interrupted generation still leaves what was produced.
+        if partial_output is not None:
+            if not stream_log:
+                partial_output.parent.mkdir(parents=True, exist_ok=True)
+                stream_log.append(partial_output.open("w", encoding="utf-8"))
+            stream_log[0].write(delta)
+            stream_log[0].flush()
+        spinner.status = f"first token {progress.ttft_s or 0.0:.1f}s, {progress.tokens_per_s():.1f} tok/s"
+
+    try:
+        with spinner:
+            result = llm_client.invoke_llm(compiled_prompt, config, on_delta=on_delta if config.stream else None)
+    finally:
+        for handle in stream_log:
+            handle.close()
     print(f"{label} complete.")
     return result
 
 
+def _invoke_llm_many(
+    compiled_prompts: list[str], label: str = "LLM requests"
+) -> list[llm_client.LLMResult | BaseException]:
+    # Failed prompts come back as their exception; callers save the successes first.
+    if not compiled_prompts:
+        return []
+    config = llm_client.load_llm_config()
+    with _Spinner(f"{label} ({len(compiled_prompts)} requests)"):
+        results = llm_client.invoke_llm_many(compiled_prompts, config)
+    failed = sum(1 for result in results if isinstance(result, BaseException))
+    print(f"{label} complete." if not failed else f"{label} complete; {failed} of {len(results)} failed.")
+    utilization = llm_client.rate_limit_utilization(config)
+    if utilization:
+        summary = ", ".join(f"{kind} {share:.0%}" for kind, share in utilization.items())
+        print(f"Rate limit utilization: {summary}")
+    return results
+
+
 class _Spinner:
     def __init__(self, label: str, interval: float = 0.2) -> None:
         self._label = label
@@ -1108,12 +1288,16 @@ class _Spinner:
         self._thread = threading.Thread(target=self._spin, daemon=True)
         self._frames = ("|", "/", "-", "\\")
         self._last_length = 0
+        # Extra progress text, e.g. streaming throughput; set from any thread.
+        self.status = ""
 
     def _spin(self) -> None:
         index = 0
         while not self._stop_event.is_set():
             frame = self._frames[index % len(self._frames)]
             message = f"{frame} working {self._label}"
+            if self.status:
+                message = f"{message} ({self.status})"
             self._last_length = max(self._last_length, len(message))
             print(f"\r{message}", end="", flush=True)
             index += 1
@@ -1141,7 +1325,7 @@ def _prompt_embedded_entries(character_dir: Path, prompts_root: Path) -> None:
     if mode == "skip":
         print("Skipping embedded entries.")
         return
-    run_dir = character_dir / "runs" / authoring.build_run_id(character_dir.name)
+    run_dir = authoring.new_run_dir(character_dir / "runs", character_dir.name)
     if mode == "auto":
         _prompt_embedded_entries_auto(character_dir, prompts_root, run_dir)
         return
@@ -1455,7 +1639,7 @@ def _generate_embedded_entries_from_notes(
         input_payload = f"{input_payload}\n\nVARIANT NOTES:\n{variant_context.strip()}\n"
     compiled_prompt = _compile_prompt([prompt_path], input_payload, "ENTRY TYPES")
     llm_result = _invoke_llm(compiled_prompt, label="Embedded entries (notes)")
-    run_dir = target_dir / "runs" / authoring.build_run_id(target_dir.name)
+    run_dir = authoring.new_run_dir(target_dir / "runs", target_dir.name)
     authoring.write_embedded_entries_log(
         run_dir / "embedded_entries_auto_notes.md",
         prompt_compiled=compiled_prompt,
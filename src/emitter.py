@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+
+CHANGED_FILES_NAME = "CHANGED_FILES.txt"
+GZIP_SUFFIX = ".gz"
+GZIP_LEVEL = 9
+JSON_PROFILES = ("pretty", "compact")
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _bytes_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def _gzip_path(path: Path) -> Path:
+    return path.with_name(path.name + GZIP_SUFFIX)
+
+
+def json_text(payload: Any, profile: str = "pretty") -> str:
+    # Both profiles keep sort_keys, so output stays byte-stable either way.
+    if profile == "compact":
+        return json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    return json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False)
+
+
+def dumps_json(payload: Any, profile: str = "pretty") -> str:
+    return json_text(payload, profile) + "\n"
+
+
+@dataclass
+class CompressionStats:
+    files: int = 0
+    raw_bytes: int = 0
+    gzip_bytes: int = 0
+
+    def add(self, other: CompressionStats) -> None:
+        self.files += other.files
+        self.raw_bytes += other.raw_bytes
+        self.gzip_bytes += other.gzip_bytes
+
+
+class Emitter:
+    """Writes build outputs atomically and only when their bytes change.
+
+    Every emitted path is remembered so stale files can be pruned after the
+    build instead of wiping the tree up front, and every real write (or
+    removal) is recorded for dist/CHANGED_FILES.txt.
+    """
+
+    def __init__(self, root: Path, precompress: bool = False, json_profile: str = "pretty") -> None:
+        if json_profile not in JSON_PROFILES:
+            raise ValueError(f"Unknown JSON profile: {json_profile}")
+        self.root = root
+        self.precompress = precompress
+        self.json_profile = json_profile
+        self.written: set[Path] = set()
+        self.added: set[Path] = set()
+        self.modified: set[Path] = set()
+        self.removed: set[Path] = set()
+        self.bytes_written = 0
+        # Raw and gzip sizes per precompressed path, so a file emitted or
+        # retained more than once (shared lorebooks) is counted once.
+        self.compressed: dict[Path, tuple[int, int]] = {}
+        self._captured: dict[Path, bytes | Path] | None = None
+
+    @property
+    def compression(self) -> CompressionStats:
+        stats = CompressionStats()
+        for raw_bytes, gzip_bytes in self.compressed.values():
+            stats.add(CompressionStats(1, raw_bytes, gzip_bytes))
+        return stats
+
+    @contextmanager
+    def capture(self) -> Iterator[dict[Path, bytes | Path]]:
+        # Records what is emitted inside the block: payload bytes, or the source
+        # path for copied, linked and retained files (see archives).
+        captured: dict[Path, bytes | Path] = {}
+        previous = self._captured
+        self._captured = captured
+        try:
+            yield captured
+        finally:
+            self._captured = previous
+
+    def write_json(self, path: Path, payload: Any) -> bool:
+        return self.write_text(path, dumps_json(payload, self.json_profile))
+
+    def write_text(self, path: Path, text: str) -> bool:
+        return self.write_bytes(path, text.encode("utf-8"))
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        if self._captured is not None:
+            self._captured[path] = data
+        changed = self._write_bytes(path, data)
+        if self._compresses(path):
+            self._write_gzip_sibling(path, data, changed)
+        return changed
+
+    def _write_bytes(self, path: Path, data: bytes) -> bool:
+        self.written.add(path)
+        if path.is_file():
+            stat = path.stat()
+            if stat.st_size == len(data) and _file_digest(path) == _bytes_digest(data):
+                return False
+        existed = path.exists()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temp_path(path)
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        self.bytes_written += len(data)
+        self._record_change(path, existed)
+        return True
+
+    def write_stream(self, path: Path, produce: Callable[[BinaryIO], None]) -> bool:
+        # For outputs too large to hold in memory: produce() writes into a temp
+        # file, which replaces path only if the bytes differ.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temp_path(path)
+        try:
+            with temp_path.open("wb") as handle:
+                produce(handle)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        if self._captured is not None:
+            self._captured[path] = path
+        self.written.add(path)
+        if path.is_file():
+            if path.stat().st_size == temp_path.stat().st_size and _file_digest(path) == _file_digest(temp_path):
+                temp_path.unlink()
+                return False
+        existed = path.exists()
+        os.replace(temp_path, path)
+        self.bytes_written += path.stat().st_size
+        self._record_change(path, existed)
+        return True
+
+    def copy_file(self, source: Path, path: Path) -> bool:
+        if self._captured is not None:
+            self._captured[path] = source
+        self.written.add(path)
+        if path.is_file():
+            if path.stat().st_size == source.stat().st_size and _file_digest(path) == _file_digest(source):
+                return False
+        existed = path.exists()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temp_path(path)
+        shutil.copyfile(source, temp_path)
+        os.replace(temp_path, path)
+        self.bytes_written += path.stat().st_size
+        self._record_change(path, existed)
+        return True
+
+    def link_file(self, source: Path, path: Path) -> bool:
+        if self._captured is not None:
+            self._captured[path] = source
+        self.written.add(path)
+        if path.is_file() and path.samefile(source):
+            return False
+        existed = path.exists()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temp_path(path)
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            # Cross-device or unsupported filesystems: fall back to a content copy.
+            self.written.discard(path)
+            return self.copy_file(source, path)
+        os.replace(temp_path, path)
+        self._record_change(path, existed)
+        return True
+
+    def retain(self, paths: Iterable[Path]) -> None:
+        # Outputs kept from an earlier build (e.g. skipped incremental slugs).
+        for path in paths:
+            if not path.is_file():
+                continue
+            if self._captured is not None:
+                self._captured[path] = path
+            self.written.add(path)
+            gzip_path = _gzip_path(path)
+            if self._compresses(path) and gzip_path.is_file():
+                self.written.add(gzip_path)
+                self.compressed[path] = (path.stat().st_size, gzip_path.stat().st_size)
+
+    def retain_tree(self, root: Path) -> None:
+        if root.exists():
+            self.retain(root.rglob("*"))
+
+    def merge(self, state: dict[str, Any]) -> None:
+        # Folds in a worker process's export_state().
+        self.written.update(self.root / Path(relative) for relative in state["written"])
+        self.added.update(self.root / Path(relative) for relative in state["added"])
+        self.modified.update(self.root / Path(relative) for relative in state["modified"])
+        self.bytes_written += state["bytesWritten"]
+        self.compressed.update(
+            (self.root / Path(relative), (raw_bytes, gzip_bytes))
+            for relative, (raw_bytes, gzip_bytes) in state["compressed"].items()
+        )
+
+    def export_state(self) -> dict[str, Any]:
+        return {
+            "written": self._relative(self.written),
+            "added": self._relative(self.added),
+            "modified": self._relative(self.modified),
+            "bytesWritten": self.bytes_written,
+            "compressed": {
+                path.relative_to(self.root).as_posix(): sizes for path, sizes in self.compressed.items()
+            },
+        }
+
+    def prune(self, roots: Iterable[Path], keep_dirs: Iterable[Path] = ()) -> None:
+        keep = set(keep_dirs)
+        for path in self.written:
+            keep.update(path.parents)
+        for root in roots:
+            if not root.exists():
+                continue
+            for path in sorted(root.rglob("*"), key=lambda item: len(item.parts), reverse=True):
+                if path.is_dir():
+                    if path not in keep and not any(path.iterdir()):
+                        path.rmdir()
+                    continue
+                if path not in self.written:
+                    path.unlink()
+                    self.removed.add(path)
+
+    def write_change_list(self, path: Path) -> None:
+        lines = [f"A\t{item}" for item in self._relative(self.added)]
+        lines.extend(f"M\t{item}" for item in self._relative(self.modified))
+        lines.extend(f"D\t{item}" for item in self._relative(self.removed))
+        lines.sort(key=lambda line: (line.split("\t", 1)[1], line))
+        text = "\n".join(lines) + "\n" if lines else ""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temp_path(path)
+        temp_path.write_text(text, encoding="utf-8")
+        os.replace(temp_path, path)
+
+    def _compresses(self, path: Path) -> bool:
+        # Only the site's JSON artifacts under dist/src get .gz siblings.
+        return self.precompress and path.suffix == ".json" and self.root / "src" in path.parents
+
+    def _write_gzip_sibling(self, path: Path, data: bytes, changed: bool) -> None:
+        gzip_path = _gzip_path(path)
+        if changed or not gzip_path.is_file():
+            # mtime=0 and a fixed level keep the archive bytes reproducible.
+            self._write_bytes(gzip_path, gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+        else:
+            self.written.add(gzip_path)
+        self.compressed[path] = (len(data), gzip_path.stat().st_size)
+
+    def _record_change(self, path: Path, existed: bool) -> None:
+        if existed:
+            self.modified.add(path)
+        else:
+            self.added.add(path)
+
+    def _relative(self, paths: Iterable[Path]) -> list[str]:
+        return sorted(path.relative_to(self.root).as_posix() for path in paths)
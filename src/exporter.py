@@ -1,39 +1,69 @@
 from __future__ import annotations
 
-import base64
+import hashlib
 import json
 import re
-import struct
-import zlib
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from src import archives
+from src import assets
 from src import authoring
+from src import cards
+from src import png_cards
+from src import profiling
+from src import tokens
+from src import validation
+from src.emitter import Emitter
 
 EMBEDDED_ENTRY_TYPES = ("locations", "items", "knowledge", "ideology", "relationships")
 EMBEDDED_ENTRY_FILENAME = re.compile(r"^[a-z0-9][a-z0-9_-]*\.md$")
 EMBEDDED_ENTRY_PLACEHOLDERS = {".keep", ".gitkeep"}
 SCOPE_LAYERS = {"world", "character", "variant"}
 PROSE_VARIANTS = ("schema-like", "hybrid")
+LOREBOOK_LAYOUTS = ("inline", "shared", "both")
+LOREBOOKS_DIRNAME = "lorebooks"
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    asset_mode: str = "copy"
+    precompress: bool = False
+    json_profile: str = "pretty"
+    lorebook_layout: str = "inline"
+    token_estimator: str = "approx"
+    validate: bool = False
+    archive_format: str = "none"
+    png_cards: str = "none"
+
+
+@dataclass
+class ExportResult:
+    # Content-addressed images stored for this slug (digest -> size in bytes)
+    # and how many avatar references point at them; likewise for shared
+    # lorebooks and the cards that reference them.
+    assets: dict[str, int] = field(default_factory=dict)
+    image_refs: int = 0
+    lorebooks: dict[str, int] = field(default_factory=dict)
+    lorebook_refs: int = 0
+    # Token breakdown of the canonical card (see tokens.TokenCounter.count_card).
+    ai_tokens: dict[str, Any] | None = None
+    # Token cache keys of the texts counted for ai_tokens.
+    token_keys: list[str] = field(default_factory=list)
+    archive: str | None = None
+    # Total schema violations, including any beyond the per-document warning cap.
+    schema_violations: int = 0
+
+
+def lorebook_relative_path(digest: str) -> str:
+    return f"{LOREBOOKS_DIRNAME}/{digest}.json"
 
 
 def _load_json(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _write_json(path: Path, payload: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-
-
-def _load_spec_v2_template() -> dict[str, Any]:
-    template_path = Path(__file__).resolve().parent / "spec_v2_template.json"
-    return _load_json(template_path)
-
-
 def _parse_frontmatter(text: str) -> tuple[dict[str, str], str]:
     lines = text.splitlines()
     if not lines or lines[0].strip() != "---":
@@ -86,25 +116,12 @@ def _load_scope_sidecar(path: Path, warnings: list[str], context: str) -> str |
     return _normalize_scope(payload.get("scope"), warnings, context)
 
 
-def _coerce_string(value: Any) -> str:
-    if value is None:
-        return ""
-    return str(value)
-
-
-def _coerce_string_list(value: Any) -> list[str]:
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return [str(item) for item in value if str(item).strip()]
-    return []
-
-
 def _emit_embedded_entry_fragments(
     source_dir: Path,
     output_root: Path,
     warnings: list[str],
     slug: str,
+    emitter: Emitter,
 ) -> dict[str, list[str]]:
     entries_root = source_dir / "fragments" / "entries"
     embedded_entries: dict[str, list[str]] = {entry_type: [] for entry_type in EMBEDDED_ENTRY_TYPES}
@@ -112,15 +129,15 @@ def _emit_embedded_entry_fragments(
     output_entries_root.mkdir(parents=True, exist_ok=True)
 
     if not entries_root.exists():
-        (output_entries_root / ".keep").write_text("", encoding="utf-8")
+        emitter.write_text(output_entries_root / ".keep", "")
         for entry_type in EMBEDDED_ENTRY_TYPES:
             entry_dir = output_entries_root / entry_type
             entry_dir.mkdir(parents=True, exist_ok=True)
-            (entry_dir / ".keep").write_text("", encoding="utf-8")
+            emitter.write_text(entry_dir / ".keep", "")
         return embedded_entries
     if not entries_root.is_dir():
         warnings.append(f"[{slug}] Embedded entries root is not a directory; skipping.")
-        (output_entries_root / ".keep").write_text("", encoding="utf-8")
+        emitter.write_text(output_entries_root / ".keep", "")
         return embedded_entries
 
     for entry_type in EMBEDDED_ENTRY_TYPES:
@@ -128,7 +145,7 @@ def _emit_embedded_entry_fragments(
         output_type_dir = output_entries_root / entry_type
         output_type_dir.mkdir(parents=True, exist_ok=True)
         if not source_type_dir.exists() or not source_type_dir.is_dir():
-            (output_type_dir / ".keep").write_text("", encoding="utf-8")
+            emitter.write_text(output_type_dir / ".keep", "")
             continue
 
         candidates: list[Path] = []
@@ -148,13 +165,13 @@ def _emit_embedded_entry_fragments(
             candidates.append(path)
 
         if not candidates:
-            (output_type_dir / ".keep").write_text("", encoding="utf-8")
+            emitter.write_text(output_type_dir / ".keep", "")
             continue
 
         entry_paths: list[str] = []
         for path in candidates:
             target = output_type_dir / path.name
-            target.write_text(path.read_text(encoding="utf-8"), encoding="utf-8")
+            emitter.write_text(target, path.read_text(encoding="utf-8"))
             entry_paths.append(
                 str((Path("fragments") / "entries" / entry_type / path.name).as_posix())
             )
@@ -235,105 +252,22 @@ def _build_character_book(
     }
 
 
-def _build_spec_v2_card(
-    spec_fields: dict[str, Any],
-    slug: str,
-    short_description: str | None,
-    embedded_book: dict[str, Any] | None,
-    fallback_name: str,
-    fallback_description: str,
-    fallback_tags: list[str],
-    variant_slug: str | None = None,
-    prose_variant: str | None = None,
-) -> dict[str, Any]:
-    template = _load_spec_v2_template()
-    data = template.get("data")
-    if not isinstance(data, dict):
-        data = {}
-        template["data"] = data
-
-    data["name"] = _coerce_string(spec_fields.get("name") or fallback_name)
-    data["description"] = _coerce_string(spec_fields.get("description") or fallback_description)
-    data["personality"] = _coerce_string(spec_fields.get("personality"))
-    data["scenario"] = _coerce_string(spec_fields.get("scenario"))
-    data["first_mes"] = _coerce_string(spec_fields.get("first_mes"))
-    data["mes_example"] = _coerce_string(spec_fields.get("mes_example"))
-    data["creator_notes"] = _coerce_string(spec_fields.get("creator_notes"))
-    data["system_prompt"] = _coerce_string(spec_fields.get("system_prompt"))
-    data["post_history_instructions"] = _coerce_string(spec_fields.get("post_history_instructions"))
-    data["alternate_greetings"] = _coerce_string_list(spec_fields.get("alternate_greetings"))
-    data["tags"] = _coerce_string_list(spec_fields.get("tags") or fallback_tags)
-    data["creator"] = _coerce_string(spec_fields.get("creator"))
-    data["character_version"] = _coerce_string(spec_fields.get("character_version"))
-
-    extensions = data.get("extensions")
-    if not isinstance(extensions, dict):
-        extensions = {}
-    botparts = extensions.get("botparts")
-    if not isinstance(botparts, dict):
-        botparts = {}
-    botparts["slug"] = slug
-    if variant_slug:
-        botparts["variant"] = variant_slug
-    if prose_variant:
-        botparts["proseVariant"] = prose_variant
-    if short_description:
-        botparts["shortDescription"] = short_description
-    extensions["botparts"] = botparts
-    data["extensions"] = extensions
-
-    if embedded_book:
-        data["character_book"] = embedded_book
-
-    return template
-
-
-def _build_text_chunk(keyword: str, text: str) -> bytes:
-    keyword_bytes = keyword.encode("latin-1")
-    text_bytes = text.encode("latin-1")
-    data = keyword_bytes + b"\x00" + text_bytes
-    length = struct.pack(">I", len(data))
-    chunk_type = b"tEXt"
-    crc = zlib.crc32(chunk_type + data) & 0xFFFFFFFF
-    return length + chunk_type + data + struct.pack(">I", crc)
-
-
-def _embed_text_chunk(png_bytes: bytes, chunk: bytes) -> bytes:
-    signature = b"\x89PNG\r\n\x1a\n"
-    if not png_bytes.startswith(signature):
-        raise ValueError("Invalid PNG signature.")
-    offset = len(signature)
-    while offset < len(png_bytes):
-        if offset + 8 > len(png_bytes):
-            break
-        length = int.from_bytes(png_bytes[offset : offset + 4], "big")
-        chunk_type = png_bytes[offset + 4 : offset + 8]
-        chunk_end = offset + 12 + length
-        if chunk_end > len(png_bytes):
-            break
-        if chunk_type == b"IEND":
-            return png_bytes[:offset] + chunk + png_bytes[offset:]
-        offset = chunk_end
-    raise ValueError("Unable to locate IEND chunk in PNG.")
-
-
-def _write_png_with_embedded_json(
-    source_path: Path,
+def _emit_avatar(
+    image_path: Path,
     target_path: Path,
-    payload: dict[str, Any],
+    stored_path: Path | None,
+    options: ExportOptions,
+    result: ExportResult,
+    emitter: Emitter,
 ) -> None:
-    json_text = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-    encoded = base64.b64encode(json_text.encode("utf-8")).decode("ascii")
-    text_chunk = _build_text_chunk("chara", encoded)
-    png_bytes = source_path.read_bytes()
-    output = _embed_text_chunk(png_bytes, text_chunk)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_path.write_bytes(output)
-
-
-def _copy_png(source_path: Path, target_path: Path) -> None:
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_path.write_bytes(source_path.read_bytes())
+    result.image_refs += 1
+    if options.asset_mode == "reference":
+        return
+    with profiling.phase("export.avatars"):
+        if options.asset_mode == "link" and stored_path is not None:
+            emitter.link_file(stored_path, target_path)
+        else:
+            emitter.copy_file(image_path, target_path)
 
 
 def _find_character_image(image_root: Path, stem: str) -> Path | None:
@@ -348,6 +282,120 @@ def _find_character_image(image_root: Path, stem: str) -> Path | None:
     return None
 
 
+def resolve_character_image(workspace_root: Path, source_dir: Path, slug: str) -> Path | None:
+    meta_path = source_dir / "meta.yaml"
+    meta = authoring.parse_meta_yaml(meta_path) if meta_path.exists() else {}
+    image_stem = meta.get("imageStem")
+    image_root = workspace_root / "sources" / "image_inputs"
+    image_key = image_stem.strip() if isinstance(image_stem, str) and image_stem.strip() else slug
+    return _find_character_image(image_root, image_key)
+
+
+def _emit_prose_cards(
+    renderer: cards.CardRenderer,
+    base_card: dict[str, Any],
+    draft_text: str | None,
+    target_root: Path,
+    emitter: Emitter,
+    suffix: str = "",
+) -> None:
+    for prose_variant in PROSE_VARIANTS:
+        first_mes = draft_text if prose_variant == "hybrid" else None
+        with profiling.phase("export.cards"):
+            card_payload = renderer.prose_card(base_card, prose_variant, first_mes=first_mes)
+        with profiling.phase("export.serialize"):
+            card_text = renderer.dumps(card_payload)
+        with profiling.phase("export.write"):
+            emitter.write_text(target_root / f"spec_v2.{prose_variant}{suffix}.json", card_text)
+
+
+def _emit_shared_lorebook(
+    renderer: cards.CardRenderer,
+    book: dict[str, Any],
+    export_root: Path,
+    result: ExportResult,
+    created_dirs: set[Path],
+    emitter: Emitter,
+) -> str:
+    with profiling.phase("export.serialize"):
+        text = renderer.lorebook_text(book)
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    stored_path = export_root / lorebook_relative_path(digest)
+    if digest in result.lorebooks:
+        # Another card set of this character already emitted the same book.
+        return lorebook_relative_path(digest)
+    with profiling.phase("export.write"):
+        if stored_path.is_file():
+            # Content-addressed: an existing store entry already holds these bytes.
+            emitter.retain([stored_path])
+        else:
+            emitter.write_bytes(stored_path, data)
+    created_dirs.add(stored_path.parent)
+    result.lorebooks[digest] = len(data)
+    return lorebook_relative_path(digest)
+
+
+def _emit_character_cards(
+    renderer: cards.CardRenderer,
+    spec_fields: dict[str, Any],
+    embedded_book: dict[str, Any] | None,
+    draft_text: str | None,
+    target_root: Path,
+    export_root: Path,
+    options: ExportOptions,
+    result: ExportResult,
+    created_dirs: set[Path],
+    emitter: Emitter,
+    variant_slug: str | None = None,
+) -> dict[str, Any]:
+    lorebook_ref = None
+    if embedded_book and options.lorebook_layout != "inline":
+        # Variants without their own entries pass the canonical book, so it is
+        # stored once and every card references it by content hash.
+        lorebook_ref = _emit_shared_lorebook(renderer, embedded_book, export_root, result, created_dirs, emitter)
+        result.lorebook_refs += len(PROSE_VARIANTS)
+    with profiling.phase("export.cards"):
+        base_card = renderer.base_card(spec_fields, embedded_book, variant_slug=variant_slug, lorebook_ref=lorebook_ref)
+    _emit_prose_cards(renderer, base_card, draft_text, target_root, emitter)
+    if lorebook_ref is None:
+        return base_card
+    # Self-contained cards for importers (SillyTavern) that cannot follow a lorebookRef.
+    with profiling.phase("export.cards"):
+        inline_card = renderer.base_card(spec_fields, embedded_book, variant_slug=variant_slug)
+    if options.lorebook_layout == "both":
+        _emit_prose_cards(renderer, inline_card, draft_text, target_root, emitter, suffix=".inline")
+    return inline_card
+
+
+def _emit_png_cards(
+    renderer: cards.CardRenderer,
+    base_card: dict[str, Any],
+    draft_text: str | None,
+    image_path: Path,
+    target_root: Path,
+    mode: str,
+    warnings: list[str],
+    context: str,
+    emitter: Emitter,
+) -> None:
+    for prose_variant in PROSE_VARIANTS:
+        first_mes = draft_text if prose_variant == "hybrid" else None
+        with profiling.phase("export.cards"):
+            card_payload = renderer.prose_card(base_card, prose_variant, first_mes=first_mes)
+        with profiling.phase("export.serialize"):
+            card_json = renderer.dumps(card_payload).rstrip("\n")
+        with profiling.phase("export.png"):
+            try:
+                emitter.write_stream(
+                    target_root / f"spec_v2.{prose_variant}.png",
+                    lambda handle: png_cards.write_card_png(image_path, handle, card_json, mode),
+                )
+            except ValueError as exc:
+                warnings.append(f"[{context}] PNG card export skipped for {image_path.name}: {exc}")
+                return
+
+
 def export_character_bundle(
     workspace_root: Path,
     source_dir: Path,
@@ -355,29 +403,92 @@ def export_character_bundle(
     manifest_payload: dict[str, Any],
     warnings: list[str],
     created_dirs: set[Path],
+    options: ExportOptions | None = None,
+    emitter: Emitter | None = None,
+) -> ExportResult:
+    options = options or ExportOptions()
+    emitter = emitter or Emitter(
+        workspace_root / "dist",
+        precompress=options.precompress,
+        json_profile=options.json_profile,
+    )
+    files_args = (workspace_root, source_dir, slug, manifest_payload, warnings, created_dirs, options, emitter)
+    if options.archive_format == "none":
+        return _export_character_files(*files_args)
+    with emitter.capture() as captured:
+        result = _export_character_files(*files_args)
+    if captured:
+        _emit_archive(workspace_root / "dist" / "src" / "export", slug, captured, options, result, created_dirs, emitter)
+    return result
+
+
+def _emit_archive(
+    export_root: Path,
+    slug: str,
+    captured: dict[Path, bytes | Path],
+    options: ExportOptions,
+    result: ExportResult,
+    created_dirs: set[Path],
+    emitter: Emitter,
 ) -> None:
-    canonical_path = source_dir / "canonical" / "spec_v2_fields.md"
-    spec_fields = authoring.load_spec_fields(canonical_path)
-    if not isinstance(spec_fields, dict):
-        warnings.append(f"[{slug}] Canonical spec_v2_fields.md missing or invalid; export skipped.")
-        return
+    # The slug's folder becomes the archive root; shared store files sit at
+    # their export-relative paths, so avatarAsset and lorebookRef still resolve.
+    character_root = export_root / "characters" / slug
+    assets_root = export_root / assets.ASSETS_DIRNAME
+    entries: dict[str, bytes | Path] = {}
+    for path, payload in captured.items():
+        if path.is_relative_to(character_root):
+            entries[path.relative_to(character_root).as_posix()] = payload
+        elif path.is_relative_to(assets_root) and options.asset_mode != "reference":
+            # Linked avatars already carry these bytes.
+            continue
+        else:
+            entries[path.relative_to(export_root).as_posix()] = payload
+    relative_path = archives.archive_relative_path(slug, options.archive_format)
+    with profiling.phase("export.archive"):
+        data = archives.build_archive(entries, options.archive_format)
+        emitter.write_bytes(export_root / relative_path, data)
+    created_dirs.add(export_root / archives.ARCHIVES_DIRNAME)
+    result.archive = relative_path
 
-    draft_path = source_dir / "preliminary_draft.md"
-    draft_text = draft_path.read_text(encoding="utf-8") if draft_path.exists() else None
-    short_description = authoring.load_short_description(source_dir / "canonical" / "shortDescription.md") or ""
+
+def _export_character_files(
+    workspace_root: Path,
+    source_dir: Path,
+    slug: str,
+    manifest_payload: dict[str, Any],
+    warnings: list[str],
+    created_dirs: set[Path],
+    options: ExportOptions,
+    emitter: Emitter,
+) -> ExportResult:
+    result = ExportResult()
+    canonical_path = source_dir / "canonical" / "spec_v2_fields.md"
+    with profiling.phase("export.sources"):
+        spec_fields = authoring.load_spec_fields(canonical_path)
+        if not isinstance(spec_fields, dict):
+            warnings.append(f"[{slug}] Canonical spec_v2_fields.md missing or invalid; export skipped.")
+            return result
+
+        draft_path = source_dir / "preliminary_draft.md"
+        draft_text = draft_path.read_text(encoding="utf-8") if draft_path.exists() else None
+        short_description = authoring.load_short_description(source_dir / "canonical" / "shortDescription.md") or ""
     display_name = manifest_payload.get("name") or slug
-    embedded_book = _build_character_book(source_dir, warnings, slug, display_name)
+    with profiling.phase("export.lorebook"):
+        embedded_book = _build_character_book(source_dir, warnings, slug, display_name)
 
     export_root = workspace_root / "dist" / "src" / "export"
     export_character_root = export_root / "characters" / slug
     export_character_root.mkdir(parents=True, exist_ok=True)
     created_dirs.add(export_character_root)
-    embedded_entries = _emit_embedded_entry_fragments(
-        source_dir,
-        export_character_root,
-        warnings,
-        slug,
-    )
+    with profiling.phase("export.fragments"):
+        embedded_entries = _emit_embedded_entry_fragments(
+            source_dir,
+            export_character_root,
+            warnings,
+            slug,
+            emitter,
+        )
     base_payload = manifest_payload.get("base")
     if not isinstance(base_payload, dict):
         base_payload = {"fragments": {}}
@@ -392,37 +503,93 @@ def export_character_bundle(
         fragments_payload["x"] = fragments_extensions
     fragments_extensions["embeddedEntries"] = embedded_entries
 
-    for prose_variant in PROSE_VARIANTS:
-        card_payload = _build_spec_v2_card(
-            spec_fields,
-            slug=slug,
-            short_description=short_description,
-            embedded_book=embedded_book,
-            fallback_name=display_name,
-            fallback_description=manifest_payload.get("description") or "",
-            fallback_tags=manifest_payload.get("tags") or [],
-            prose_variant=prose_variant,
-        )
-        if prose_variant == "hybrid" and draft_text is not None:
-            card_payload["data"]["first_mes"] = draft_text
-        _write_json(export_character_root / f"spec_v2.{prose_variant}.json", card_payload)
-    _write_json(export_character_root / "manifest.json", manifest_payload)
+    renderer = cards.CardRenderer(
+        slug,
+        short_description=short_description,
+        fallback_name=display_name,
+        fallback_description=manifest_payload.get("description") or "",
+        fallback_tags=manifest_payload.get("tags") or [],
+        json_profile=emitter.json_profile,
+    )
+    # Always self-contained (character_book embedded), whatever the lorebook layout.
+    card = _emit_character_cards(
+        renderer,
+        spec_fields,
+        embedded_book,
+        draft_text,
+        export_character_root,
+        export_root,
+        options,
+        result,
+        created_dirs,
+        emitter,
+    )
+    counter = tokens.active_token_counter()
+    if counter is not None:
+        with profiling.phase("export.tokens"):
+            result.ai_tokens = counter.count_card(card["data"], embedded_book)
+            result.token_keys = counter.take_used()
+        manifest_x = manifest_payload.setdefault("x", {})
+        if isinstance(manifest_x, dict):
+            # An authored aiTokens value still takes precedence over the estimate.
+            if manifest_x.get("aiTokens") is None:
+                manifest_x["aiTokens"] = result.ai_tokens["total"]
+            manifest_x["aiTokenBreakdown"] = result.ai_tokens
+
+    image_path = resolve_character_image(workspace_root, source_dir, slug)
+    stored_path: Path | None = None
+    if image_path is not None and options.asset_mode != "copy":
+        # Store each unique image once; avatars become hardlinks or manifest references.
+        with profiling.phase("export.avatars"):
+            digest = assets.file_digest(image_path)
+            stored_path = export_root / assets.asset_relative_path(digest, image_path.suffix)
+            if stored_path.is_file():
+                # Content-addressed: an existing store entry already holds these bytes.
+                emitter.retain([stored_path])
+            else:
+                emitter.copy_file(image_path, stored_path)
+            created_dirs.add(stored_path.parent)
+            result.assets[digest] = stored_path.stat().st_size
+        if options.asset_mode == "reference":
+            manifest_x = manifest_payload.setdefault("x", {})
+            if isinstance(manifest_x, dict):
+                manifest_x["avatarAsset"] = assets.asset_relative_path(digest, image_path.suffix)
+    if options.validate:
+        with profiling.phase("export.validate"):
+            violation_warnings, result.schema_violations = validation.validate_payload(
+                manifest_payload, validation.MANIFEST_SCHEMA, slug, "manifest.json"
+            )
+            warnings.extend(violation_warnings)
+    with profiling.phase("export.write"):
+        emitter.write_json(export_character_root / "manifest.json", manifest_payload)
 
-    meta_path = source_dir / "meta.yaml"
-    meta = authoring.parse_meta_yaml(meta_path) if meta_path.exists() else {}
-    image_stem = meta.get("imageStem")
-    image_root = workspace_root / "sources" / "image_inputs"
-    image_key = image_stem.strip() if isinstance(image_stem, str) and image_stem.strip() else slug
-    image_path = _find_character_image(image_root, image_key)
     if image_path is None:
         warnings.append(f"[{slug}] PNG not found under sources/image_inputs; image export skipped.")
     else:
-        png_target = export_character_root / "avatarImage.png"
-        _copy_png(image_path, png_target)
+        _emit_avatar(
+            image_path,
+            export_character_root / "avatarImage.png",
+            stored_path,
+            options,
+            result,
+            emitter,
+        )
+        if options.png_cards != "none":
+            _emit_png_cards(
+                renderer,
+                card,
+                draft_text,
+                image_path,
+                export_character_root,
+                options.png_cards,
+                warnings,
+                slug,
+                emitter,
+            )
 
     variants_root = source_dir / "variants"
     if not variants_root.exists():
-        return
+        return result
     for variant_dir in sorted(path for path in variants_root.iterdir() if path.is_dir()):
         spec_path = variant_dir / "spec_v2_fields.md"
         if not spec_path.exists():
@@ -432,37 +599,50 @@ def export_character_bundle(
         except ValueError as exc:
             warnings.append(f"[{slug}] Variant '{variant_dir.name}' export skipped: {exc}")
             continue
-        variant_embedded_book = _build_character_book(variant_dir, warnings, slug, display_name)
+        with profiling.phase("export.lorebook"):
+            variant_embedded_book = _build_character_book(variant_dir, warnings, slug, display_name)
         if variant_embedded_book is None:
             variant_embedded_book = embedded_book
         variant_root = export_character_root / "variants" / variant_dir.name
         variant_root.mkdir(parents=True, exist_ok=True)
         created_dirs.add(variant_root)
-        _emit_embedded_entry_fragments(
-            variant_dir,
+        with profiling.phase("export.fragments"):
+            _emit_embedded_entry_fragments(
+                variant_dir,
+                variant_root,
+                warnings,
+                f"{slug}:{variant_dir.name}",
+                emitter,
+            )
+        variant_card = _emit_character_cards(
+            renderer,
+            variant_fields,
+            variant_embedded_book,
+            draft_text,
             variant_root,
-            warnings,
-            f"{slug}:{variant_dir.name}",
+            export_root,
+            options,
+            result,
+            created_dirs,
+            emitter,
+            variant_slug=variant_dir.name,
         )
-        for prose_variant in PROSE_VARIANTS:
-            variant_payload = _build_spec_v2_card(
-                variant_fields,
-                slug=slug,
-                short_description=short_description,
-                embedded_book=variant_embedded_book,
-                fallback_name=display_name,
-                fallback_description=manifest_payload.get("description") or "",
-                fallback_tags=manifest_payload.get("tags") or [],
-                variant_slug=variant_dir.name,
-                prose_variant=prose_variant,
-            )
-            if prose_variant == "hybrid" and draft_text is not None:
-                variant_payload["data"]["first_mes"] = draft_text
-            _write_json(variant_root / f"spec_v2.{prose_variant}.json", variant_payload)
         if image_path is None:
             warnings.append(
                 f"[{slug}] PNG not found for variant '{variant_dir.name}'; image export skipped."
             )
         else:
-            png_target = variant_root / "avatarImage.png"
-            _copy_png(image_path, png_target)
+            _emit_avatar(image_path, variant_root / "avatarImage.png", stored_path, options, result, emitter)
+            if options.png_cards != "none":
+                _emit_png_cards(
+                    renderer,
+                    variant_card,
+                    draft_text,
+                    image_path,
+                    variant_root,
+                    options.png_cards,
+                    warnings,
+                    f"{slug}:{variant_dir.name}",
+                    emitter,
+                )
+    return result
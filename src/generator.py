@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
 import json
 import re
 import os
-import shutil
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
+from src import archives
+from src import assets
 from src import authoring
+from src import cards
+from src import catalogue
 from src import exporter
+from src import ledger
+from src import png_cards
+from src import profiling
+from src import search
+from src import tokens
+from src import validation
+from src import watch
+from src.emitter import CHANGED_FILES_NAME, JSON_PROFILES, CompressionStats, Emitter
+from src.source_cache import SourceCache, SourceCacheStats, activate_process_cache, active_cache, use_source_cache
 
 GENERATOR_VERSION = "0.1.0"
 SITE_ONLY_FIELDS = {
@@ -27,6 +42,7 @@ EMBEDDED_ENTRY_PLACEHOLDERS = {".keep", ".gitkeep"}
 SCOPE_LAYERS = {"world", "character", "variant"}
 SCOPE_SIDECAR_SUFFIX = ".scope.json"
 WORLD_PROMOTION_FILES = ("PROMOTE.md", "meta.yaml")
+PROFILE_SLOWEST_SLUGS = 10
 
 
 @dataclass
@@ -36,20 +52,27 @@ class BuildSummary:
     total_count: int
     created_dirs: list[str]
     warnings: list[str]
+    cache_stats: SourceCacheStats | None = None
+    asset_mode: str = "copy"
+    asset_refs: int = 0
+    asset_bytes_referenced: int = 0
+    asset_bytes_stored: int = 0
+    asset_count: int = 0
+    profile: profiling.BuildProfiler | None = None
+    compression: CompressionStats | None = None
+    lorebook_layout: str = "inline"
+    lorebook_refs: int = 0
+    lorebook_bytes_referenced: int = 0
+    lorebook_bytes_stored: int = 0
+    lorebook_count: int = 0
+    validated: bool = False
+    schema_violations: int = 0
 
 
 def _load_json(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _write_json(path: Path, payload: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-
-
 def _ensure_dir(path: Path, created_dirs: set[Path]) -> None:
     path.mkdir(parents=True, exist_ok=True)
     created_dirs.add(path)
@@ -641,12 +664,72 @@ def build_site_data(
     placeholders: int = 0,
     include_timestamps: bool = False,
     strict_scopes: bool = False,
+    incremental: bool = False,
+    jobs: int = 1,
+    source_cache: SourceCache | None = None,
+    cache_stats: bool = False,
+    export_options: exporter.ExportOptions | None = None,
+    changed_sources: Iterable[str] | None = None,
+    profile: bool = False,
+    cprofile: bool = False,
+    catalogue_page_size: int = 0,
+    tag_index_encoding: str = "list",
+    search_lorebooks: bool = False,
+) -> BuildSummary:
+    # Every source loader (spec fields, meta.yaml, short descriptions) goes
+    # through one build-scoped cache so each file is parsed once per build.
+    cache = source_cache if source_cache is not None else SourceCache()
+    profiler = profiling.BuildProfiler() if profile or cprofile else None
+    python_profiler = cProfile.Profile() if cprofile else None
+    if python_profiler is not None:
+        python_profiler.enable()
+    try:
+        with use_source_cache(cache), profiling.use_profiler(profiler):
+            return _build_site_data(
+                workspace_root,
+                placeholders=placeholders,
+                include_timestamps=include_timestamps,
+                strict_scopes=strict_scopes,
+                incremental=incremental,
+                jobs=jobs,
+                cache=cache,
+                cache_stats=cache_stats,
+                options=export_options or exporter.ExportOptions(),
+                changed_sources=set(changed_sources) if changed_sources is not None else None,
+                catalogue_page_size=catalogue_page_size,
+                tag_index_encoding=tag_index_encoding,
+                search_lorebooks=search_lorebooks,
+            )
+    finally:
+        if python_profiler is not None:
+            # Only the parent process is sampled; --jobs workers are not.
+            python_profiler.disable()
+            (workspace_root / "dist").mkdir(parents=True, exist_ok=True)
+            python_profiler.dump_stats(workspace_root / "dist" / profiling.CPROFILE_FILENAME)
+
+
+def _build_site_data(
+    workspace_root: Path,
+    placeholders: int,
+    include_timestamps: bool,
+    strict_scopes: bool,
+    incremental: bool,
+    jobs: int,
+    cache: SourceCache,
+    cache_stats: bool,
+    options: exporter.ExportOptions,
+    changed_sources: set[str] | None = None,
+    catalogue_page_size: int = 0,
+    tag_index_encoding: str = "list",
+    search_lorebooks: bool = False,
 ) -> BuildSummary:
     # This build is intentionally deterministic: identical inputs under sources/
     # must emit byte-identical dist/src/export outputs. Avoid non-deterministic
     # sources (network calls, current time, random) unless explicitly gated.
+    build_started = time.perf_counter()
     warnings: list[str] = []
     created_dirs: set[Path] = set()
+    cache_start = cache.snapshot()
     if strict_scopes:
         warnings.append("Strict scope mode is ignored; fragment emission is disabled in export builds.")
 
@@ -654,11 +737,18 @@ def build_site_data(
     dist_root = workspace_root / "dist"
     data_root = dist_root / "src" / "data"
     export_root = dist_root / "src" / "export"
+    ledger_path = dist_root / ledger.LEDGER_FILENAME
 
-    if data_root.exists():
-        shutil.rmtree(data_root)
-    if export_root.exists():
-        shutil.rmtree(export_root)
+    # Incremental builds keep dist/src/export and only re-export slugs whose
+    # ledger input hash changed; the catalogue and report are always rebuilt.
+    previous_ledger = ledger.load_ledger(ledger_path, GENERATOR_VERSION) if incremental else {}
+    next_ledger: dict[str, ledger.LedgerEntry] = {}
+
+    # Outputs are rewritten in place; files this build did not emit are pruned
+    # at the end so unchanged files keep their bytes and mtimes.
+    emitter = Emitter(dist_root, precompress=options.precompress, json_profile=options.json_profile)
+    if options.validate:
+        validation.require_jsonschema()
 
     _ensure_dir(data_root, created_dirs)
     _ensure_dir(export_root, created_dirs)
@@ -696,6 +786,7 @@ def build_site_data(
             source_manifest["_source_dir"] = character_dir
             character_sources.append(source_manifest)
 
+    profiling.lap("discovery")
     real_slugs = {manifest.get("slug") for manifest in character_sources if manifest.get("slug")}
 
     placeholder_manifests: list[dict[str, Any]] = []
@@ -711,10 +802,16 @@ def build_site_data(
 
     all_manifests = character_sources + placeholder_manifests
     catalogue_entries: list[dict[str, Any]] = []
+    # Warnings are collected per slug so exports can run out of order (see
+    # jobs) and still merge back in the exact order of a serial build.
+    slug_warnings_in_order: list[list[str]] = []
+    export_jobs: list[tuple[int, Path, str, dict[str, Any]]] = []
 
     for source_manifest in all_manifests:
         slug = source_manifest.get("slug") or "unknown"
         site_entry = site_entries_by_slug.get(slug, {})
+        slug_warnings: list[str] = []
+        slug_warnings_in_order.append(slug_warnings)
 
         tags_input = source_manifest.get("tags")
         if tags_input is None:
@@ -722,7 +819,7 @@ def build_site_data(
         spoiler_input = _extract_site_field(source_manifest, "spoilerTags")
         if spoiler_input is None:
             spoiler_input = _extract_site_field(site_entry, "spoilerTags")
-        tags, spoiler_tags = _partition_tags(tags_input or [], spoiler_input or [], warnings, slug)
+        tags, spoiler_tags = _partition_tags(tags_input or [], spoiler_input or [], slug_warnings, slug)
 
         short_description = (
             _extract_site_field(source_manifest, "shortDescription")
@@ -746,7 +843,7 @@ def build_site_data(
         ai_tokens = _coerce_ai_tokens(
             _extract_site_field(source_manifest, "aiTokens")
             or _extract_site_field(site_entry, "aiTokens"),
-            warnings,
+            slug_warnings,
             slug,
         )
         site_fields = {
@@ -799,14 +896,7 @@ def build_site_data(
         }
 
         if source_dir:
-            exporter.export_character_bundle(
-                workspace_root=workspace_root,
-                source_dir=Path(source_dir),
-                slug=slug,
-                manifest_payload=manifest_payload,
-                warnings=warnings,
-                created_dirs=created_dirs,
-            )
+            export_jobs.append((len(slug_warnings_in_order) - 1, Path(source_dir), slug, manifest_payload))
         catalogue_entry = {
             "slug": slug,
             "name": manifest_payload["name"],
@@ -814,6 +904,7 @@ def build_site_data(
             "tags": tags,
             "shortDescription": short_description,
             "spoilerTags": spoiler_tags,
+            "aiTokens": ai_tokens,
             "uploadDate": upload_date,
             "redistributeAllowed": manifest_payload["redistributeAllowed"],
             "placeholder": source_manifest in placeholder_manifests,
@@ -822,37 +913,321 @@ def build_site_data(
             catalogue_entry["variantSlugs"] = variant_slugs
         catalogue_entries.append(catalogue_entry)
 
+    profiling.lap("manifests")
+    pending_jobs = export_jobs
+    if incremental and changed_sources is not None:
+        # The caller (bp build --watch) already knows which source directories
+        # changed, so the rest reuse their ledger entry without re-hashing.
+        # Directory names need not match manifest slugs.
+        pending_jobs = []
+        for job in export_jobs:
+            slug = job[2]
+            previous = previous_ledger.get(slug)
+            if job[1].name not in changed_sources and _retain_previous_export(export_root, slug, previous, emitter):
+                next_ledger[slug] = previous
+            else:
+                pending_jobs.append(job)
+    token_cache_path = dist_root / tokens.TOKEN_CACHE_FILENAME
+    counter = tokens.load_token_counter(token_cache_path, tokens.get_estimator(options.token_estimator))
+    with tokens.use_token_counter(counter):
+        export_results = _run_export_jobs(workspace_root, pending_jobs, previous_ledger, jobs, options, emitter)
+    for (_, _, slug, _), result in zip(pending_jobs, export_results):
+        next_ledger[slug] = result
+    # Kept outside the export tree like the ledger; it only speeds up counting.
+    tokens.write_token_cache(
+        token_cache_path, counter, {key for entry in next_ledger.values() for key in entry.token_keys}
+    )
+    export_results_by_index: dict[int, ledger.LedgerEntry] = {
+        index: next_ledger[slug] for index, _, slug, _ in export_jobs
+    }
+    for index, slug_warnings in enumerate(slug_warnings_in_order):
+        warnings.extend(slug_warnings)
+        result = export_results_by_index.get(index)
+        if result is not None:
+            warnings.extend(result.warnings)
+            created_dirs.update(dist_root / Path(relative) for relative in result.created_dirs)
+
+    profiling.lap("export")
+    stored_assets: dict[str, int] = {}
+    stored_lorebooks: dict[str, int] = {}
+    for entry in next_ledger.values():
+        stored_assets.update(entry.assets)
+        stored_lorebooks.update(entry.lorebooks)
+    ledger.write_ledger(ledger_path, next_ledger, GENERATOR_VERSION)
+    for catalogue_entry in catalogue_entries:
+        ledger_entry = next_ledger.get(catalogue_entry["slug"])
+        if ledger_entry is not None and ledger_entry.ai_tokens is not None:
+            if catalogue_entry["aiTokens"] is None:
+                catalogue_entry["aiTokens"] = ledger_entry.ai_tokens["total"]
+            catalogue_entry["aiTokenBreakdown"] = ledger_entry.ai_tokens
+
     catalogue_entries.sort(key=lambda entry: entry["slug"])
-    catalogue_payload: dict[str, Any] = {"entries": catalogue_entries}
-    if include_timestamps:
-        catalogue_payload["generatedAt"] = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    _write_json(data_root / "catalogue.json", catalogue_payload)
-
-    report_path = dist_root / "REPORT.md"
-    report_path.write_text(
-        _render_report(
-            BuildSummary(
-                real_count=len(character_sources),
-                placeholder_count=placeholder_count,
-                total_count=len(character_sources),
-                created_dirs=sorted(str(path.relative_to(dist_root)) for path in created_dirs),
-                warnings=warnings,
-            ),
-            include_timestamps=include_timestamps,
+    catalogue.write_catalogue(
+        emitter,
+        data_root,
+        catalogue_entries,
+        page_size=catalogue_page_size,
+        generated_at=datetime.utcnow().isoformat(timespec="seconds") + "Z" if include_timestamps else None,
+    )
+    emitter.write_json(
+        data_root / catalogue.TAG_INDEX_FILENAME,
+        catalogue.build_tag_index(catalogue_entries, encoding=tag_index_encoding),
+    )
+    source_dirs = {slug: source_dir for _, source_dir, slug, _ in export_jobs}
+    search.write_search_index(
+        emitter,
+        data_root / search.SEARCH_DIRNAME,
+        [entry["slug"] for entry in catalogue_entries],
+        (
+            search.catalogue_document(
+                entry,
+                _search_lorebook(source_dirs.get(entry["slug"]), entry) if search_lorebooks else None,
+            )
+            for entry in catalogue_entries
         ),
-        encoding="utf-8",
     )
+    profiling.lap("catalogue")
+    # Removed slugs, stale variants and unreferenced store assets are whatever
+    # this build did not emit.
+    emitter.prune([data_root, export_root], keep_dirs=created_dirs)
+    profiling.lap("prune")
 
-    return BuildSummary(
+    summary = BuildSummary(
         real_count=len(character_sources),
         placeholder_count=placeholder_count,
         total_count=len(character_sources),
         created_dirs=sorted(str(path.relative_to(dist_root)) for path in created_dirs),
         warnings=warnings,
+        cache_stats=cache.snapshot().since(cache_start),
+        asset_mode=options.asset_mode,
+        asset_refs=sum(entry.image_refs for entry in next_ledger.values()),
+        asset_bytes_referenced=sum(
+            entry.image_refs * size
+            for entry in next_ledger.values()
+            for size in entry.assets.values()
+        ),
+        asset_bytes_stored=sum(stored_assets.values()),
+        asset_count=len(stored_assets),
+        profile=profiling.active_profiler(),
+        compression=emitter.compression if options.precompress else None,
+        lorebook_layout=options.lorebook_layout,
+        lorebook_refs=sum(entry.lorebook_refs for entry in next_ledger.values()),
+        # Each shared card would otherwise embed its lorebook; the stored
+        # bytes are the files under lorebooks/.
+        lorebook_bytes_referenced=sum(
+            entry.lorebook_refs * size
+            for entry in next_ledger.values()
+            for size in entry.lorebooks.values()
+        ),
+        lorebook_bytes_stored=sum(stored_lorebooks.values()),
+        lorebook_count=len(stored_lorebooks),
+        validated=options.validate,
+        schema_violations=sum(entry.schema_violations for entry in next_ledger.values()),
+    )
+    if summary.profile is not None:
+        summary.profile.total_seconds = time.perf_counter() - build_started
+        summary.profile.files = len(emitter.written)
+        summary.profile.files_written = len(emitter.added) + len(emitter.modified)
+        summary.profile.bytes_written = emitter.bytes_written
+    emitter.write_text(
+        dist_root / "REPORT.md",
+        _render_report(summary, include_timestamps=include_timestamps, cache_stats=cache_stats),
+    )
+    if summary.profile is not None:
+        # Timings are inherently run-specific, so the profile lives outside
+        # the deterministic export tree and only exists under --profile.
+        profiling.lap("report")
+        emitter.write_json(dist_root / profiling.PROFILE_FILENAME, summary.profile.to_payload())
+    emitter.write_change_list(dist_root / CHANGED_FILES_NAME)
+
+    return summary
+
+
+def _run_export_jobs(
+    workspace_root: Path,
+    export_jobs: list[tuple[int, Path, str, dict[str, Any]]],
+    previous_ledger: dict[str, ledger.LedgerEntry],
+    jobs: int,
+    options: exporter.ExportOptions,
+    emitter: Emitter,
+) -> list[ledger.LedgerEntry]:
+    arguments = [
+        (workspace_root, source_dir, slug, manifest_payload, previous_ledger.get(slug), options)
+        for _, source_dir, slug, manifest_payload in export_jobs
+    ]
+    if jobs <= 1 or len(arguments) <= 1:
+        return [_profiled_export_character(*item, emitter) for item in arguments]
+    # Each worker returns its own warnings and created dirs; map() keeps the
+    # results in submission order so the merge stays deterministic.
+    results: list[ledger.LedgerEntry] = []
+    cache = active_cache()
+    profiler = profiling.active_profiler()
+    counter = tokens.active_token_counter()
+    profile_flags = [profiler is not None] * len(arguments)
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(arguments)),
+        initializer=_init_export_worker,
+        initargs=(options.token_estimator, counter.counts if counter is not None else None),
+    ) as executor:
+        for entry, worker_stats, emitted, worker_profile, counted in executor.map(
+            _export_character_in_worker, *zip(*arguments), profile_flags
+        ):
+            results.append(entry)
+            emitter.merge(emitted)
+            if cache is not None:
+                cache.stats.add(worker_stats)
+            if profiler is not None and worker_profile is not None:
+                profiler.merge(worker_profile)
+            if counter is not None:
+                counter.merge(counted)
+    return results
+
+
+def _init_export_worker(token_estimator: str, token_counts: dict[str, int] | None) -> None:
+    activate_process_cache()
+    if token_counts is not None:
+        tokens.activate_process_counter(token_estimator, token_counts)
+
+
+def _export_character_in_worker(
+    workspace_root: Path,
+    source_dir: Path,
+    slug: str,
+    manifest_payload: dict[str, Any],
+    previous: ledger.LedgerEntry | None,
+    options: exporter.ExportOptions,
+    profile: bool = False,
+) -> tuple[
+    ledger.LedgerEntry,
+    SourceCacheStats,
+    dict[str, Any],
+    profiling.BuildProfiler | None,
+    dict[str, int],
+]:
+    cache = active_cache()
+    emitter = Emitter(workspace_root / "dist", precompress=options.precompress, json_profile=options.json_profile)
+    start = cache.snapshot() if cache is not None else SourceCacheStats()
+    with profiling.use_profiler(profiling.BuildProfiler() if profile else None) as profiler:
+        entry = _profiled_export_character(
+            workspace_root, source_dir, slug, manifest_payload, previous, options, emitter
+        )
+    end = cache.snapshot() if cache is not None else SourceCacheStats()
+    counter = tokens.active_token_counter()
+    counted = counter.take_added() if counter is not None else {}
+    return entry, end.since(start), emitter.export_state(), profiler, counted
+
+
+def _profiled_export_character(
+    workspace_root: Path,
+    source_dir: Path,
+    slug: str,
+    manifest_payload: dict[str, Any],
+    previous: ledger.LedgerEntry | None,
+    options: exporter.ExportOptions,
+    emitter: Emitter,
+) -> ledger.LedgerEntry:
+    profiler = profiling.active_profiler()
+    if profiler is None:
+        return _export_character(workspace_root, source_dir, slug, manifest_payload, previous, options, emitter)
+    started = time.perf_counter()
+    files_before = len(emitter.written)
+    bytes_before = emitter.bytes_written
+    entry = _export_character(workspace_root, source_dir, slug, manifest_payload, previous, options, emitter)
+    profiler.slugs[slug] = profiling.SlugTiming(
+        seconds=time.perf_counter() - started,
+        files=len(emitter.written) - files_before,
+        bytes_written=emitter.bytes_written - bytes_before,
+        skipped=entry is previous,
+    )
+    return entry
+
+
+def _export_character(
+    workspace_root: Path,
+    source_dir: Path,
+    slug: str,
+    manifest_payload: dict[str, Any],
+    previous: ledger.LedgerEntry | None,
+    options: exporter.ExportOptions,
+    emitter: Emitter,
+) -> ledger.LedgerEntry:
+    dist_root = workspace_root / "dist"
+    export_root = dist_root / "src" / "export"
+    input_hash = ledger.hash_character_inputs(
+        source_dir,
+        exporter.resolve_character_image(workspace_root, source_dir, slug),
+        cards.SPEC_V2_TEMPLATE_PATH,
+        manifest_payload,
+        GENERATOR_VERSION,
+        asdict(options),
+    )
+    if (
+        previous is not None
+        and previous.input_hash == input_hash
+        and _retain_previous_export(export_root, slug, previous, emitter)
+    ):
+        return previous
+
+    slug_warnings: list[str] = []
+    slug_dirs: set[Path] = set()
+    result = exporter.export_character_bundle(
+        workspace_root=workspace_root,
+        source_dir=source_dir,
+        slug=slug,
+        manifest_payload=manifest_payload,
+        warnings=slug_warnings,
+        created_dirs=slug_dirs,
+        options=options,
+        emitter=emitter,
+    )
+    return ledger.LedgerEntry(
+        input_hash=input_hash,
+        warnings=slug_warnings,
+        created_dirs=sorted(path.relative_to(dist_root).as_posix() for path in slug_dirs),
+        assets=result.assets,
+        image_refs=result.image_refs,
+        lorebooks=result.lorebooks,
+        lorebook_refs=result.lorebook_refs,
+        ai_tokens=result.ai_tokens,
+        token_keys=result.token_keys,
+        archive=result.archive,
+        schema_violations=result.schema_violations,
     )
 
 
-def _render_report(summary: BuildSummary, include_timestamps: bool) -> str:
+def _search_lorebook(source_dir: Path | None, entry: dict[str, Any]) -> dict[str, Any] | None:
+    # Same book the exporter embeds; its warnings were already reported there.
+    if source_dir is None:
+        return None
+    return exporter._build_character_book(source_dir, [], entry["slug"], entry["name"])
+
+
+def _retain_previous_export(
+    export_root: Path,
+    slug: str,
+    previous: ledger.LedgerEntry | None,
+    emitter: Emitter,
+) -> bool:
+    # A slug's earlier output is reusable only if its folder, its archive and
+    # every store asset and shared lorebook it references are still on disk.
+    if previous is None:
+        return False
+    export_character_root = export_root / "characters" / slug
+    assets_root = export_root / assets.ASSETS_DIRNAME
+    stored = [list(assets_root.glob(f"{digest}.*")) for digest in previous.assets]
+    shared = [export_root / exporter.lorebook_relative_path(digest) for digest in previous.lorebooks]
+    if previous.archive:
+        shared.append(export_root / previous.archive)
+    if not export_character_root.exists() or not all(stored) or not all(path.is_file() for path in shared):
+        return False
+    emitter.retain_tree(export_character_root)
+    for paths in stored:
+        emitter.retain(paths)
+    emitter.retain(shared)
+    return True
+
+
+def _render_report(summary: BuildSummary, include_timestamps: bool, cache_stats: bool = False) -> str:
     lines = [
         "# Botparts Generator Report",
         "",
@@ -891,6 +1266,73 @@ def _render_report(summary: BuildSummary, include_timestamps: bool) -> str:
             "- Tag partitioning: tags starting with 'spoiler:' move to spoilerTags; prefix stripped, trimmed, deduped.",
             "- uploadDate formatting: YYYY-MM-DD (date-only); empty string when unknown.",
             "- aiTokens type: number|null.",
+            "- aiTokens when not authored: estimated from the canonical card's prompt fields and lorebook; "
+            "per-field counts under aiTokenBreakdown.",
+        ]
+    )
+    if cache_stats and summary.cache_stats is not None:
+        # Opt-in: lookup counts differ between serial, parallel and incremental
+        # builds, so they would otherwise break byte-identical reports.
+        lines.extend(
+            [
+                "",
+                "## Source Cache",
+                f"- Hits: {summary.cache_stats.hits}",
+                f"- Misses: {summary.cache_stats.misses}",
+            ]
+        )
+    if summary.asset_mode != "copy":
+        lines.extend(
+            [
+                "",
+                "## Asset Store",
+                f"- Mode: {summary.asset_mode}",
+                f"- Avatar references: {summary.asset_refs}",
+                f"- Unique images stored: {summary.asset_count}",
+                f"- Bytes referenced: {summary.asset_bytes_referenced}",
+                f"- Bytes stored: {summary.asset_bytes_stored}",
+                f"- Bytes saved by deduplication: {summary.asset_bytes_referenced - summary.asset_bytes_stored}",
+            ]
+        )
+    if summary.lorebook_layout != "inline":
+        lines.extend(
+            [
+                "",
+                "## Lorebook Store",
+                f"- Layout: {summary.lorebook_layout}",
+                f"- Card references: {summary.lorebook_refs}",
+                f"- Unique lorebooks stored: {summary.lorebook_count}",
+                f"- Bytes referenced: {summary.lorebook_bytes_referenced}",
+                f"- Bytes stored: {summary.lorebook_bytes_stored}",
+                f"- Bytes saved by deduplication: {summary.lorebook_bytes_referenced - summary.lorebook_bytes_stored}",
+            ]
+        )
+    if summary.validated:
+        lines.extend(
+            [
+                "",
+                "## Validation",
+                f"- Manifests checked against: {validation.MANIFEST_SCHEMA}",
+                f"- Catalogue: not validated (no upstream catalogue schema; see {validation.CATALOGUE_SCHEMA_REQUEST})",
+                f"- Violations: {summary.schema_violations}",
+            ]
+        )
+    if summary.compression is not None:
+        compression = summary.compression
+        lines.extend(
+            [
+                "",
+                "## Precompression",
+                f"- JSON files with .gz siblings: {compression.files}",
+                f"- Raw bytes: {compression.raw_bytes}",
+                f"- Gzip bytes: {compression.gzip_bytes}",
+                f"- Bytes saved: {compression.raw_bytes - compression.gzip_bytes}",
+            ]
+        )
+    if summary.profile is not None:
+        lines.extend(["", "## Performance", *_render_profile(summary.profile)])
+    lines.extend(
+        [
             "",
             "## Warnings",
         ]
@@ -903,6 +1345,34 @@ def _render_report(summary: BuildSummary, include_timestamps: bool) -> str:
     return "\n".join(lines) + "\n"
 
 
+def _render_profile(profile: profiling.BuildProfiler) -> list[str]:
+    lines = [
+        f"- Total time: {profile.total_seconds:.3f}s",
+        f"- Files emitted: {profile.files} ({profile.files_written} written, {profile.bytes_written} bytes)",
+        "- Phases:",
+    ]
+    for name, timing in profile.phases.items():
+        calls = f" ({timing.calls} calls)" if timing.calls > 1 else ""
+        lines.append(f"  - {name}: {timing.seconds:.3f}s{calls}")
+    validate_seconds = sum(timing.seconds for name, timing in profile.phases.items() if name.endswith(".validate"))
+    validated = sum(1 for timing in profile.slugs.values() if not timing.skipped)
+    if validate_seconds and validated:
+        lines.append(
+            f"- Validation overhead: {validate_seconds * 1000:.1f}ms "
+            f"({validate_seconds * 1000 * 1000 / validated:.1f}ms per 1k characters)"
+        )
+    slowest = sorted(profile.slugs.items(), key=lambda item: (-item[1].seconds, item[0]))[:PROFILE_SLOWEST_SLUGS]
+    if slowest:
+        lines.append("- Slowest characters:")
+        for slug, timing in slowest:
+            status = ", unchanged" if timing.skipped else ""
+            lines.append(
+                f"  - {slug}: {timing.seconds:.3f}s, {timing.files} files, "
+                f"{timing.bytes_written} bytes written{status}"
+            )
+    return lines
+
+
 def _parse_placeholders(value: str | None) -> int:
     if not value:
         return 0
@@ -915,8 +1385,34 @@ def _parse_placeholders(value: str | None) -> int:
     return parsed
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Generate Botparts export packages.")
+def parse_page_size(value: str | None) -> int:
+    if not value:
+        return 0
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid page size: {value}") from exc
+    if parsed < 0:
+        raise argparse.ArgumentTypeError("Page size must be >= 0")
+    return parsed
+
+
+def parse_jobs(value: str | None) -> int:
+    if not value:
+        return 1
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid job count: {value}") from exc
+    if parsed < 0:
+        raise argparse.ArgumentTypeError("Job count must be >= 0")
+    if parsed == 0:
+        return os.cpu_count() or 1
+    return parsed
+
+
+def add_build_arguments(parser: argparse.ArgumentParser) -> None:
+    # Shared by this entry point and `bp build` so the two stay in step.
     parser.add_argument(
         "--placeholders",
         type=_parse_placeholders,
@@ -926,29 +1422,192 @@ def main() -> None:
     parser.add_argument(
         "--include-timestamps",
         action="store_true",
-        help="Include timestamps in the report.",
+        help="Include timestamps in the report and catalogue.json.",
     )
     parser.add_argument(
         "--strict-scope",
         action="store_true",
         help="Treat missing world packs or promotion gate failures as errors.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-export only characters whose inputs changed since the last build.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=parse_jobs,
+        default=None,
+        help="Export characters across N worker processes (0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Include source cache hit/miss counts in the report.",
+    )
+    parser.add_argument(
+        "--asset-mode",
+        choices=assets.ASSET_MODES,
+        default="copy",
+        help="Avatar emission: per-folder copies, hardlinks into assets/, or manifest references.",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Write deterministic .gz siblings next to every JSON file under dist/src.",
+    )
+    parser.add_argument(
+        "--json-profile",
+        choices=JSON_PROFILES,
+        default="pretty",
+        help="JSON layout for dist/src outputs: indented (pretty) or minified (compact); keys stay sorted.",
+    )
+    parser.add_argument(
+        "--lorebook-layout",
+        choices=exporter.LOREBOOK_LAYOUTS,
+        default="inline",
+        help=(
+            "inline embeds character_book in every card; shared writes each unique lorebook once under "
+            "export/lorebooks/ and cards carry extensions.botparts.lorebookRef; both also writes "
+            "self-contained spec_v2.*.inline.json cards."
+        ),
+    )
+    parser.add_argument(
+        "--token-estimator",
+        choices=tokens.TOKEN_ESTIMATORS,
+        default="approx",
+        help="Tokenizer behind computed aiTokens: offline BPE approximation (approx) or tiktoken if installed.",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help=(
+            "Validate manifests only against schemas/manifest.schema.json before writing; violations "
+            "become warnings. The catalogue has no upstream schema yet "
+            "(see docs/SCHEMA_CHANGE_REQUEST_catalogue.md)."
+        ),
+    )
+    parser.add_argument(
+        "--archives",
+        choices=archives.ARCHIVE_FORMATS,
+        default="none",
+        help="Also pack each character's export into a reproducible export/archives/<slug>.zip or .tar.",
+    )
+    parser.add_argument(
+        "--png-cards",
+        choices=png_cards.PNG_CARD_MODES,
+        default="none",
+        help=(
+            "Also write spec_v2.<prose>.png character cards (avatar with the card embedded as a 'chara' "
+            "tEXt chunk, or deflated zTXt/iTXt) for SillyTavern import."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and incrementally rebuild affected characters when sources change.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time build phases and characters; adds a Performance report section and dist/build_profile.json.",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="Like --profile, and also dump cProfile stats to dist/build_profile.prof.",
+    )
+    parser.add_argument(
+        "--catalogue-page-size",
+        type=parse_page_size,
+        default=0,
+        help="Write the catalogue as pages of N entries plus catalogue/index.json (0 = single catalogue.json).",
+    )
+    parser.add_argument(
+        "--tag-index-encoding",
+        choices=catalogue.TAG_INDEX_ENCODINGS,
+        default="list",
+        help="Posting-list format for tag_index.json: plain ordinals, gaps, or base64 bitmaps.",
+    )
+    parser.add_argument(
+        "--search-lorebooks",
+        action="store_true",
+        help="Also index canonical lorebook entry keys and contents in the search index.",
+    )
+
 
-    placeholders_env = os.environ.get("BOTPARTS_PLACEHOLDERS")
+def build_kwargs_from_args(args: argparse.Namespace) -> dict[str, Any]:
+    """Map parsed build arguments onto build_site_data keyword arguments.
+
+    --incremental is left to the caller because watch mode always rebuilds
+    incrementally.
+    """
     placeholders = args.placeholders
     if placeholders is None:
-        placeholders = _parse_placeholders(placeholders_env)
-
+        placeholders = _parse_placeholders(os.environ.get("BOTPARTS_PLACEHOLDERS"))
     strict_env = os.environ.get("BOTPARTS_SCOPE_STRICT", "0")
-    strict_scopes = args.strict_scope or strict_env == "1"
-    build_site_data(
-        Path.cwd(),
-        placeholders=placeholders,
-        include_timestamps=args.include_timestamps,
-        strict_scopes=strict_scopes,
+    jobs = args.jobs
+    if jobs is None:
+        jobs = parse_jobs(os.environ.get("BOTPARTS_BUILD_JOBS"))
+    return {
+        "placeholders": placeholders,
+        "include_timestamps": args.include_timestamps,
+        "strict_scopes": args.strict_scope or strict_env == "1",
+        "jobs": jobs,
+        "cache_stats": args.cache_stats,
+        "export_options": export_options_from_args(args),
+        "profile": args.profile,
+        "cprofile": args.cprofile,
+        "catalogue_page_size": args.catalogue_page_size,
+        "tag_index_encoding": args.tag_index_encoding,
+        "search_lorebooks": args.search_lorebooks,
+    }
+
+
+def export_options_from_args(args: argparse.Namespace) -> exporter.ExportOptions:
+    return exporter.ExportOptions(
+        asset_mode=args.asset_mode,
+        precompress=args.precompress,
+        json_profile=args.json_profile,
+        lorebook_layout=args.lorebook_layout,
+        token_estimator=args.token_estimator,
+        validate=args.validate,
+        archive_format=args.archives,
+        png_cards=args.png_cards,
     )
 
 
+def watch_build(root: Path, build_kwargs: dict[str, Any]) -> None:
+    """Rebuild incrementally on every source change until interrupted."""
+    # One source cache for the whole session keeps unchanged files parsed.
+    cache = SourceCache()
+
+    def rebuild(changed_sources: set[str] | None) -> None:
+        build_site_data(
+            root,
+            incremental=True,
+            source_cache=cache,
+            changed_sources=changed_sources,
+            **build_kwargs,
+        )
+
+    watch.watch(root, rebuild)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate Botparts export packages.")
+    add_build_arguments(parser)
+    args = parser.parse_args()
+
+    build_kwargs = build_kwargs_from_args(args)
+    if args.watch:
+        try:
+            watch_build(Path.cwd(), build_kwargs)
+        except KeyboardInterrupt:
+            pass
+        return
+    build_site_data(Path.cwd(), incremental=args.incremental, **build_kwargs)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+LEDGER_FILENAME = "build_ledger.json"
+LEDGER_VERSION = 1
+# Authoring logs are never read by the exporter, so they do not invalidate a slug.
+IGNORED_SOURCE_DIRS = {"runs"}
+
+
+@dataclass
+class LedgerEntry:
+    input_hash: str
+    warnings: list[str] = field(default_factory=list)
+    created_dirs: list[str] = field(default_factory=list)
+    assets: dict[str, int] = field(default_factory=dict)
+    image_refs: int = 0
+    lorebooks: dict[str, int] = field(default_factory=dict)
+    lorebook_refs: int = 0
+    ai_tokens: dict[str, Any] | None = None
+    token_keys: list[str] = field(default_factory=list)
+    archive: str | None = None
+    schema_violations: int = 0
+
+
+def load_ledger(path: Path, generator_version: str) -> dict[str, LedgerEntry]:
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    if payload.get("version") != LEDGER_VERSION or payload.get("generatorVersion") != generator_version:
+        return {}
+    entries: dict[str, LedgerEntry] = {}
+    for slug, raw in (payload.get("characters") or {}).items():
+        if not isinstance(raw, dict) or not isinstance(raw.get("inputHash"), str):
+            continue
+        entries[slug] = LedgerEntry(
+            input_hash=raw["inputHash"],
+            warnings=[str(item) for item in raw.get("warnings") or []],
+            created_dirs=[str(item) for item in raw.get("createdDirs") or []],
+            assets={str(key): int(value) for key, value in (raw.get("assets") or {}).items()},
+            image_refs=int(raw.get("imageRefs") or 0),
+            lorebooks={str(key): int(value) for key, value in (raw.get("lorebooks") or {}).items()},
+            lorebook_refs=int(raw.get("lorebookRefs") or 0),
+            ai_tokens=raw.get("aiTokens") if isinstance(raw.get("aiTokens"), dict) else None,
+            token_keys=[str(item) for item in raw.get("tokenKeys") or []],
+            archive=str(raw["archive"]) if raw.get("archive") else None,
+            schema_violations=int(raw.get("schemaViolations") or 0),
+        )
+    return entries
+
+
+def write_ledger(path: Path, entries: dict[str, LedgerEntry], generator_version: str) -> None:
+    characters: dict[str, dict[str, Any]] = {}
+    for slug, entry in sorted(entries.items()):
+        characters[slug] = {
+            "inputHash": entry.input_hash,
+            "warnings": entry.warnings,
+            "createdDirs": entry.created_dirs,
+            "assets": entry.assets,
+            "imageRefs": entry.image_refs,
+            "aiTokens": entry.ai_tokens,
+        }
+        if entry.lorebooks:
+            # Only present with a shared lorebook layout.
+            characters[slug]["lorebooks"] = entry.lorebooks
+            characters[slug]["lorebookRefs"] = entry.lorebook_refs
+        if entry.token_keys:
+            # Keeps a retained character's counts in the token cache.
+            characters[slug]["tokenKeys"] = entry.token_keys
+        if entry.archive:
+            characters[slug]["archive"] = entry.archive
+        if entry.schema_violations:
+            characters[slug]["schemaViolations"] = entry.schema_violations
+    payload = {
+        "version": LEDGER_VERSION,
+        "generatorVersion": generator_version,
+        "characters": characters,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def _iter_source_files(source_dir: Path) -> list[Path]:
+    files: list[Path] = []
+    for path in sorted(source_dir.iterdir(), key=lambda item: item.name):
+        if path.is_dir():
+            if path.name in IGNORED_SOURCE_DIRS:
+                continue
+            files.extend(_iter_source_files(path))
+        elif path.is_file():
+            files.append(path)
+    return files
+
+
+def hash_character_inputs(
+    source_dir: Path,
+    image_path: Path | None,
+    template_path: Path,
+    manifest_payload: dict[str, Any],
+    generator_version: str,
+    export_options: dict[str, Any],
+) -> str:
+    # Everything export_character_bundle reads for one slug: the source tree
+    # (canonical, meta.yaml, variants, entries, draft), the resolved avatar,
+    # the card template, the merged manifest, the export options and the
+    # generator version.
+    hasher = hashlib.sha256()
+
+    def update(label: str, data: bytes) -> None:
+        hasher.update(label.encode("utf-8") + b"\x00")
+        hasher.update(len(data).to_bytes(8, "big"))
+        hasher.update(data)
+
+    update("generator", generator_version.encode("utf-8"))
+    update("template", template_path.read_bytes())
+    update("options", json.dumps(export_options, sort_keys=True).encode("utf-8"))
+    update(
+        "manifest",
+        json.dumps(manifest_payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"),
+    )
+    for path in _iter_source_files(source_dir):
+        update(f"source:{path.relative_to(source_dir).as_posix()}", path.read_bytes())
+    if image_path is not None:
+        update(f"image:{image_path.name}", image_path.read_bytes())
+    return hasher.hexdigest()
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.request import Request, urlopen
+
+from src.llm_client import LLMConfig, close_connection_pools, connection_pool, invoke_llm
+
+LLM_BENCH_VERSION = 1
+DEFAULT_OUTPUT = Path("dist") / "llm_bench_results.json"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs adds ~40ms to every response on a reused connection.
+    disable_nagle_algorithm = True
+    server: "_StandInHTTPServer"
+
+    def setup(self) -> None:
+        # StreamRequestHandler applies this as the socket timeout, so idle
+        # keep-alive connections are closed by the server like a real API would.
+        self.timeout = self.server.keepalive_timeout_s
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak_active = max(self.server.peak_active, self.server.active)
+        if self.server.latency_s:
+            time.sleep(self.server.latency_s)
+        with self.server.lock:
+            self.server.active -= 1
+            self.server.requests += 1
+            number = self.server.requests
+            failure = self.server.failures.pop(0) if self.server.failures else None
+        if failure is not None:
+            status, headers = failure
+            self._send_json(status, {"error": {"message": f"stand-in failure {status}"}}, headers)
+            return
+        response = {"id": f"resp_standin_{number}", "model": request.get("model"), "output_text": self.server.output_text}
+        if request.get("stream"):
+            self._send_stream(response)
+            return
+        self._send_json(200, response)
+
+    def _send_stream(self, response: dict[str, Any]) -> None:
+        # Responses API event shapes, one word per delta, chunked so the
+        # connection stays reusable.
+        self.send_response(200)
+        for name, value in self.server.response_headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = [("response.created", {"response": {"id": response["id"]}})]
+        for word in response["output_text"].split(" "):
+            prefix = "" if len(events) == 1 else " "
+            events.append(("response.output_text.delta", {"delta": prefix + word}))
+        events.append(("response.completed", {"response": response}))
+        for index, (event, data) in enumerate(events):
+            if index == self.server.stall_after:
+                time.sleep(self.server.stall_s)
+            elif index > 1 and self.server.delta_delay_s:
+                time.sleep(self.server.delta_delay_s)
+            payload = f"event: {event}\ndata: {json.dumps({'type': event, **data})}\n\n".encode("utf-8")
+            try:
+                self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+            except OSError:
+                return
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_json(self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in {**self.server.response_headers, **(headers or {})}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        latency_s: float,
+        keepalive_timeout_s: float | None,
+        failures: list[tuple[int, dict[str, str]]],
+        output_text: str,
+        delta_delay_s: float,
+        stall_after: int | None,
+        stall_s: float,
+        response_headers: dict[str, str],
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.latency_s = latency_s
+        self.keepalive_timeout_s = keepalive_timeout_s
+        self.failures = failures
+        self.output_text = output_text
+        self.delta_delay_s = delta_delay_s
+        self.stall_after = stall_after
+        self.stall_s = stall_s
+        self.response_headers = response_headers
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.active = 0
+        self.peak_active = 0
+
+
+class StandInLLMServer:
+    """Local HTTP/1.1 server answering /responses calls, for benchmarks and tests.
+
+    failures is a queue of (status, headers) error responses served before
+    any successful one, for exercising the retry policy. Requests with
+    "stream": true get server-sent events, one delta per word of
+    output_text, delta_delay_s apart; stall_after pauses stall_s before that
+    event index to simulate a hung generation. response_headers are added to
+    every response, e.g. x-ratelimit-* headers.
+    """
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        keepalive_timeout_s: float | None = None,
+        failures: list[tuple[int, dict[str, str]]] | None = None,
+        output_text: str = "ok",
+        delta_delay_s: float = 0.0,
+        stall_after: int | None = None,
+        stall_s: float = 0.0,
+        response_headers: dict[str, str] | None = None,
+    ) -> None:
+        self._server = _StandInHTTPServer(
+            latency_s,
+            keepalive_timeout_s,
+            list(failures or []),
+            output_text,
+            delta_delay_s,
+            stall_after,
+            stall_s,
+            dict(response_headers or {}),
+        )
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def connections(self) -> int:
+        return self._server.connections
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    @property
+    def peak_active(self) -> int:
+        # Most requests the server was handling at once.
+        return self._server.peak_active
+
+    def config(self, **overrides: Any) -> LLMConfig:
+        values: dict[str, Any] = {
+            "api_key": "sk-standin",
+            "api_base": self.api_base,
+            "model": "standin-model",
+            "temperature": 0.0,
+            "max_output_tokens": None,
+            "timeout_s": 5.0,
+            "provider": "standin",
+        }
+        values.update(overrides)
+        return LLMConfig(**values)
+
+    def __enter__(self) -> "StandInLLMServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def _unpooled_post(config: LLMConfig, prompt: str) -> None:
+    # What invoke_llm did before the connection pool: one urllib connection per call.
+    body = json.dumps({"model": config.model, "input": prompt, "temperature": config.temperature}).encode("utf-8")
+    request = Request(
+        f"{config.api_base}/responses",
+        data=body,
+        method="POST",
+        headers={"Authorization": f"Bearer {config.api_key}", "Content-Type": "application/json"},
+    )
+    with urlopen(request, timeout=config.timeout_s) as response:
+        json.loads(response.read().decode("utf-8"))
+
+
+def _latency_summary(latencies: list[float], connections: int) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "connections": connections,
+        "meanCallMs": round(sum(latencies) / len(latencies), 3),
+        "p95CallMs": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+    }
+
+
+def run_llm_benchmark(calls: int = 200, latency_s: float = 0.0) -> dict[str, Any]:
+    """Time per-call latency of unpooled and pooled LLM requests against a stand-in server."""
+    if calls < 1:
+        raise ValueError("--llm-calls must be >= 1")
+    results: dict[str, Any] = {"version": LLM_BENCH_VERSION, "serverLatencyMs": round(latency_s * 1000, 3)}
+    for name in ("unpooled", "pooled"):
+        close_connection_pools()
+        with StandInLLMServer(latency_s=latency_s) as server:
+            config = server.config()
+            latencies: list[float] = []
+            for index in range(calls):
+                started = time.perf_counter()
+                if name == "pooled":
+                    invoke_llm(f"benchmark prompt {index}", config)
+                else:
+                    _unpooled_post(config, f"benchmark prompt {index}")
+                latencies.append((time.perf_counter() - started) * 1000)
+            connection_pool(config).close()
+            results[name] = _latency_summary(latencies, server.connections)
+    close_connection_pools()
+    return results
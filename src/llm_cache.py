@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+RESPONSE_CACHE_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_CACHE_MAX_AGE_S = 30 * 24 * 3600.0
+
+
+def response_key(
+    api_base: str,
+    model: str,
+    temperature: float,
+    max_output_tokens: int | None,
+    compiled_prompt: str,
+) -> str:
+    payload = {
+        "version": RESPONSE_CACHE_VERSION,
+        "api_base": api_base,
+        "model": model,
+        "temperature": temperature,
+        "max_output_tokens": max_output_tokens,
+        "input": compiled_prompt,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LLM responses stored content-addressed as <root>/<key[:2]>/<key>.json.
+
+    Hits refresh an entry's mtime, so eviction drops entries older than
+    max_age_s first and then the least recently used until the cache fits
+    in max_bytes.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, max_age_s: float) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > self.max_age_s:
+                raise FileNotFoundError(path)
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != RESPONSE_CACHE_VERSION:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, output_text: str, model_info: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(
+            {"version": RESPONSE_CACHE_VERSION, "output_text": output_text, "model_info": model_info},
+            indent=2,
+            sort_keys=True,
+        ).encode("utf-8")
+        # Atomic so concurrent writers of the same key never leave a torn entry.
+        handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data)
+            over_budget = self._size is None or self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> int:
+        """Apply the age and size limits; returns the number of entries removed."""
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            for path in self.root.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            now = time.time()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for mtime, size, path in entries:
+                if now - mtime <= self.max_age_s and total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            self._size = total
+            return removed
+
+
+_CACHES: dict[tuple[str, int, float], ResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def response_cache(root: str, max_bytes: int, max_age_s: float) -> ResponseCache:
+    # One instance per directory and limits, so the size total is scanned once per process.
+    key = (str(Path(root).resolve()), max_bytes, max_age_s)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = ResponseCache(Path(key[0]), max_bytes, max_age_s)
+            _CACHES[key] = cache
+        return cache
+
+
+_BYPASS = False
+
+
+def cache_bypassed() -> bool:
+    return _BYPASS
+
+
+@contextmanager
+def bypass_response_cache(enabled: bool = True) -> Iterator[None]:
+    # --no-llm-cache: skip cached responses but still store fresh ones.
+    global _BYPASS
+    previous = _BYPASS
+    _BYPASS = enabled
+    try:
+        yield
+    finally:
+        _BYPASS = previous
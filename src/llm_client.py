@@ -1,11 +1,53 @@
 from __future__ import annotations
 
+import asyncio
+import http.client
 import json
 import os
+import random
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterable, Iterator
+from urllib.parse import urlsplit
+
+from src import llm_cache
+from src import llm_ratelimit
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_IDLE_TIMEOUT_S = 30.0
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BACKOFF_BASE_S = 1.0
+DEFAULT_BACKOFF_MAX_S = 30.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN_S = 60.0
+DEFAULT_MAX_IN_FLIGHT = 4
+# Raised when a kept-alive socket turned out to be closed by the server.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+# Besides these, every 5xx is retried; other 4xx mean the request itself is wrong.
+RETRYABLE_STATUSES = {408, 429}
+RETRY_AFTER_STATUSES = {429, 503}
+
+
+class LLMRequestError(RuntimeError):
+    """A failed LLM HTTP request; retryable failures are retried by invoke_llm."""
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status: int | None = None,
+        retryable: bool = False,
+        retry_after_s: float | None = None,
+        attempts: int = 1,
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after_s = retry_after_s
+        self.attempts = attempts
 
 
 @dataclass(frozen=True)
@@ -17,6 +59,22 @@ class LLMConfig:
     max_output_tokens: int | None
     timeout_s: float
     provider: str
+    pool_size: int = DEFAULT_POOL_SIZE
+    pool_idle_timeout_s: float = DEFAULT_POOL_IDLE_TIMEOUT_S
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    backoff_base_s: float = DEFAULT_BACKOFF_BASE_S
+    backoff_max_s: float = DEFAULT_BACKOFF_MAX_S
+    breaker_threshold: int = DEFAULT_BREAKER_THRESHOLD
+    breaker_cooldown_s: float = DEFAULT_BREAKER_COOLDOWN_S
+    cache_dir: str | None = None
+    cache_max_bytes: int = llm_cache.DEFAULT_CACHE_MAX_BYTES
+    cache_max_age_s: float = llm_cache.DEFAULT_CACHE_MAX_AGE_S
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    # When streaming, timeout_s bounds silence between events, not the whole response.
+    stream: bool = False
+    # Client-side requests/tokens per minute; None leaves the limit to response headers.
+    rpm: float | None = None
+    tpm: float | None = None
 
 
 @dataclass(frozen=True)
@@ -36,6 +94,22 @@ def load_llm_config() -> LLMConfig:
     max_output_tokens = int(max_tokens_raw) if max_tokens_raw else None
     timeout_s = float(os.environ.get("BOTPARTS_LLM_TIMEOUT", "60"))
     provider = os.environ.get("BOTPARTS_LLM_PROVIDER", "openai")
+    pool_size = int(os.environ.get("BOTPARTS_LLM_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+    pool_idle_timeout_s = float(os.environ.get("BOTPARTS_LLM_POOL_IDLE_TIMEOUT", str(DEFAULT_POOL_IDLE_TIMEOUT_S)))
+    max_attempts = int(os.environ.get("BOTPARTS_LLM_MAX_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS)))
+    backoff_base_s = float(os.environ.get("BOTPARTS_LLM_BACKOFF_BASE", str(DEFAULT_BACKOFF_BASE_S)))
+    backoff_max_s = float(os.environ.get("BOTPARTS_LLM_BACKOFF_MAX", str(DEFAULT_BACKOFF_MAX_S)))
+    breaker_threshold = int(os.environ.get("BOTPARTS_LLM_BREAKER_THRESHOLD", str(DEFAULT_BREAKER_THRESHOLD)))
+    breaker_cooldown_s = float(os.environ.get("BOTPARTS_LLM_BREAKER_COOLDOWN", str(DEFAULT_BREAKER_COOLDOWN_S)))
+    cache_dir = os.environ.get("BOTPARTS_LLM_CACHE_DIR") or None
+    cache_max_mb = float(os.environ.get("BOTPARTS_LLM_CACHE_MAX_MB", str(llm_cache.DEFAULT_CACHE_MAX_BYTES / 2**20)))
+    max_in_flight = int(os.environ.get("BOTPARTS_LLM_MAX_IN_FLIGHT", str(DEFAULT_MAX_IN_FLIGHT)))
+    rpm = float(os.environ.get("BOTPARTS_LLM_RPM") or 0) or None
+    tpm = float(os.environ.get("BOTPARTS_LLM_TPM") or 0) or None
+    stream = os.environ.get("BOTPARTS_LLM_STREAM", "0").strip().lower() in {"1", "true", "yes"}
+    cache_max_age_days = float(
+        os.environ.get("BOTPARTS_LLM_CACHE_MAX_AGE_DAYS", str(llm_cache.DEFAULT_CACHE_MAX_AGE_S / 86400))
+    )
     return LLMConfig(
         api_key=api_key,
         api_base=api_base.rstrip("/"),
@@ -44,10 +118,385 @@ def load_llm_config() -> LLMConfig:
         max_output_tokens=max_output_tokens,
         timeout_s=timeout_s,
         provider=provider,
+        pool_size=max(pool_size, 0),
+        pool_idle_timeout_s=pool_idle_timeout_s,
+        max_attempts=max(max_attempts, 1),
+        backoff_base_s=backoff_base_s,
+        backoff_max_s=backoff_max_s,
+        breaker_threshold=breaker_threshold,
+        breaker_cooldown_s=breaker_cooldown_s,
+        cache_dir=cache_dir,
+        cache_max_bytes=int(cache_max_mb * 2**20),
+        cache_max_age_s=cache_max_age_days * 86400,
+        max_in_flight=max(max_in_flight, 1),
+        stream=stream,
+        rpm=rpm,
+        tpm=tpm,
     )
 
 
-def invoke_llm(compiled_prompt: str, config: LLMConfig) -> LLMResult:
+@dataclass
+class StreamProgress:
+    """Live counters for one streamed response, updated as deltas arrive."""
+
+    started: float
+    first_delta_at: float | None = None
+    deltas: int = 0
+    chars: int = 0
+
+    def record(self, delta: str) -> None:
+        if self.first_delta_at is None:
+            self.first_delta_at = time.monotonic()
+        self.deltas += 1
+        self.chars += len(delta)
+
+    @property
+    def ttft_s(self) -> float | None:
+        return None if self.first_delta_at is None else self.first_delta_at - self.started
+
+    def tokens_per_s(self) -> float:
+        # Each output_text.delta event carries roughly one token.
+        if self.first_delta_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self.first_delta_at
+        return self.deltas / elapsed if elapsed > 0 else 0.0
+
+
+DeltaCallback = Callable[[str, StreamProgress], None]
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one API origin, shared across threads.
+
+    Up to max_idle connections are kept between requests and dropped once
+    they sit unused for idle_timeout_s. A request that fails because a reused
+    socket went stale is retried once on a fresh connection.
+    """
+
+    def __init__(self, scheme: str, host: str, port: int | None, max_idle: int, idle_timeout_s: float) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_idle = max_idle
+        self.idle_timeout_s = idle_timeout_s
+        self.opened = 0
+        self.reused = 0
+        self._idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self._lock = threading.Lock()
+
+    def _connect(self, timeout_s: float) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.opened += 1
+        return connection_class(self.host, self.port, timeout=timeout_s)
+
+    def _acquire(self, timeout_s: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                connection, released_at = self._idle.pop()
+                if now - released_at < self.idle_timeout_s:
+                    self.reused += 1
+                    connection.timeout = timeout_s
+                    if connection.sock is not None:
+                        connection.sock.settimeout(timeout_s)
+                    return connection, True
+                connection.close()
+        return self._connect(timeout_s), False
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+        timeout_s: float,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        with self.stream(method, path, body, headers, timeout_s) as response:
+            data = response.read()
+        return response.status, response.headers, data
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+        timeout_s: float,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Yield the response for incremental reads.
+
+        The connection goes back to the pool only if the body was read to
+        the end; otherwise it is closed.
+        """
+        connection, reused = self._acquire(timeout_s)
+        try:
+            response = self._send(connection, method, path, body, headers)
+        except _STALE_CONNECTION_ERRORS:
+            connection.close()
+            if not reused:
+                raise
+            connection = self._connect(timeout_s)
+            try:
+                response = self._send(connection, method, path, body, headers)
+            except BaseException:
+                connection.close()
+                raise
+        except BaseException:
+            connection.close()
+            raise
+        try:
+            yield response
+        except BaseException:
+            connection.close()
+            raise
+        if response.isclosed() and not response.will_close:
+            self._release(connection)
+        else:
+            connection.close()
+
+    @staticmethod
+    def _send(
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> http.client.HTTPResponse:
+        connection.request(method, path, body=body, headers=headers)
+        return connection.getresponse()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            connection.close()
+
+
+_POOLS: dict[tuple[str, str, int | None], ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def connection_pool(config: LLMConfig) -> ConnectionPool:
+    # One pool per API origin for the whole process, so every invoke_llm call
+    # (and every thread) shares the same warm connections.
+    parts = urlsplit(config.api_base)
+    key = (parts.scheme, parts.hostname or "", parts.port)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ConnectionPool(key[0], key[1], key[2], config.pool_size, config.pool_idle_timeout_s)
+            _POOLS[key] = pool
+        else:
+            pool.max_idle = config.pool_size
+            pool.idle_timeout_s = config.pool_idle_timeout_s
+        return pool
+
+
+def close_connection_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+class CircuitBreaker:
+    """Fail fast once an API origin keeps failing.
+
+    After threshold consecutive retryable failures the breaker opens and
+    calls fail immediately until cooldown_s has passed. The breaker is then
+    half-open: exactly one call is let through as a probe while the others
+    keep failing fast. A successful probe closes the breaker, a failed one
+    reopens it for another cooldown. While the breaker is open or half-open
+    only the probe's outcome counts; late results from calls that started
+    before it opened are ignored. A non-retryable error still means the API
+    answered, so it counts as a success. A threshold of 0 disables the
+    breaker.
+    """
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe: object | None = None
+        self._lock = threading.Lock()
+
+    def check(self, config: LLMConfig) -> object | None:
+        """Raise while open; return a probe token if this call is the half-open probe."""
+        with self._lock:
+            if self.opened_at is None:
+                return None
+            if self.probe is not None:
+                raise LLMRequestError(
+                    f"LLM circuit breaker open after {self.failures} consecutive failures; "
+                    "a probe request is in flight."
+                )
+            remaining = config.breaker_cooldown_s - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                raise LLMRequestError(
+                    f"LLM circuit breaker open after {self.failures} consecutive failures; "
+                    f"retry in {remaining:.0f}s."
+                )
+            self.probe = object()
+            return self.probe
+
+    def record(self, config: LLMConfig, ok: bool, probe: object | None = None) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                if probe is None or probe is not self.probe:
+                    return
+                self.probe = None
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if config.breaker_threshold and self.failures >= config.breaker_threshold:
+                self.opened_at = time.monotonic()
+
+    def abandon_probe(self, probe: object | None) -> None:
+        # The probe ended without an answer either way (e.g. a local error);
+        # let the next call probe instead.
+        with self._lock:
+            if probe is not None and probe is self.probe:
+                self.probe = None
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+
+
+def circuit_breaker(config: LLMConfig) -> CircuitBreaker:
+    with _POOLS_LOCK:
+        return _BREAKERS.setdefault(config.api_base, CircuitBreaker())
+
+
+def reset_circuit_breakers() -> None:
+    with _POOLS_LOCK:
+        _BREAKERS.clear()
+
+
+def backoff_delay(attempt: int, config: LLMConfig) -> float:
+    # Full jitter: uniform over [0, min(max, base * 2^(attempt - 1))].
+    ceiling = min(config.backoff_max_s, config.backoff_base_s * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - time.time(), 0.0)
+
+
+_IN_FLIGHT: tuple[int, threading.BoundedSemaphore] | None = None
+
+
+def _in_flight_slots(limit: int) -> threading.BoundedSemaphore:
+    # Process-wide, so sync callers, worker threads and ainvoke_llm tasks all
+    # share one cap. Requests already holding a slot of a replaced semaphore
+    # release it normally.
+    global _IN_FLIGHT
+    with _POOLS_LOCK:
+        if _IN_FLIGHT is None or _IN_FLIGHT[0] != limit:
+            _IN_FLIGHT = (limit, threading.BoundedSemaphore(limit))
+        return _IN_FLIGHT[1]
+
+
+# model_info keys measured per network call, dropped from cache hits.
+_PER_CALL_INFO = ("stream", "rate_limit")
+
+# Indirection so tests can observe waits without sleeping.
+_sleep = time.sleep
+
+
+def _post_with_retries(
+    send: Callable[[], dict[str, Any]],
+    config: LLMConfig,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    breaker = circuit_breaker(config)
+    waited = 0.0
+    attempt = 0
+    while True:
+        probe = breaker.check(config)
+        attempt += 1
+        try:
+            response = send()
+        except LLMRequestError as exc:
+            breaker.record(config, ok=not exc.retryable, probe=probe)
+            if not exc.retryable or attempt >= config.max_attempts:
+                if attempt > 1:
+                    raise LLMRequestError(
+                        f"{exc} (gave up after {attempt} attempts)",
+                        status=exc.status,
+                        retryable=exc.retryable,
+                        retry_after_s=exc.retry_after_s,
+                        attempts=attempt,
+                    ) from exc
+                raise
+            if exc.retry_after_s is not None and exc.retry_after_s > config.backoff_max_s:
+                # A server-requested wait beyond the backoff limit is not worth blocking on.
+                raise LLMRequestError(
+                    f"{exc} (server asked to wait {exc.retry_after_s:g}s, "
+                    f"more than the {config.backoff_max_s:g}s backoff limit)",
+                    status=exc.status,
+                    retryable=False,
+                    retry_after_s=exc.retry_after_s,
+                    attempts=attempt,
+                ) from exc
+            delay = exc.retry_after_s if exc.retry_after_s is not None else backoff_delay(attempt, config)
+            _sleep(delay)
+            waited += delay
+            continue
+        except BaseException:
+            breaker.abandon_probe(probe)
+            raise
+        breaker.record(config, ok=True, probe=probe)
+        return response, {"attempts": attempt, "retries": attempt - 1, "retry_wait_s": round(waited, 3)}
+
+
+def invoke_llm(compiled_prompt: str, config: LLMConfig, on_delta: DeltaCallback | None = None) -> LLMResult:
+    """Send one prompt to the /responses endpoint.
+
+    With config.stream, on_delta is called for every output text delta as it
+    arrives; cache hits return without calling it.
+    """
+    cache = None
+    cache_key = None
+    if config.cache_dir:
+        cache = llm_cache.response_cache(config.cache_dir, config.cache_max_bytes, config.cache_max_age_s)
+        cache_key = llm_cache.response_key(
+            config.api_base, config.model, config.temperature, config.max_output_tokens, compiled_prompt
+        )
+        if not llm_cache.cache_bypassed():
+            entry = cache.get(cache_key)
+            if entry is not None:
+                # Streaming and rate-limit stats describe the call that filled
+                # the cache, not this one, which made no request.
+                model_info = {
+                    **{key: value for key, value in entry["model_info"].items() if key not in _PER_CALL_INFO},
+                    "attempts": 0,
+                    "retries": 0,
+                    "retry_wait_s": 0.0,
+                    "cache": "hit",
+                    "cache_key": cache_key,
+                }
+                return LLMResult(output_text=entry["output_text"], model_info=model_info)
     payload: dict[str, Any] = {
         "model": config.model,
         "input": compiled_prompt,
@@ -55,7 +504,26 @@ def invoke_llm(compiled_prompt: str, config: LLMConfig) -> LLMResult:
     }
     if config.max_output_tokens is not None:
         payload["max_output_tokens"] = config.max_output_tokens
-    response = _post_json(f"{config.api_base}/responses", payload, config)
+    url = f"{config.api_base}/responses"
+    progress: list[StreamProgress] = []
+    limiter = llm_ratelimit.rate_limiter(config.api_base, config.rpm, config.tpm)
+    request_tokens = llm_ratelimit.estimate_request_tokens(compiled_prompt, config.max_output_tokens)
+    rate_wait = [0.0]
+
+    def send() -> dict[str, Any]:
+        # Every attempt, retries included, spends from the buckets.
+        rate_wait[0] += limiter.acquire(request_tokens)
+        # A slot is held per attempt only, so requests sleeping through a
+        # backoff or Retry-After leave room for others. Cache hits above
+        # never take one.
+        with _in_flight_slots(config.max_in_flight):
+            if not config.stream:
+                return _post_json(url, payload, config)
+            # Fresh counters per attempt; only the successful one is reported.
+            progress[:] = [StreamProgress(started=time.monotonic())]
+            return _post_stream(url, {**payload, "stream": True}, config, progress[0], on_delta)
+
+    response, retry_stats = _post_with_retries(send, config)
     output_text = _extract_output_text(response)
     if not output_text:
         raise ValueError("LLM response contained no output text.")
@@ -66,30 +534,192 @@ def invoke_llm(compiled_prompt: str, config: LLMConfig) -> LLMResult:
         "provider": config.provider,
         "api_base": config.api_base,
         "response_id": response.get("id"),
+        **retry_stats,
     }
+    if limiter.active:
+        model_info["rate_limit"] = {
+            "estimated_tokens": request_tokens,
+            "wait_s": round(rate_wait[0], 3),
+            "utilization": limiter.utilization(),
+        }
+    if progress:
+        ttft_s = progress[0].ttft_s
+        model_info["stream"] = {
+            "ttft_s": None if ttft_s is None else round(ttft_s, 3),
+            "duration_s": round(time.monotonic() - progress[0].started, 3),
+            "deltas": progress[0].deltas,
+        }
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, output_text, model_info)
+        model_info = {
+            **model_info,
+            "cache": "refresh" if llm_cache.cache_bypassed() else "miss",
+            "cache_key": cache_key,
+        }
     return LLMResult(output_text=output_text, model_info=model_info)
 
 
-def _post_json(url: str, payload: dict[str, Any], config: LLMConfig) -> dict[str, Any]:
-    body = json.dumps(payload).encode("utf-8")
-    request = Request(
-        url,
-        data=body,
-        method="POST",
-        headers={
-            "Authorization": f"Bearer {config.api_key}",
-            "Content-Type": "application/json",
-        },
+def rate_limit_utilization(config: LLMConfig) -> dict[str, float]:
+    """Fraction of the current per-minute request/token allowance spent, per active limit."""
+    return llm_ratelimit.rate_limiter(config.api_base, config.rpm, config.tpm).utilization()
+
+
+async def ainvoke_llm(
+    compiled_prompt: str,
+    config: LLMConfig,
+    on_delta: DeltaCallback | None = None,
+) -> LLMResult:
+    # The blocking client runs in a worker thread, so the pool, retry policy,
+    # cache and in-flight cap apply exactly as for invoke_llm. on_delta is
+    # called from that thread.
+    return await asyncio.to_thread(invoke_llm, compiled_prompt, config, on_delta)
+
+
+async def gather_llm(compiled_prompts: Iterable[str], config: LLMConfig) -> list[LLMResult | BaseException]:
+    """Issue every prompt concurrently; results keep the prompts' order.
+
+    A failed prompt yields its exception in place of a result, so one
+    failure does not discard the responses already paid for.
+    """
+    return list(
+        await asyncio.gather(*(ainvoke_llm(prompt, config) for prompt in compiled_prompts), return_exceptions=True)
     )
+
+
+def invoke_llm_many(compiled_prompts: Iterable[str], config: LLMConfig) -> list[LLMResult | BaseException]:
+    # Sync shim for call sites outside an event loop.
+    return asyncio.run(gather_llm(compiled_prompts, config))
+
+
+def _request_parts(url: str, payload: dict[str, Any], config: LLMConfig) -> tuple[str, bytes, dict[str, str]]:
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    headers = {
+        "Authorization": f"Bearer {config.api_key}",
+        "Content-Type": "application/json",
+    }
+    return path, json.dumps(payload).encode("utf-8"), headers
+
+
+def _observe_rate_limits(config: LLMConfig, response_headers: http.client.HTTPMessage) -> None:
+    llm_ratelimit.rate_limiter(config.api_base, config.rpm, config.tpm).observe(response_headers)
+
+
+def _status_error(status: int, response_headers: http.client.HTTPMessage, raw: bytes) -> LLMRequestError:
+    retry_after = parse_retry_after(response_headers.get("Retry-After")) if status in RETRY_AFTER_STATUSES else None
+    if status == 429 and retry_after is None:
+        # Without Retry-After, wait for whichever exhausted allowance resets last.
+        resets = [
+            llm_ratelimit.parse_reset_duration(response_headers.get(f"x-ratelimit-reset-{kind}"))
+            for kind in ("requests", "tokens")
+            if response_headers.get(f"x-ratelimit-remaining-{kind}") == "0"
+        ]
+        retry_after = max((reset for reset in resets if reset is not None), default=None)
+    return LLMRequestError(
+        f"LLM request failed ({status}): {raw.decode('utf-8', errors='replace')}",
+        status=status,
+        retryable=status in RETRYABLE_STATUSES or status >= 500,
+        retry_after_s=retry_after,
+    )
+
+
+def _post_json(url: str, payload: dict[str, Any], config: LLMConfig) -> dict[str, Any]:
+    path, body, headers = _request_parts(url, payload, config)
+    try:
+        status, response_headers, raw = connection_pool(config).request(
+            "POST", path, body, headers, config.timeout_s
+        )
+    except (OSError, http.client.HTTPException) as exc:
+        # Timeouts, refused and reset connections are all worth another attempt.
+        raise LLMRequestError(f"LLM request failed: {exc}", retryable=True) from exc
+    _observe_rate_limits(config, response_headers)
+    if status >= 400:
+        raise _status_error(status, response_headers, raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def iter_sse_events(lines: Iterable[bytes]) -> Iterator[tuple[str, str]]:
+    """Parse a server-sent event stream into (event, data) pairs."""
+    event = "message"
+    data: list[str] = []
+    for raw_line in lines:
+        line = raw_line.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event = "message"
+            data = []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event, "\n".join(data)
+
+
+def _decode_stream_event(data: str, progress: StreamProgress) -> dict[str, Any]:
+    try:
+        message = json.loads(data)
+    except ValueError:
+        message = None
+    if not isinstance(message, dict):
+        # Same retry rule as a dropped connection: only before the first delta.
+        raise LLMRequestError(
+            f"LLM stream failed after {progress.chars} characters: malformed event data {data[:80]!r}",
+            retryable=progress.deltas == 0,
+        )
+    return message
+
+
+def _post_stream(
+    url: str,
+    payload: dict[str, Any],
+    config: LLMConfig,
+    progress: StreamProgress,
+    on_delta: DeltaCallback | None,
+) -> dict[str, Any]:
+    path, body, headers = _request_parts(url, payload, config)
+    headers["Accept"] = "text/event-stream"
+    texts: list[str] = []
+    final: dict[str, Any] = {}
     try:
-        with urlopen(request, timeout=config.timeout_s) as response:
-            raw = response.read().decode("utf-8")
-    except HTTPError as exc:
-        detail = exc.read().decode("utf-8") if exc.fp else str(exc)
-        raise RuntimeError(f"LLM request failed ({exc.code}): {detail}") from exc
-    except URLError as exc:
-        raise RuntimeError(f"LLM request failed: {exc.reason}") from exc
-    return json.loads(raw)
+        with connection_pool(config).stream("POST", path, body, headers, config.timeout_s) as response:
+            _observe_rate_limits(config, response.headers)
+            if response.status >= 400:
+                raise _status_error(response.status, response.headers, response.read())
+            for event, data in iter_sse_events(response):
+                if data == "[DONE]":
+                    break
+                message = _decode_stream_event(data, progress)
+                kind = message.get("type", event)
+                if kind == "response.output_text.delta":
+                    delta = str(message.get("delta") or "")
+                    progress.record(delta)
+                    texts.append(delta)
+                    if on_delta is not None:
+                        on_delta(delta, progress)
+                elif kind in {"response.completed", "response.incomplete"}:
+                    final = message.get("response") or {}
+                elif kind in {"response.failed", "error"}:
+                    # Output already handed to on_delta cannot be taken back, so
+                    # only a stream that failed before its first delta is retried.
+                    raise LLMRequestError(f"LLM stream failed: {data}", retryable=progress.deltas == 0)
+    except (OSError, http.client.HTTPException, UnicodeDecodeError) as exc:
+        reason = f"no data for {config.timeout_s:g}s" if isinstance(exc, TimeoutError) else str(exc)
+        raise LLMRequestError(
+            f"LLM stream failed after {progress.chars} characters: {reason}",
+            retryable=progress.deltas == 0,
+        ) from exc
+    if texts:
+        final = {**final, "output_text": "".join(texts)}
+    return final
 
 
 def _extract_output_text(response: dict[str, Any]) -> str:
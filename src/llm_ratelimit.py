@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Mapping
+
+from src.tokens import ApproxEstimator
+
+# Output tokens reserved per request when max_output_tokens is not set.
+DEFAULT_OUTPUT_TOKEN_RESERVE = 1024
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_ESTIMATOR = ApproxEstimator()
+
+
+def estimate_request_tokens(compiled_prompt: str, max_output_tokens: int | None) -> int:
+    # Providers charge TPM for the prompt plus the requested output budget.
+    reserve = max_output_tokens if max_output_tokens is not None else DEFAULT_OUTPUT_TOKEN_RESERVE
+    return _ESTIMATOR.count(compiled_prompt) + reserve
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    # x-ratelimit-reset-* values look like "20ms", "1s" or "6m0s".
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value.strip())
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Holds up to one minute's allowance and refills continuously."""
+
+    def __init__(self, per_minute: float, now: float) -> None:
+        self.per_minute = per_minute
+        self.level = per_minute
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.per_minute, self.level + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        # Requests bigger than the whole bucket wait for a full bucket instead of forever.
+        needed = min(amount, self.per_minute)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) * 60 / self.per_minute
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.per_minute)
+
+    def utilization(self) -> float:
+        return round(1 - max(self.level, 0.0) / self.per_minute, 3)
+
+
+# Indirections so tests can drive the limiter with a fake clock.
+_clock = time.monotonic
+_sleep = time.sleep
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute limits for one API.
+
+    Each configured limit is a token bucket; acquire() blocks the calling
+    thread until both buckets can cover the request. Rate-limit response
+    headers tighten the buckets: a lower advertised limit replaces the
+    configured one, and the advertised remaining allowance caps the level.
+    """
+
+    def __init__(self) -> None:
+        self.requests: TokenBucket | None = None
+        self.tokens: TokenBucket | None = None
+        self._configured: tuple[float | None, float | None] = (None, None)
+        self._lock = threading.Lock()
+
+    def configure(self, rpm: float | None, tpm: float | None) -> None:
+        with self._lock:
+            if self._configured == (rpm, tpm):
+                return
+            self._configured = (rpm, tpm)
+            now = _clock()
+            self.requests = TokenBucket(rpm, now) if rpm else None
+            self.tokens = TokenBucket(tpm, now) if tpm else None
+
+    @property
+    def active(self) -> bool:
+        return self.requests is not None or self.tokens is not None
+
+    def _costs(self, tokens: int) -> list[tuple[TokenBucket, float]]:
+        return [
+            (bucket, amount)
+            for bucket, amount in ((self.requests, 1.0), (self.tokens, float(tokens)))
+            if bucket is not None
+        ]
+
+    def acquire(self, tokens: int) -> float:
+        """Wait until the request fits in both buckets; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = _clock()
+                costs = self._costs(tokens)
+                for bucket, _ in costs:
+                    bucket.refill(now)
+                delay = max((bucket.delay_for(amount) for bucket, amount in costs), default=0.0)
+                if delay <= 0:
+                    for bucket, amount in costs:
+                        bucket.take(amount)
+                    return waited
+            _sleep(delay)
+            waited += delay
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        with self._lock:
+            now = _clock()
+            for kind in ("requests", "tokens"):
+                limit = _header_number(headers.get(f"x-ratelimit-limit-{kind}"))
+                remaining = _header_number(headers.get(f"x-ratelimit-remaining-{kind}"))
+                if limit is None and remaining is None:
+                    continue
+                bucket = getattr(self, kind)
+                if limit is not None and limit > 0 and (bucket is None or limit < bucket.per_minute):
+                    level = limit if bucket is None else min(bucket.level, limit)
+                    bucket = TokenBucket(limit, now)
+                    bucket.level = level
+                    setattr(self, kind, bucket)
+                if bucket is not None and remaining is not None:
+                    bucket.refill(now)
+                    bucket.level = min(bucket.level, remaining)
+
+    def utilization(self) -> dict[str, float]:
+        """Fraction of each per-minute allowance currently spent."""
+        with self._lock:
+            now = _clock()
+            result: dict[str, float] = {}
+            for kind in ("requests", "tokens"):
+                bucket = getattr(self, kind)
+                if bucket is not None:
+                    bucket.refill(now)
+                    result[kind] = bucket.utilization()
+            return result
+
+
+def _header_number(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_LIMITERS: dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def rate_limiter(api_base: str, rpm: float | None, tpm: float | None) -> RateLimiter:
+    # Shared by every thread and task calling the same API base.
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.setdefault(api_base, RateLimiter())
+    limiter.configure(rpm, tpm)
+    return limiter
+
+
+def reset_rate_limiters() -> None:
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
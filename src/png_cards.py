@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import base64
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CARD_KEYWORD = "chara"
+# Text chunk used for the embedded card: tEXt (plain), zTXt or iTXt (deflated).
+PNG_CARD_MODES = ("none", "text", "ztxt", "itxt")
+TEXT_CHUNK_TYPES = {b"tEXt", b"zTXt", b"iTXt"}
+_COPY_BLOCK = 64 * 1024
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+
+def build_text_chunk(keyword: str, text: str, mode: str = "text") -> bytes:
+    keyword_bytes = keyword.encode("latin-1")
+    if mode == "text":
+        return _chunk(b"tEXt", keyword_bytes + b"\x00" + text.encode("latin-1"))
+    if mode == "ztxt":
+        # Compression method 0 (deflate) is the only one PNG defines.
+        return _chunk(b"zTXt", keyword_bytes + b"\x00\x00" + zlib.compress(text.encode("latin-1"), 9))
+    if mode == "itxt":
+        # Compressed flag, method, then empty language tag and translated keyword.
+        header = keyword_bytes + b"\x00" + b"\x01\x00" + b"\x00" + b"\x00"
+        return _chunk(b"iTXt", header + zlib.compress(text.encode("utf-8"), 9))
+    raise ValueError(f"Unknown PNG text chunk mode: {mode}")
+
+
+def card_chunk(card_json: str, mode: str = "text") -> bytes:
+    # SillyTavern's convention: base64-encoded card JSON under the "chara" keyword.
+    encoded = base64.b64encode(card_json.encode("utf-8")).decode("ascii")
+    return build_text_chunk(CARD_KEYWORD, encoded, mode)
+
+
+def _read_exact(source: BinaryIO, size: int) -> bytes:
+    data = source.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated PNG chunk.")
+    return data
+
+
+def _is_card_chunk(chunk_type: bytes, data: bytes) -> bool:
+    return chunk_type in TEXT_CHUNK_TYPES and data.split(b"\x00", 1)[0] == CARD_KEYWORD.encode("latin-1")
+
+
+def stream_card_png(source: BinaryIO, target: BinaryIO, chunk: bytes) -> None:
+    """Copy a PNG from source to target with chunk inserted before IEND.
+
+    Chunks are copied in fixed-size blocks with their CRCs checked on the way,
+    so memory stays flat regardless of image size. Existing "chara" text
+    chunks are dropped rather than stacked.
+    """
+    if source.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+        raise ValueError("Invalid PNG signature.")
+    target.write(PNG_SIGNATURE)
+    while True:
+        header = source.read(8)
+        if len(header) < 8:
+            raise ValueError("Unable to locate IEND chunk in PNG.")
+        length = struct.unpack(">I", header[:4])[0]
+        chunk_type = header[4:]
+        if chunk_type in TEXT_CHUNK_TYPES or chunk_type == b"IEND":
+            # Text chunks are small enough to inspect whole.
+            data = _read_exact(source, length)
+            crc = struct.unpack(">I", _read_exact(source, 4))[0]
+            if zlib.crc32(chunk_type + data) & 0xFFFFFFFF != crc:
+                raise ValueError(f"CRC mismatch in PNG {chunk_type.decode('latin-1')} chunk.")
+            if chunk_type == b"IEND":
+                target.write(chunk)
+                target.write(_chunk(b"IEND", data))
+                return
+            if not _is_card_chunk(chunk_type, data):
+                target.write(_chunk(chunk_type, data))
+            continue
+        target.write(header)
+        crc = zlib.crc32(chunk_type)
+        remaining = length
+        while remaining:
+            block = _read_exact(source, min(remaining, _COPY_BLOCK))
+            crc = zlib.crc32(block, crc)
+            target.write(block)
+            remaining -= len(block)
+        stored_crc = _read_exact(source, 4)
+        if struct.unpack(">I", stored_crc)[0] != crc & 0xFFFFFFFF:
+            raise ValueError(f"CRC mismatch in PNG {chunk_type.decode('latin-1')} chunk.")
+        target.write(stored_crc)
+
+
+def write_card_png(source_path: Path, target: BinaryIO, card_json: str, mode: str = "text") -> None:
+    with source_path.open("rb") as source:
+        stream_card_png(source, target, card_chunk(card_json, mode))
+
+
+def read_card_json(png_bytes: bytes) -> str | None:
+    # Inverse of card_chunk for tests and tooling; the last chara chunk wins.
+    if not png_bytes.startswith(PNG_SIGNATURE):
+        raise ValueError("Invalid PNG signature.")
+    offset = len(PNG_SIGNATURE)
+    found: str | None = None
+    while offset + 8 <= len(png_bytes):
+        length = int.from_bytes(png_bytes[offset : offset + 4], "big")
+        chunk_type = png_bytes[offset + 4 : offset + 8]
+        data = png_bytes[offset + 8 : offset + 8 + length]
+        offset += 12 + length
+        if not _is_card_chunk(chunk_type, data):
+            continue
+        body = data.split(b"\x00", 1)[1]
+        if chunk_type == b"zTXt":
+            text = zlib.decompress(body[1:]).decode("latin-1")
+        elif chunk_type == b"iTXt":
+            compressed = body[0] == 1
+            rest = body[2:].split(b"\x00", 2)[2]
+            text = (zlib.decompress(rest) if compressed else rest).decode("utf-8")
+        else:
+            text = body.decode("latin-1")
+        found = base64.b64decode(text).decode("utf-8")
+    return found
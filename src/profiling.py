@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+PROFILE_FILENAME = "build_profile.json"
+CPROFILE_FILENAME = "build_profile.prof"
+PROFILE_VERSION = 1
+
+
+@dataclass
+class PhaseTiming:
+    seconds: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class SlugTiming:
+    seconds: float = 0.0
+    files: int = 0
+    bytes_written: int = 0
+    skipped: bool = False
+
+
+@dataclass
+class BuildProfiler:
+    """Wall-clock timings for one build, collected only under --profile.
+
+    Export phases are summed across characters (and worker processes), so with
+    --jobs > 1 they can exceed the build's total wall time.
+    """
+
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+    slugs: dict[str, SlugTiming] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    files: int = 0
+    files_written: int = 0
+    bytes_written: int = 0
+
+    def __post_init__(self) -> None:
+        self._lap_started = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        # Sequential build steps: charge the time since the previous lap.
+        now = time.perf_counter()
+        self.add_phase(name, now - self._lap_started)
+        self._lap_started = now
+
+    def add_phase(self, name: str, seconds: float, calls: int = 1) -> None:
+        timing = self.phases.setdefault(name, PhaseTiming())
+        timing.seconds += seconds
+        timing.calls += calls
+
+    def merge(self, other: BuildProfiler) -> None:
+        for name, timing in other.phases.items():
+            self.add_phase(name, timing.seconds, timing.calls)
+        self.slugs.update(other.slugs)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "version": PROFILE_VERSION,
+            "totalSeconds": round(self.total_seconds, 6),
+            "files": self.files,
+            "filesWritten": self.files_written,
+            "bytesWritten": self.bytes_written,
+            "phases": {
+                name: {"seconds": round(timing.seconds, 6), "calls": timing.calls}
+                for name, timing in self.phases.items()
+            },
+            "characters": {
+                slug: {
+                    "seconds": round(timing.seconds, 6),
+                    "files": timing.files,
+                    "bytesWritten": timing.bytes_written,
+                    "skipped": timing.skipped,
+                }
+                for slug, timing in sorted(self.slugs.items())
+            },
+        }
+
+
+_ACTIVE: BuildProfiler | None = None
+
+
+def active_profiler() -> BuildProfiler | None:
+    return _ACTIVE
+
+
+@contextmanager
+def use_profiler(profiler: BuildProfiler | None) -> Iterator[BuildProfiler | None]:
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = profiler
+    try:
+        yield profiler
+    finally:
+        _ACTIVE = previous
+
+
+def lap(name: str) -> None:
+    if _ACTIVE is not None:
+        _ACTIVE.lap(name)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    profiler = _ACTIVE
+    if profiler is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_phase(name, time.perf_counter() - started)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.emitter import Emitter, dumps_json
+
+SEARCH_DIRNAME = "search"
+SEARCH_INDEX_FILENAME = "index.json"
+SEARCH_INDEX_VERSION = 1
+SHARD_PREFIX_LENGTH = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Term-frequency weight per document field; names and tags are strong signals.
+FIELD_WEIGHTS = {"name": 3, "tags": 2, "shortDescription": 1, "description": 1, "lorebook": 1}
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "he", "her", "his", "in",
+    "is", "it", "its", "of", "on", "or", "she", "that", "the", "their", "they", "this", "to", "was",
+    "with", "you", "your",
+}
+_TOKEN = re.compile(r"[^\W_]+")
+_SHARD_SAFE = re.compile(r"^[a-z0-9]+$")
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+def shard_key(term: str) -> str:
+    prefix = term[:SHARD_PREFIX_LENGTH]
+    return prefix if _SHARD_SAFE.match(prefix) else "_"
+
+
+def shard_filename(key: str) -> str:
+    return f"terms-{key}.json"
+
+
+def lorebook_text(book: dict[str, Any] | None) -> str:
+    if not isinstance(book, dict):
+        return ""
+    parts: list[str] = []
+    for entry in book.get("entries") or []:
+        if not isinstance(entry, dict):
+            continue
+        parts.extend(str(key) for key in entry.get("keys") or [])
+        parts.append(str(entry.get("content") or ""))
+    return "\n".join(parts)
+
+
+def catalogue_document(entry: dict[str, Any], book: dict[str, Any] | None = None) -> dict[str, str]:
+    # Spoiler tags are deliberately not searchable.
+    return {
+        "name": str(entry.get("name") or ""),
+        "description": str(entry.get("description") or ""),
+        "shortDescription": str(entry.get("shortDescription") or ""),
+        "tags": " ".join(str(tag) for tag in entry.get("tags") or []),
+        "lorebook": lorebook_text(book),
+    }
+
+
+def build_search_index(documents: Iterable[dict[str, str]]) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Build BM25 postings for documents given in catalogue ordinal order.
+
+    Returns the index header (document lengths and corpus stats) and the term
+    shards keyed by term prefix.
+    """
+    postings: dict[str, list[list[int]]] = {}
+    lengths: list[int] = []
+    for ordinal, document in enumerate(documents):
+        frequencies: dict[str, int] = {}
+        for field_name, text in document.items():
+            weight = FIELD_WEIGHTS.get(field_name, 1)
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0) + weight
+        lengths.append(sum(frequencies.values()))
+        for term in sorted(frequencies):
+            postings.setdefault(term, []).append([ordinal, frequencies[term]])
+
+    shards: dict[str, dict[str, Any]] = {}
+    for term in sorted(postings):
+        shards.setdefault(shard_key(term), {})[term] = {"df": len(postings[term]), "postings": postings[term]}
+    header = {
+        "version": SEARCH_INDEX_VERSION,
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "fieldWeights": FIELD_WEIGHTS,
+        "documentCount": len(lengths),
+        "averageLength": round(sum(lengths) / len(lengths), 6) if lengths else 0,
+        "lengths": lengths,
+    }
+    return header, shards
+
+
+def write_search_index(
+    emitter: Emitter,
+    search_root: Path,
+    slugs: list[str],
+    documents: Iterable[dict[str, str]],
+) -> None:
+    header, shards = build_search_index(documents)
+    shard_refs: dict[str, dict[str, Any]] = {}
+    for key, terms in sorted(shards.items()):
+        text = dumps_json(terms, emitter.json_profile)
+        emitter.write_text(search_root / shard_filename(key), text)
+        shard_refs[key] = {
+            "path": shard_filename(key),
+            "terms": len(terms),
+            "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        }
+    emitter.write_json(
+        search_root / SEARCH_INDEX_FILENAME,
+        {**header, "slugs": slugs, "shardPrefixLength": SHARD_PREFIX_LENGTH, "shards": shard_refs},
+    )
+
+
+class SearchIndex:
+    """Query API over a built search index; shards load lazily on first use."""
+
+    def __init__(self, search_root: Path) -> None:
+        self.search_root = search_root
+        self.header = json.loads((search_root / SEARCH_INDEX_FILENAME).read_text(encoding="utf-8"))
+        self._shards: dict[str, dict[str, Any]] = {}
+
+    def _term(self, term: str) -> dict[str, Any] | None:
+        key = shard_key(term)
+        if key not in self._shards:
+            ref = self.header["shards"].get(key)
+            if ref is None:
+                self._shards[key] = {}
+            else:
+                self._shards[key] = json.loads((self.search_root / ref["path"]).read_text(encoding="utf-8"))
+        return self._shards[key].get(term)
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, float]]:
+        total = self.header["documentCount"]
+        average = self.header["averageLength"] or 1
+        k1 = self.header["k1"]
+        b = self.header["b"]
+        lengths = self.header["lengths"]
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            stats = self._term(term)
+            if stats is None:
+                continue
+            idf = math.log(1 + (total - stats["df"] + 0.5) / (stats["df"] + 0.5))
+            for ordinal, frequency in stats["postings"]:
+                norm = frequency + k1 * (1 - b + b * lengths[ordinal] / average)
+                scores[ordinal] = scores.get(ordinal, 0.0) + idf * frequency * (k1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        slugs = self.header["slugs"]
+        return [(slugs[ordinal], score) for ordinal, score in ranked]
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.search_root.iterdir() if path.is_file())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import copy
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SourceCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def add(self, other: SourceCacheStats) -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+
+    def since(self, earlier: SourceCacheStats) -> SourceCacheStats:
+        return SourceCacheStats(hits=self.hits - earlier.hits, misses=self.misses - earlier.misses)
+
+
+class SourceCache:
+    """Parsed source documents keyed by (path, size, mtime_ns).
+
+    Entries are revalidated against the file's stat on every lookup, so a cache
+    can safely outlive a single build; callers always receive a private copy.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str], tuple[tuple[int, int], Any]] = {}
+        self.stats = SourceCacheStats()
+
+    def load(self, kind: str, path: Path, loader: Callable[[Path], T]) -> T:
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        key = (kind, str(path.resolve()))
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == signature:
+            self.stats.hits += 1
+            return copy.deepcopy(cached[1])
+        self.stats.misses += 1
+        value = loader(path)
+        self._entries[key] = (signature, value)
+        return copy.deepcopy(value)
+
+    def snapshot(self) -> SourceCacheStats:
+        return SourceCacheStats(hits=self.stats.hits, misses=self.stats.misses)
+
+
+_ACTIVE: SourceCache | None = None
+
+
+def active_cache() -> SourceCache | None:
+    return _ACTIVE
+
+
+@contextmanager
+def use_source_cache(cache: SourceCache) -> Iterator[SourceCache]:
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = cache
+    try:
+        yield cache
+    finally:
+        _ACTIVE = previous
+
+
+def activate_process_cache() -> None:
+    # ProcessPoolExecutor initializer: each worker keeps one cache for its lifetime.
+    global _ACTIVE
+    _ACTIVE = SourceCache()
+
+
+def cached_load(kind: str, path: Path, loader: Callable[[Path], T]) -> T:
+    cache = _ACTIVE
+    if cache is None:
+        return loader(path)
+    return cache.load(kind, path, loader)
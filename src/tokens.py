@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Protocol
+
+TOKEN_CACHE_FILENAME = "token_cache.json"
+TOKEN_CACHE_VERSION = 1
+TOKEN_ESTIMATORS = ("approx", "tiktoken")
+TIKTOKEN_ENCODING = "cl100k_base"
+# Prompt-bearing spec_v2 fields; the lorebook is counted from its entries.
+TOKEN_FIELDS = ("description", "personality", "scenario", "first_mes", "mes_example", "system_prompt")
+LOREBOOK_FIELD = "lorebook"
+_PIECE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+class TokenEstimator(Protocol):
+    name: str
+
+    def count(self, text: str) -> int: ...
+
+
+class ApproxEstimator:
+    """Offline BPE approximation: about four ASCII characters per token.
+
+    Punctuation marks are one token each and non-ASCII words one token per
+    character, which keeps CJK text from being badly undercounted.
+    """
+
+    name = "approx-v1"
+
+    def count(self, text: str) -> int:
+        total = 0
+        for piece in _PIECE.findall(text):
+            if piece.isascii():
+                total += math.ceil(len(piece) / 4)
+            else:
+                total += len(piece)
+        return total
+
+
+class TiktokenEstimator:
+    def __init__(self, encoding: str = TIKTOKEN_ENCODING) -> None:
+        try:
+            import tiktoken
+        except ImportError as exc:
+            raise ValueError("The tiktoken estimator requires the optional 'tiktoken' package.") from exc
+        self._encoding = tiktoken.get_encoding(encoding)
+        self.name = f"tiktoken-{encoding}"
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def get_estimator(name: str = "approx") -> TokenEstimator:
+    if name == "approx":
+        return ApproxEstimator()
+    if name == "tiktoken":
+        return TiktokenEstimator()
+    raise ValueError(f"Unknown token estimator: {name}")
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TokenCounter:
+    """Token counts memoized by the sha256 of each counted text.
+
+    Counts are only valid for one estimator, so the cache file records its
+    name and is discarded when a build uses a different one. Keys touched
+    since the last take_used() are tracked so the cache written after a
+    build holds only the texts its characters still contain.
+    """
+
+    def __init__(self, estimator: TokenEstimator, counts: dict[str, int] | None = None) -> None:
+        self.estimator = estimator
+        self.counts: dict[str, int] = dict(counts or {})
+        self.added: dict[str, int] = {}
+        self.used: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        key = _text_key(text)
+        self.used.add(key)
+        cached = self.counts.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        value = self.estimator.count(text)
+        self.counts[key] = value
+        self.added[key] = value
+        return value
+
+    def count_card(self, data: dict[str, Any], book: dict[str, Any] | None) -> dict[str, Any]:
+        fields = {name: self.count(str(data.get(name) or "")) for name in TOKEN_FIELDS}
+        lorebook = 0
+        if isinstance(book, dict):
+            for entry in book.get("entries") or []:
+                if not isinstance(entry, dict):
+                    continue
+                lorebook += self.count(", ".join(str(key) for key in entry.get("keys") or []))
+                lorebook += self.count(str(entry.get("content") or ""))
+        fields[LOREBOOK_FIELD] = lorebook
+        return {"estimator": self.estimator.name, "fields": fields, "total": sum(fields.values())}
+
+    def take_added(self) -> dict[str, int]:
+        # Worker processes hand back only what they counted since the last call.
+        added = self.added
+        self.added = {}
+        return added
+
+    def take_used(self) -> list[str]:
+        # Called after each card, so the ledger can remember its keys.
+        used = sorted(self.used)
+        self.used = set()
+        return used
+
+    def merge(self, counts: dict[str, int]) -> None:
+        self.counts.update(counts)
+
+
+def load_token_counter(path: Path, estimator: TokenEstimator) -> TokenCounter:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return TokenCounter(estimator)
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != TOKEN_CACHE_VERSION
+        or payload.get("estimator") != estimator.name
+    ):
+        return TokenCounter(estimator)
+    counts = {str(key): int(value) for key, value in (payload.get("counts") or {}).items()}
+    return TokenCounter(estimator, counts)
+
+
+def write_token_cache(path: Path, counter: TokenCounter, keys: Iterable[str]) -> None:
+    # Only the given keys are kept, so texts no character uses any more are
+    # evicted instead of accumulating across builds.
+    payload = {
+        "version": TOKEN_CACHE_VERSION,
+        "estimator": counter.estimator.name,
+        "counts": {key: counter.counts[key] for key in keys if key in counter.counts},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+_ACTIVE: TokenCounter | None = None
+
+
+def active_token_counter() -> TokenCounter | None:
+    return _ACTIVE
+
+
+@contextmanager
+def use_token_counter(counter: TokenCounter | None) -> Iterator[TokenCounter | None]:
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = counter
+    try:
+        yield counter
+    finally:
+        _ACTIVE = previous
+
+
+def activate_process_counter(estimator_name: str, counts: dict[str, int]) -> None:
+    # ProcessPoolExecutor initializer: each worker starts from the parent's cache.
+    global _ACTIVE
+    _ACTIVE = TokenCounter(get_estimator(estimator_name), counts)
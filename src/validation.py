@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+try:
+    import jsonschema
+except ImportError:  # Only needed for --validate.
+    jsonschema = None
+
+SCHEMAS_ROOT = Path(__file__).resolve().parent.parent / "schemas"
+MANIFEST_SCHEMA = "manifest.schema.json"
+# botparts-schemas has no catalogue schema yet; schemas/ is vendored, so the
+# catalogue stays unvalidated until the change request lands upstream.
+CATALOGUE_SCHEMA_REQUEST = "docs/SCHEMA_CHANGE_REQUEST_catalogue.md"
+VIOLATION_LABEL = "Schema violation"
+MAX_VIOLATIONS_PER_DOCUMENT = 20
+
+
+def require_jsonschema() -> None:
+    if jsonschema is None:
+        raise ValueError("--validate requires the 'jsonschema' package (see requirements-dev.txt).")
+
+
+@lru_cache(maxsize=None)
+def _validator(schema_name: str) -> Any:
+    # Compiled once per process; parallel export workers each build their own.
+    require_jsonschema()
+    schema = json.loads((SCHEMAS_ROOT / schema_name).read_text(encoding="utf-8"))
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema, format_checker=validator_class.FORMAT_CHECKER)
+
+
+def json_pointer(path: Any) -> str:
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def validate_payload(payload: Any, schema_name: str, context: str, document: str) -> tuple[list[str], int]:
+    """Validate an in-memory payload; returns warnings and the total violation count.
+
+    Violations are ordered by JSON pointer so reports stay deterministic.
+    At most MAX_VIOLATIONS_PER_DOCUMENT are described; the count covers all.
+    """
+    errors = sorted(
+        _validator(schema_name).iter_errors(payload),
+        key=lambda error: (json_pointer(error.absolute_path), error.message),
+    )
+    warnings = [
+        f"[{context}] {VIOLATION_LABEL} in {document} at {json_pointer(error.absolute_path) or '/'} "
+        f"({schema_name}): {error.message}"
+        for error in errors[:MAX_VIOLATIONS_PER_DOCUMENT]
+    ]
+    if len(errors) > MAX_VIOLATIONS_PER_DOCUMENT:
+        warnings.append(
+            f"[{context}] {len(errors) - MAX_VIOLATIONS_PER_DOCUMENT} more schema violations in {document} omitted."
+        )
+    return warnings, len(errors)
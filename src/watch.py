@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from src.ledger import IGNORED_SOURCE_DIRS
+
+WATCH_PATHS = ("sources", "prompts", "src/spec_v2_template.json")
+DEFAULT_POLL_INTERVAL = 0.25
+DEFAULT_DEBOUNCE = 0.3
+# Editor swap and backup files never feed the build.
+_IGNORED_SUFFIXES = (".swp", ".swx", "~")
+
+Snapshot = dict[Path, tuple[int, int]]
+
+
+def scan(workspace_root: Path) -> Snapshot:
+    snapshot: Snapshot = {}
+    for relative in WATCH_PATHS:
+        _scan_path(workspace_root / relative, snapshot)
+    return snapshot
+
+
+def _scan_path(path: Path, snapshot: Snapshot) -> None:
+    try:
+        if path.is_dir():
+            for child in path.iterdir():
+                if child.is_dir() and child.name in IGNORED_SOURCE_DIRS:
+                    continue
+                _scan_path(child, snapshot)
+        elif path.is_file() and not path.name.endswith(_IGNORED_SUFFIXES):
+            stat = path.stat()
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        # Editors replace files by rename; a path can vanish mid-scan.
+        return
+
+
+def changed_paths(before: Snapshot, after: Snapshot) -> set[Path]:
+    changed = {path for path, stamp in after.items() if before.get(path) != stamp}
+    changed.update(path for path in before if path not in after)
+    return changed
+
+
+def affected_sources(workspace_root: Path, paths: set[Path]) -> set[str] | None:
+    """Map changed paths to the character source directories that own them.
+
+    Returns directory names under sources/characters, which need not equal
+    the manifest slugs. Returns None when any path is not owned by a single
+    character (site seed, image inputs, prompts, the card template), meaning
+    every character must be re-hashed.
+    """
+    characters_root = workspace_root / "sources" / "characters"
+    sources: set[str] = set()
+    for path in paths:
+        try:
+            relative = path.relative_to(characters_root)
+        except ValueError:
+            return None
+        if len(relative.parts) < 2:
+            return None
+        sources.add(relative.parts[0])
+    return sources
+
+
+def wait_for_quiet(
+    workspace_root: Path,
+    snapshot: Snapshot,
+    debounce: float,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> tuple[Snapshot, set[Path]]:
+    # Editors save in bursts (temp file, rename, touch); keep folding changes
+    # in until the tree has been quiet for one debounce window.
+    changed: set[Path] = set()
+    while True:
+        sleep(debounce)
+        current = scan(workspace_root)
+        more = changed_paths(snapshot, current)
+        if not more:
+            return snapshot, changed
+        changed.update(more)
+        snapshot = current
+
+
+def watch(
+    workspace_root: Path,
+    rebuild: Callable[[set[str] | None], Any],
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+    should_stop: Callable[[], bool] = lambda: False,
+    log: Callable[[str], Any] = print,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> None:
+    """Poll the watched paths and rebuild whenever they change.
+
+    rebuild() receives the affected source directories (or None for a full incremental
+    pass) and is expected to keep its own warm state between calls.
+    """
+    snapshot = scan(workspace_root)
+    # Sources from a failed rebuild are carried into the next one so the ledger
+    # is never trusted for a character whose edit has not been exported yet.
+    failed: set[str] | None = set() if _run_rebuild(rebuild, None, log) else None
+    while not should_stop():
+        sleep(poll_interval)
+        current = scan(workspace_root)
+        changed = changed_paths(snapshot, current)
+        if not changed:
+            continue
+        snapshot, more = wait_for_quiet(workspace_root, current, debounce, sleep=sleep)
+        changed.update(more)
+        sources = affected_sources(workspace_root, changed)
+        if sources is not None and failed is not None:
+            sources |= failed
+        else:
+            sources = None
+        failed = set() if _run_rebuild(rebuild, sources, log) else sources
+
+
+def _run_rebuild(
+    rebuild: Callable[[set[str] | None], Any], sources: set[str] | None, log: Callable[[str], Any]
+) -> bool:
+    label = "all characters" if sources is None else ", ".join(sorted(sources))
+    started = time.perf_counter()
+    try:
+        rebuild(sources)
+    except Exception as exc:  # keep watching; the next save may fix it
+        log(f"Build failed ({label}): {exc}")
+        return False
+    log(f"Rebuilt {label} in {time.perf_counter() - started:.2f}s")
+    return True
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import io
+import json
+import shutil
+import tarfile
+import zipfile
+from pathlib import Path
+
+from src.emitter import CHANGED_FILES_NAME
+from src.exporter import ExportOptions
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, seed_character_sources
+
+
+def _seed(workspace: Path) -> None:
+    character_dir = seed_character_sources(workspace, slug="example-bot")
+    variant_dir = character_dir / "variants" / "calm"
+    variant_dir.mkdir(parents=True)
+    (variant_dir / "spec_v2_fields.md").write_text(json.dumps({"personality": "Calm."}), encoding="utf-8")
+    (workspace / "sources" / "image_inputs" / "example-bot.png").write_bytes(b"\x89PNG\r\n\x1a\nnot-really-pixels")
+
+
+def test_zip_archive_mirrors_character_folder(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed(workspace)
+    options = ExportOptions(archive_format="zip")
+    build_site_data(workspace, incremental=True, export_options=options)
+
+    export_root = workspace / "dist" / "src" / "export"
+    character_root = export_root / "characters" / "example-bot"
+    archive_path = export_root / "archives" / "example-bot.zip"
+    with zipfile.ZipFile(archive_path) as archive:
+        names = archive.namelist()
+        assert names == sorted(names)
+        expected = sorted(path.relative_to(character_root).as_posix() for path in character_root.rglob("*") if path.is_file())
+        assert names == expected
+        for info in archive.infolist():
+            assert info.date_time == (1980, 1, 1, 0, 0, 0)
+            assert archive.read(info) == (character_root / info.filename).read_bytes()
+        assert archive.getinfo("avatarImage.png").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("manifest.json").compress_type == zipfile.ZIP_DEFLATED
+    first = archive_path.read_bytes()
+
+    build_site_data(workspace, incremental=True, export_options=options)
+    assert (workspace / "dist" / CHANGED_FILES_NAME).read_text(encoding="utf-8") == ""
+    shutil.rmtree(workspace / "dist")
+    build_site_data(workspace, export_options=options)
+    assert archive_path.read_bytes() == first
+
+
+def test_tar_archive_includes_referenced_store_files(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed(workspace)
+    export_root = workspace / "dist" / "src" / "export"
+    build_site_data(workspace, export_options=ExportOptions(archive_format="tar", asset_mode="reference"))
+
+    archive_bytes = (export_root / "archives" / "example-bot.tar").read_bytes()
+    with tarfile.open(fileobj=io.BytesIO(archive_bytes)) as archive:
+        manifest = json.load(archive.extractfile("manifest.json"))
+        assert archive.getmember(manifest["x"]["avatarAsset"]).mtime == 0
+
+    build_site_data(workspace)
+    assert not (export_root / "archives").exists()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from pathlib import Path
+
+from src.exporter import ExportOptions
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
+
+
+def _tiny_png() -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\xff\x00\x00")
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+
+def _seed_with_variant_and_image(workspace: Path) -> None:
+    character_dir = seed_character_sources(workspace, slug="example-bot")
+    variant_dir = character_dir / "variants" / "calm"
+    variant_dir.mkdir(parents=True)
+    (variant_dir / "spec_v2_fields.md").write_text(json.dumps({"personality": "Calm."}), encoding="utf-8")
+    (workspace / "sources" / "image_inputs" / "example-bot.png").write_bytes(_tiny_png())
+
+
+def test_link_mode_stores_each_image_once(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed_with_variant_and_image(workspace)
+    summary = build_site_data(workspace, export_options=ExportOptions(asset_mode="link"))
+
+    export_root = workspace / "dist" / "src" / "export"
+    character_root = export_root / "characters" / "example-bot"
+    stored = [path for path in (export_root / "assets").iterdir() if path.name.endswith(".png")]
+    avatar = character_root / "avatarImage.png"
+    variant_avatar = character_root / "variants" / "calm" / "avatarImage.png"
+    stored_path = next(path for path in stored if path.read_bytes() == avatar.read_bytes())
+    assert avatar.samefile(stored_path)
+    assert variant_avatar.samefile(stored_path)
+    assert summary.asset_bytes_referenced - summary.asset_bytes_stored > 0
+
+    report_text = (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+    assert "## Asset Store" in report_text
+    assert "- Mode: link" in report_text
+
+
+def test_reference_mode_points_manifest_at_store(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed_with_variant_and_image(workspace)
+    build_site_data(workspace, export_options=ExportOptions(asset_mode="reference"))
+
+    export_root = workspace / "dist" / "src" / "export"
+    character_root = export_root / "characters" / "example-bot"
+    manifest = load_json(character_root / "manifest.json")
+    asset_path = manifest["x"]["avatarAsset"]
+    assert (export_root / asset_path).read_bytes() == _tiny_png()
+    assert not (character_root / "avatarImage.png").exists()
+    assert not (character_root / "variants" / "calm" / "avatarImage.png").exists()
+
+
+def test_default_mode_keeps_plain_copies(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed_with_variant_and_image(workspace)
+    build_site_data(workspace)
+
+    export_root = workspace / "dist" / "src" / "export"
+    assert not (export_root / "assets").exists()
+    assert (export_root / "characters" / "example-bot" / "avatarImage.png").read_bytes() == _tiny_png()
+    assert "## Asset Store" not in (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
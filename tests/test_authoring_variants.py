@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 from src import authoring
 from src import cli
-from src.llm_client import LLMResult
+from src.llm_client import LLMRequestError, LLMResult
 
 
 def test_parse_variant_groups() -> None:
@@ -129,6 +132,13 @@ def test_author_variants_creates_runs_and_drafts(
             model_info={"model": "stub"},
         ),
     )
+    requested: list[list[str]] = []
+
+    def fake_invoke_many(compiled_prompts: list[str], **_kwargs) -> list[LLMResult]:
+        requested.append(compiled_prompts)
+        return [LLMResult(output_text='{"name": "Variant"}', model_info={"model": "stub"}) for _ in compiled_prompts]
+
+    monkeypatch.setattr(cli, "_invoke_llm_many", fake_invoke_many)
 
     args = SimpleNamespace(staging_file=None)
     assert cli._run_author_variants(args, sources_root, prompts_root) == 0
@@ -143,6 +153,11 @@ def test_author_variants_creates_runs_and_drafts(
     assert storm_path.read_text(encoding="utf-8") == '{"name": "Variant"}\n'
 
     assert opened == [calm_path, storm_path]
+    assert len(requested) == 1
+    assert [("Stay steady." in prompt, "Heightened tension." in prompt) for prompt in requested[0]] == [
+        (True, False),
+        (False, True),
+    ]
     for variant_slug in ("calm-tone", "storm-front"):
         runs_root = (
             sources_root / "characters" / "alpha-bot" / "variants" / variant_slug / "runs"
@@ -151,3 +166,115 @@ def test_author_variants_creates_runs_and_drafts(
         assert run_dirs
         assert (run_dirs[0] / "prompt_ref.txt").exists()
 
+
+
+def test_variant_rewrites_keep_successes_when_one_fails(tmp_path: Path, monkeypatch) -> None:
+    character_dir = tmp_path / "alpha-bot"
+    canonical_path = character_dir / "canonical" / "spec_v2_fields.md"
+    canonical_path.parent.mkdir(parents=True)
+    canonical_path.write_text('{"name": "Alpha Bot"}', encoding="utf-8")
+    prompt_path = tmp_path / "01_neutral_v1.md"
+    prompt_path.write_text("Rewrite prompt", encoding="utf-8")
+
+    def fake_invoke_many(compiled_prompts: list[str], **_kwargs) -> list[LLMResult | BaseException]:
+        return [
+            LLMResult(output_text='{"name": "Calm"}', model_info={"model": "stub"}),
+            LLMRequestError("LLM request failed (HTTP 500): boom", status=500),
+        ]
+
+    monkeypatch.setattr(cli, "_invoke_llm_many", fake_invoke_many)
+    planned = [("Calm Tone", "calm-tone", "Stay steady."), ("Storm Front", "storm-front", "Heightened tension.")]
+    with pytest.raises(LLMRequestError, match="HTTP 500"):
+        cli._apply_variant_edits(character_dir, canonical_path, prompt_path, planned, wait_for_edit=False)
+
+    calm_dir = character_dir / "variants" / "calm-tone"
+    assert (calm_dir / "spec_v2_fields.md").read_text(encoding="utf-8") == '{"name": "Calm"}\n'
+    assert [path for path in (calm_dir / "runs").iterdir() if path.is_dir()]
+    assert not (character_dir / "variants" / "storm-front").exists()
+
+
+def test_schema_file_stages_keep_separate_run_logs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    prompts_root = Path(__file__).resolve().parents[1] / "prompts"
+    sources_root = tmp_path / "sources"
+    schema_path = sources_root / "schema_inputs" / "olivia.md"
+    schema_path.parent.mkdir(parents=True)
+    schema_path.write_text(
+        "---\n"
+        "version: 1\n"
+        "prompts:\n"
+        "  elaborate: 01_elaborate_v1.md\n"
+        "  extract_fields: 01_specv2_fields_v1.md\n"
+        "  tone: chill_v1.md\n"
+        "  style: casual_v1.md\n"
+        "  voice: first_person_v1.md\n"
+        "  idiosyncrasy_module: 01_idiosyncrasy_module_v1.md\n"
+        "prose_variant: schema-like\n"
+        "embedded_entries:\n"
+        "  transform_notes: |\n"
+        "    Keep it short.\n"
+        "---\n"
+        "# Character concept (staging selection)\n"
+        "Olivia runs a bunker.\n"
+        "## Display name\n"
+        "Olivia\n"
+        "## Elaborate prompt notes\n"
+        "None.\n"
+        "## Draft edits (manual)\n"
+        "None.\n"
+        "## Audit notes\n"
+        "None.\n"
+        "## Variant notes\n"
+        "None.\n",
+        encoding="utf-8",
+    )
+    greetings = [
+        "Olivia checks the bunker door at dawn in the workshop.",
+        "Olivia sorts the market haul on a winter evening at the dock.",
+    ]
+    examples = "\n\n".join(f"<START>Example {index}<END>" for index in range(1, 5))
+    spec = (
+        '{"first_mes": "' + greetings[0] + '", '
+        '"alternate_greetings": ["' + greetings[1] + '"], '
+        '"mes_example": ' + authoring.json_dumps(examples).strip() + "}"
+    )
+    outputs = {
+        "Elaboration": "Olivia keeps the bunker running.",
+        "Embedded entries (notes)": "No entries.",
+        "Idiosyncrasy module": '{"system_prompt": "Stay calm.", "post_history_instructions": ""}',
+        "Extraction": spec + "\n---SHORT_DESCRIPTION---\nA bunker keeper.",
+    }
+
+    def fake_invoke(compiled_prompt: str, label: str = "", partial_output: Path | None = None) -> LLMResult:
+        # Cache hits return instantly, so every stage lands in the same second.
+        return LLMResult(output_text=outputs[label], model_info={"cache": "hit", "label": label})
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli, "_invoke_llm", fake_invoke)
+    monkeypatch.setattr(authoring, "build_run_id", lambda slug: f"20260101T000000Z-{slug}")
+    args = SimpleNamespace(
+        prompt_category="elaborate",
+        extract_category="extract_fields",
+        tone_category="tone",
+        voice_category="voice",
+        style_category="style",
+        idiosyncrasy_category="idiosyncrasy_module",
+        variant_category="rewrite_variants",
+    )
+
+    cli._run_author_schema_file(schema_path, args, sources_root, prompts_root, wait_for_edit=False)
+
+    (character_dir,) = authoring.list_character_dirs(sources_root)
+    run_dirs = sorted((character_dir / "runs").iterdir())
+    base = f"20260101T000000Z-{character_dir.name}"
+    assert [path.name for path in run_dirs] == [base, f"{base}-2", f"{base}-3", f"{base}-4"]
+    labels = []
+    for run_dir in run_dirs:
+        log = run_dir / "embedded_entries_auto_notes.md"
+        if log.exists():
+            labels.append("Embedded entries (notes)")
+            assert list(run_dir.iterdir()) == [log]
+        else:
+            labels.append(json.loads((run_dir / "model.json").read_text(encoding="utf-8"))["label"])
+    assert labels == ["Elaboration", "Embedded entries (notes)", "Idiosyncrasy module", "Extraction"]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src import bench
+from tests.conftest import hash_directory
+
+
+def test_corpus_is_deterministic(tmp_path: Path) -> None:
+    config = bench.CorpusConfig(characters=3, variants=2, entries_per_type=1, png_bytes=512)
+    bench.generate_corpus(tmp_path / "a", config)
+    bench.generate_corpus(tmp_path / "b", config)
+    assert hash_directory(tmp_path / "a" / "sources") == hash_directory(tmp_path / "b" / "sources")
+
+
+def test_benchmark_times_cold_warm_and_edit_builds(tmp_path: Path) -> None:
+    config = bench.CorpusConfig(characters=3, variants=1, entries_per_type=1, png_bytes=256)
+    results = bench.run_benchmark(tmp_path, config)
+
+    assert set(results["runs"]) == {"cold", "warm", "edit"}
+    assert results["runs"]["cold"]["charactersExported"] == 3
+    assert results["runs"]["warm"]["charactersExported"] == 0
+    assert results["runs"]["warm"]["filesWritten"] == 0
+    assert results["runs"]["edit"]["charactersExported"] == 1
+    assert bench.compare_results(results, results)[0].startswith("cold: ")
+
+
+def test_benchmark_refuses_real_workspace(tmp_path: Path) -> None:
+    (tmp_path / "sources" / "characters").mkdir(parents=True)
+    with pytest.raises(ValueError):
+        bench.run_benchmark(tmp_path, bench.CorpusConfig(characters=1))
+    assert (tmp_path / "sources" / "characters").exists()
+
+
+def test_benchmark_refuses_workspace_without_marker(tmp_path: Path) -> None:
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "REPORT.md").write_text("keep me\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        bench.run_benchmark(tmp_path, bench.CorpusConfig(characters=1))
+    assert (tmp_path / "dist" / "REPORT.md").exists()
+    assert not (tmp_path / bench.BENCH_MARKER).exists()
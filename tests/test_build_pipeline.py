@@ -114,7 +114,7 @@ def test_site_only_fields_present(output_root: Path) -> None:
     manifest_x = manifest.get("x", {})
     assert manifest_x.get("shortDescription") == ""
     assert manifest_x.get("spoilerTags") == []
-    assert manifest_x.get("aiTokens") is None
+    assert manifest_x.get("aiTokens") == manifest_x["aiTokenBreakdown"]["total"]
     assert manifest_x.get("uploadDate") != ""
 
 
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+
+from src.cards import FRAGMENT_MARKER, CardRenderer
+
+
+def _renderer(json_profile: str = "pretty") -> CardRenderer:
+    return CardRenderer(
+        "echo",
+        short_description="Short desc",
+        fallback_name="Echo",
+        fallback_description="Desc",
+        fallback_tags=["tag"],
+        json_profile=json_profile,
+    )
+
+
+def _book() -> dict:
+    return {
+        "name": "Echo Lorebook",
+        "description": "",
+        "extensions": {},
+        "entries": [
+            {"keys": ["harbor"], "content": "Line one.\nLine \"two\".", "extensions": {"entryType": "locations"}},
+        ],
+    }
+
+
+def test_spliced_card_matches_plain_serialization() -> None:
+    renderer = _renderer()
+    base = renderer.base_card({"first_mes": "Hello"}, _book())
+    card = renderer.prose_card(base, "hybrid", first_mes="Draft")
+    expected = json.dumps(card, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    assert renderer.dumps(card) == expected
+
+
+def test_compact_spliced_card_matches_plain_serialization() -> None:
+    renderer = _renderer("compact")
+    base = renderer.base_card({"first_mes": "Hello"}, _book())
+    card = renderer.prose_card(base, "hybrid", first_mes="Draft")
+    expected = json.dumps(card, separators=(",", ":"), sort_keys=True, ensure_ascii=False) + "\n"
+    assert renderer.dumps(card) == expected
+
+
+def test_prose_cards_share_base_subtrees() -> None:
+    renderer = _renderer()
+    book = _book()
+    base = renderer.base_card({"first_mes": "Hello"}, book, variant_slug="calm")
+    schema_like = renderer.prose_card(base, "schema-like")
+    hybrid = renderer.prose_card(base, "hybrid", first_mes="Draft")
+
+    assert schema_like["data"]["character_book"] is hybrid["data"]["character_book"] is book
+    assert base["data"]["first_mes"] == "Hello"
+    assert "proseVariant" not in base["data"]["extensions"]["botparts"]
+    assert hybrid["data"]["extensions"]["botparts"] == {
+        "slug": "echo",
+        "variant": "calm",
+        "proseVariant": "hybrid",
+        "shortDescription": "Short desc",
+    }
+
+
+def test_authored_marker_text_falls_back_to_plain_serialization() -> None:
+    renderer = _renderer()
+    base = renderer.base_card({"first_mes": "Hello", "alternate_greetings": [FRAGMENT_MARKER]}, _book())
+    card = renderer.prose_card(base, "hybrid", first_mes=FRAGMENT_MARKER)
+    expected = json.dumps(card, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    assert renderer.dumps(card) == expected
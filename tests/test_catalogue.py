@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from src.catalogue import build_tag_index, decode_postings
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
+
+
+def test_paged_catalogue_matches_single_file(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    for slug in ("alpha-bot", "beta-bot", "gamma-bot"):
+        seed_character_sources(workspace, slug=slug)
+    data_root = workspace / "dist" / "src" / "data"
+
+    build_site_data(workspace)
+    expected = load_json(data_root / "catalogue.json")["entries"]
+
+    build_site_data(workspace, catalogue_page_size=2)
+    assert not (data_root / "catalogue.json").exists()
+    index = load_json(data_root / "catalogue" / "index.json")
+    assert index["pageSize"] == 2
+    assert index["totalEntries"] == len(expected)
+
+    paged_entries = []
+    for number, page in enumerate(index["pages"], start=1):
+        page_path = data_root / "catalogue" / page["path"]
+        assert hashlib.sha256(page_path.read_bytes()).hexdigest() == page["sha256"]
+        payload = load_json(page_path)
+        assert payload["page"] == number
+        assert len(payload["entries"]) == page["count"] <= 2
+        assert payload["entries"][0]["slug"] == page["firstSlug"]
+        assert payload["entries"][-1]["slug"] == page["lastSlug"]
+        paged_entries.extend(payload["entries"])
+    assert paged_entries == expected
+
+    build_site_data(workspace)
+    assert (data_root / "catalogue.json").exists()
+    assert not (data_root / "catalogue").exists()
+
+
+def test_tag_index_encodings_round_trip() -> None:
+    entries = [
+        {"slug": "a-bot", "tags": ["calm", "mage"], "spoilerTags": ["traitor"]},
+        {"slug": "b-bot", "tags": ["mage"], "spoilerTags": []},
+        {"slug": "c-bot", "tags": ["calm", "mage"], "spoilerTags": ["traitor"]},
+    ]
+    plain = build_tag_index(entries)
+    assert plain["slugs"] == ["a-bot", "b-bot", "c-bot"]
+    assert plain["tags"] == {"calm": [0, 2], "mage": [0, 1, 2]}
+    assert plain["tagCounts"] == {"calm": 2, "mage": 3}
+    assert plain["spoilerTags"] == {"traitor": [0, 2]}
+    assert plain["spoilerTagCounts"] == {"traitor": 2}
+    for encoding in ("delta", "bitmap"):
+        encoded = build_tag_index(entries, encoding=encoding)
+        for tag, ordinals in plain["tags"].items():
+            assert decode_postings(encoded["tags"][tag], encoding) == ordinals
+
+
+def test_build_emits_tag_index(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace, tag_index_encoding="delta")
+
+    data_root = workspace / "dist" / "src" / "data"
+    entries = load_json(data_root / "catalogue.json")["entries"]
+    tag_index = load_json(data_root / "tag_index.json")
+    assert tag_index["encoding"] == "delta"
+    ordinal = tag_index["slugs"].index("example-bot")
+    assert ordinal in decode_postings(tag_index["tags"]["friendly"], "delta")
+    assert tag_index["slugs"] == [entry["slug"] for entry in entries]
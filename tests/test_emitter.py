@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+from src.emitter import CHANGED_FILES_NAME
+from src.exporter import ExportOptions
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, seed_character_sources
+
+
+def _changed_files(workspace: Path) -> list[str]:
+    text = (workspace / "dist" / CHANGED_FILES_NAME).read_text(encoding="utf-8")
+    return text.splitlines()
+
+
+def test_unchanged_rebuild_rewrites_nothing(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+
+    manifest_path = workspace / "dist" / "src" / "export" / "characters" / "example-bot" / "manifest.json"
+    before = manifest_path.stat()
+    build_site_data(workspace)
+    after = manifest_path.stat()
+
+    assert (before.st_ino, before.st_mtime_ns) == (after.st_ino, after.st_mtime_ns)
+    assert _changed_files(workspace) == []
+
+
+def test_edit_lists_only_changed_outputs(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    character_dir = seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+
+    spec_path = character_dir / "canonical" / "spec_v2_fields.md"
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    spec["personality"] = "Edited personality."
+    spec_path.write_text(json.dumps(spec), encoding="utf-8")
+    build_site_data(workspace)
+
+    changed = _changed_files(workspace)
+    assert changed
+    # The catalogue carries the character's token counts, which the edit changed.
+    assert "M\tsrc/data/catalogue.json" in changed
+    changed.remove("M\tsrc/data/catalogue.json")
+    assert all(line.startswith("M\tsrc/export/characters/example-bot/") for line in changed)
+    assert "M\tsrc/export/characters/example-bot/spec_v2.schema-like.json" in changed
+
+
+def test_stale_outputs_are_pruned_and_listed(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+
+    stale_dir = workspace / "dist" / "src" / "export" / "characters" / "removed-bot"
+    stale_dir.mkdir(parents=True)
+    (stale_dir / "manifest.json").write_text("{}\n", encoding="utf-8")
+    build_site_data(workspace)
+
+    assert not stale_dir.exists()
+    assert _changed_files(workspace) == ["D\tsrc/export/characters/removed-bot/manifest.json"]
+
+
+def test_precompress_writes_stable_gzip_siblings(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    options = ExportOptions(precompress=True)
+    build_site_data(workspace, incremental=True, export_options=options)
+
+    dist_root = workspace / "dist"
+    manifest_path = dist_root / "src" / "export" / "characters" / "example-bot" / "manifest.json"
+    catalogue_path = dist_root / "src" / "data" / "catalogue.json"
+    for path in (manifest_path, catalogue_path):
+        assert gzip.decompress(path.with_name(path.name + ".gz").read_bytes()) == path.read_bytes()
+    assert not (dist_root / "build_ledger.json.gz").exists()
+    report_text = (dist_root / "REPORT.md").read_text(encoding="utf-8")
+    assert "## Precompression" in report_text
+
+    build_site_data(workspace, incremental=True, export_options=options)
+    assert _changed_files(workspace) == []
+    assert (dist_root / "REPORT.md").read_text(encoding="utf-8") == report_text
+
+    build_site_data(workspace, incremental=True)
+    assert not manifest_path.with_name("manifest.json.gz").exists()
+
+
+def test_compact_profile_is_stable_and_equivalent(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    site_root = workspace / "dist" / "src"
+    export_root = site_root / "export" / "characters"
+    build_site_data(workspace, incremental=True)
+    pretty = {path: json.loads(path.read_text(encoding="utf-8")) for path in export_root.rglob("*.json")}
+
+    options = ExportOptions(json_profile="compact")
+    build_site_data(workspace, incremental=True, export_options=options)
+    for path, payload in pretty.items():
+        text = path.read_text(encoding="utf-8")
+        assert text.count("\n") == 1
+        assert json.loads(text) == payload
+
+    build_site_data(workspace, incremental=True, export_options=options)
+    assert _changed_files(workspace) == []
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import contextlib
 import json
 import shutil
+import sys
 from pathlib import Path
 
+import pytest
+
+from src import cli
+from src import generator
 from src.generator import build_site_data
 from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
 
@@ -50,3 +56,22 @@ def test_output_completeness_empty_inputs(tmp_path: Path, repo_root: Path) -> No
     output_root = workspace / "dist" / "src" / "export"
     assert (output_root / "characters").exists()
     assert not any((output_root / "characters").iterdir())
+
+
+def test_build_entry_points_share_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    argv = ["--jobs", "2", "--validate", "--lorebook-layout", "shared", "--catalogue-page-size", "5"]
+    calls: list[dict] = []
+
+    def fake_build(root: Path, **kwargs) -> None:
+        calls.append(kwargs)
+
+    monkeypatch.setattr(generator, "build_site_data", fake_build)
+    monkeypatch.setattr(cli, "build_site_data", fake_build)
+    monkeypatch.setattr(cli, "_Spinner", lambda _label: contextlib.nullcontext())
+    monkeypatch.setattr(sys, "argv", ["generator.py", *argv])
+
+    generator.main()
+    assert cli.main(["build", *argv]) == 0
+    assert calls[0] == calls[1]
+    assert calls[0]["jobs"] == 2
+    assert calls[0]["export_options"].validate
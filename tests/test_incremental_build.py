@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+from src import exporter
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, hash_directory, seed_character_sources
+
+
+def _snapshot(workspace: Path) -> tuple[bytes, bytes]:
+    dist_root = workspace / "dist"
+    return (
+        (dist_root / "src" / "data" / "catalogue.json").read_bytes(),
+        (dist_root / "REPORT.md").read_bytes(),
+    )
+
+
+def _count_exports(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    original = exporter.export_character_bundle
+
+    def tracking(**kwargs):
+        calls.append(kwargs["slug"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(exporter, "export_character_bundle", tracking)
+    return calls
+
+
+def test_incremental_build_skips_unchanged_slugs(tmp_path: Path, repo_root: Path, monkeypatch) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+    clean = _snapshot(workspace)
+
+    calls = _count_exports(monkeypatch)
+    build_site_data(workspace, incremental=True)
+    assert calls == []
+    assert _snapshot(workspace) == clean
+
+
+def test_incremental_build_reexports_changed_slug_only(tmp_path: Path, repo_root: Path, monkeypatch) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+
+    spec_path = workspace / "sources" / "characters" / "example-bot" / "canonical" / "spec_v2_fields.md"
+    payload = json.loads(spec_path.read_text(encoding="utf-8"))
+    payload["description"] = "Edited description."
+    spec_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    calls = _count_exports(monkeypatch)
+    build_site_data(workspace, incremental=True)
+    assert calls == ["example-bot"]
+    incremental = _snapshot(workspace)
+
+    shutil.rmtree(workspace / "dist")
+    build_site_data(workspace)
+    assert _snapshot(workspace) == incremental
+
+
+def test_incremental_build_removes_deleted_slugs(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+    characters_root = workspace / "dist" / "src" / "export" / "characters"
+    assert (characters_root / "example-bot").exists()
+
+    shutil.rmtree(workspace / "sources" / "characters" / "example-bot")
+    build_site_data(workspace, incremental=True)
+    assert not (characters_root / "example-bot").exists()
+
+
+def test_parallel_build_matches_serial_build(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+    serial = _snapshot(workspace)
+    serial_export = hash_directory(workspace / "dist" / "src" / "export")
+
+    shutil.rmtree(workspace / "dist")
+    build_site_data(workspace, jobs=2)
+    assert _snapshot(workspace) == serial
+    assert hash_directory(workspace / "dist" / "src" / "export") == serial_export
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.llm_bench import StandInLLMServer
+from src.llm_cache import ResponseCache, bypass_response_cache, response_key
+from src.llm_client import close_connection_pools, invoke_llm
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    close_connection_pools()
+    yield
+    close_connection_pools()
+
+
+def test_cached_response_skips_the_network(tmp_path: Path) -> None:
+    with StandInLLMServer() as server:
+        config = server.config(cache_dir=str(tmp_path / "cache"))
+        first = invoke_llm("prompt", config)
+        second = invoke_llm("prompt", config)
+        other = invoke_llm("another prompt", config)
+    assert server.requests == 2
+    assert first.model_info["cache"] == "miss"
+    assert second.model_info["cache"] == "hit"
+    assert second.model_info["cache_key"] == first.model_info["cache_key"]
+    assert second.model_info["response_id"] == first.model_info["response_id"]
+    assert second.output_text == first.output_text
+    assert other.model_info["cache"] == "miss"
+
+
+def test_cache_hit_drops_per_call_stats(tmp_path: Path) -> None:
+    with StandInLLMServer(response_headers={"x-ratelimit-limit-requests": "60"}) as server:
+        config = server.config(cache_dir=str(tmp_path), stream=True)
+        first = invoke_llm("prompt", config)
+        second = invoke_llm("prompt", config)
+    assert {"stream", "rate_limit"} <= first.model_info.keys()
+    assert second.model_info["cache"] == "hit"
+    assert not {"stream", "rate_limit"} & second.model_info.keys()
+
+
+def test_cache_key_covers_model_parameters(tmp_path: Path) -> None:
+    with StandInLLMServer() as server:
+        invoke_llm("prompt", server.config(cache_dir=str(tmp_path)))
+        result = invoke_llm("prompt", server.config(cache_dir=str(tmp_path), temperature=0.7))
+    assert result.model_info["cache"] == "miss"
+    assert server.requests == 2
+    assert response_key("a", "m", 0.0, None, "p") != response_key("a", "m", 0.0, 100, "p")
+
+
+def test_bypass_refreshes_instead_of_reading(tmp_path: Path) -> None:
+    with StandInLLMServer() as server:
+        config = server.config(cache_dir=str(tmp_path))
+        invoke_llm("prompt", config)
+        with bypass_response_cache():
+            refreshed = invoke_llm("prompt", config)
+        cached = invoke_llm("prompt", config)
+    assert server.requests == 2
+    assert refreshed.model_info["cache"] == "refresh"
+    assert cached.model_info["response_id"] == refreshed.model_info["response_id"]
+
+
+def test_uncached_config_records_no_cache_marker() -> None:
+    with StandInLLMServer() as server:
+        result = invoke_llm("prompt", server.config())
+    assert "cache" not in result.model_info
+
+
+def test_eviction_drops_expired_then_least_recently_used(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, max_bytes=10**6, max_age_s=3600)
+    for name in ("aa-old", "bb-used", "cc-new"):
+        cache.put(name, "x" * 100, {})
+    now = time.time()
+    os.utime(tmp_path / "aa" / "aa-old.json", (now - 7200, now - 7200))
+    os.utime(tmp_path / "bb" / "bb-used.json", (now - 60, now - 60))
+    assert cache.get("aa-old") is None
+    assert cache.get("bb-used") is not None
+
+    entry_size = (tmp_path / "cc" / "cc-new.json").stat().st_size
+    cache.max_bytes = entry_size
+    assert cache.evict() == 2
+    assert [path.name for path in tmp_path.glob("*/*.json")] == ["bb-used.json"]
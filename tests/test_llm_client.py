@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+
+import pytest
+
+from src import cli
+from src import llm_client
+from src.llm_bench import StandInLLMServer
+from src.llm_client import (
+    LLMRequestError,
+    ainvoke_llm,
+    close_connection_pools,
+    connection_pool,
+    gather_llm,
+    invoke_llm,
+    invoke_llm_many,
+    iter_sse_events,
+    load_llm_config,
+    parse_retry_after,
+    reset_circuit_breakers,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    close_connection_pools()
+    reset_circuit_breakers()
+    yield
+    close_connection_pools()
+    reset_circuit_breakers()
+
+
+@pytest.fixture
+def waits(monkeypatch) -> list[float]:
+    recorded: list[float] = []
+    monkeypatch.setattr(llm_client, "_sleep", recorded.append)
+    return recorded
+
+
+def test_invoke_llm_reuses_one_connection() -> None:
+    with StandInLLMServer() as server:
+        config = server.config()
+        results = [invoke_llm(f"prompt {index}", config) for index in range(5)]
+    assert [result.output_text for result in results] == ["ok"] * 5
+    assert results[-1].model_info["response_id"] == "resp_standin_5"
+    assert server.connections == 1
+    assert connection_pool(config).reused == 4
+
+
+def test_pool_reconnects_after_server_closes_idle_socket() -> None:
+    with StandInLLMServer(keepalive_timeout_s=0.1) as server:
+        config = server.config()
+        invoke_llm("first", config)
+        time.sleep(0.4)
+        assert invoke_llm("second", config).output_text == "ok"
+    assert server.requests == 2
+    assert server.connections == 2
+
+
+def test_pool_drops_connections_past_idle_timeout() -> None:
+    with StandInLLMServer() as server:
+        config = server.config(pool_idle_timeout_s=0.0)
+        invoke_llm("first", config)
+        invoke_llm("second", config)
+    assert server.connections == 2
+    assert connection_pool(config).reused == 0
+
+
+def test_pool_is_shared_safely_across_threads() -> None:
+    with StandInLLMServer(latency_s=0.01) as server:
+        config = server.config(pool_size=2)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda index: invoke_llm(f"prompt {index}", config), range(24)))
+    assert len({result.model_info["response_id"] for result in results}) == 24
+    assert server.requests == 24
+    assert server.connections < 24
+
+
+def test_load_llm_config_reads_pool_settings(monkeypatch) -> None:
+    monkeypatch.setenv("BOTPARTS_LLM_API_KEY", "sk-test")
+    monkeypatch.setenv("BOTPARTS_LLM_POOL_SIZE", "8")
+    monkeypatch.setenv("BOTPARTS_LLM_POOL_IDLE_TIMEOUT", "5")
+    config = load_llm_config()
+    assert config.pool_size == 8
+    assert config.pool_idle_timeout_s == 5.0
+
+
+def test_retry_honors_retry_after_and_records_stats(waits: list[float]) -> None:
+    with StandInLLMServer(failures=[(503, {"Retry-After": "2"}), (429, {"Retry-After": "1"})]) as server:
+        result = invoke_llm("prompt", server.config())
+    assert waits == [2.0, 1.0]
+    assert result.model_info["attempts"] == 3
+    assert result.model_info["retries"] == 2
+    assert result.model_info["retry_wait_s"] == 3.0
+
+
+def test_retry_backs_off_with_jitter_on_server_errors(waits: list[float]) -> None:
+    with StandInLLMServer(failures=[(500, {}), (502, {})]) as server:
+        result = invoke_llm("prompt", server.config(backoff_base_s=1.0, backoff_max_s=1.5))
+    assert result.output_text == "ok"
+    assert len(waits) == 2
+    assert 0 <= waits[0] <= 1.0
+    assert 0 <= waits[1] <= 1.5
+
+
+def test_client_errors_are_not_retried(waits: list[float]) -> None:
+    with StandInLLMServer(failures=[(400, {})]) as server:
+        with pytest.raises(LLMRequestError) as excinfo:
+            invoke_llm("prompt", server.config())
+    assert excinfo.value.status == 400
+    assert not excinfo.value.retryable
+    assert server.requests == 1
+    assert waits == []
+
+
+def test_retries_give_up_after_max_attempts(waits: list[float]) -> None:
+    with StandInLLMServer(failures=[(503, {})] * 5) as server:
+        with pytest.raises(LLMRequestError, match="gave up after 3 attempts"):
+            invoke_llm("prompt", server.config(max_attempts=3))
+    assert server.requests == 3
+    assert len(waits) == 2
+
+
+def test_timeouts_are_retried(waits: list[float]) -> None:
+    with StandInLLMServer(latency_s=0.3) as server:
+        with pytest.raises(LLMRequestError, match="gave up after 2 attempts"):
+            invoke_llm("prompt", server.config(timeout_s=0.05, max_attempts=2))
+    assert len(waits) == 1
+
+
+def test_circuit_breaker_fails_fast_until_cooldown(waits: list[float]) -> None:
+    with StandInLLMServer(failures=[(503, {})] * 3) as server:
+        config = server.config(max_attempts=1, breaker_threshold=2, breaker_cooldown_s=60.0)
+        for _ in range(2):
+            with pytest.raises(LLMRequestError, match="503"):
+                invoke_llm("prompt", config)
+        with pytest.raises(LLMRequestError, match="circuit breaker open"):
+            invoke_llm("prompt", config)
+        assert server.requests == 2
+
+        probe = server.config(max_attempts=1, breaker_threshold=2, breaker_cooldown_s=0.0)
+        with pytest.raises(LLMRequestError, match="503"):
+            invoke_llm("prompt", probe)
+        assert invoke_llm("prompt", probe).output_text == "ok"
+
+
+def test_half_open_breaker_lets_one_probe_through() -> None:
+    with StandInLLMServer(failures=[(503, {})], latency_s=0.2) as server:
+        config = server.config(max_attempts=1, breaker_threshold=1, breaker_cooldown_s=0.0)
+        with pytest.raises(LLMRequestError, match="503"):
+            invoke_llm("prompt", config)
+
+        def call(index: int) -> str:
+            try:
+                return invoke_llm(f"prompt {index}", config).output_text
+            except LLMRequestError as exc:
+                return str(exc)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            outcomes = list(executor.map(call, range(4)))
+        assert outcomes.count("ok") == 1
+        assert sum("a probe request is in flight" in outcome for outcome in outcomes) == 3
+        assert server.requests == 2
+        assert invoke_llm("after probe", config).output_text == "ok"
+
+
+def test_retry_after_beyond_backoff_limit_gives_up(waits: list[float]) -> None:
+    with StandInLLMServer(failures=[(429, {"Retry-After": "120"})]) as server:
+        with pytest.raises(LLMRequestError, match="asked to wait 120s, more than the 30s backoff limit"):
+            invoke_llm("prompt", server.config())
+    assert server.requests == 1
+    assert waits == []
+
+
+def test_parse_retry_after_accepts_seconds_and_dates() -> None:
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def test_invoke_llm_many_caps_requests_in_flight() -> None:
+    with StandInLLMServer(latency_s=0.05) as server:
+        results = invoke_llm_many([f"prompt {index}" for index in range(8)], server.config(max_in_flight=2))
+    assert [result.output_text for result in results] == ["ok"] * 8
+    assert server.requests == 8
+    assert server.peak_active == 2
+
+
+def test_invoke_llm_many_returns_failures_in_place() -> None:
+    with StandInLLMServer(failures=[(400, {})]) as server:
+        results = invoke_llm_many([f"prompt {index}" for index in range(4)], server.config(max_in_flight=1))
+    failures = [result for result in results if isinstance(result, LLMRequestError)]
+    assert len(failures) == 1
+    assert failures[0].status == 400
+    assert [result.output_text for result in results if not isinstance(result, BaseException)] == ["ok"] * 3
+    assert server.requests == 4
+
+
+def test_retry_sleeps_release_the_in_flight_slot(monkeypatch) -> None:
+    slot_free: list[bool] = []
+
+    def sleep(_: float) -> None:
+        slots = llm_client._in_flight_slots(1)
+        slot_free.append(slots.acquire(blocking=False))
+        if slot_free[-1]:
+            slots.release()
+
+    monkeypatch.setattr(llm_client, "_sleep", sleep)
+    with StandInLLMServer(failures=[(503, {"Retry-After": "1"})]) as server:
+        assert invoke_llm("prompt", server.config(max_in_flight=1)).output_text == "ok"
+    assert slot_free == [True]
+
+
+def test_ainvoke_llm_shares_cache_with_sync_client(tmp_path) -> None:
+    with StandInLLMServer() as server:
+        config = server.config(cache_dir=str(tmp_path))
+        invoke_llm("prompt", config)
+
+        async def run() -> list:
+            single = await ainvoke_llm("prompt", config)
+            return [single, *await gather_llm(["prompt", "other"], config)]
+
+        results = asyncio.run(run())
+    assert [result.model_info["cache"] for result in results] == ["hit", "hit", "miss"]
+    assert server.requests == 2
+
+
+def test_streamed_response_reports_deltas_as_they_arrive() -> None:
+    received: list[str] = []
+    with StandInLLMServer(output_text="the quick brown fox") as server:
+        config = server.config(stream=True)
+        result = invoke_llm("prompt", config, on_delta=lambda delta, _progress: received.append(delta))
+        invoke_llm("prompt", config)
+    assert received == ["the", " quick", " brown", " fox"]
+    assert result.output_text == "the quick brown fox"
+    assert result.model_info["response_id"] == "resp_standin_1"
+    assert result.model_info["stream"]["deltas"] == 4
+    assert result.model_info["stream"]["ttft_s"] is not None
+    assert server.connections == 1
+
+
+def test_stream_timeout_applies_to_inactivity_not_total_duration() -> None:
+    with StandInLLMServer(output_text="one two three four five six", delta_delay_s=0.06) as server:
+        result = invoke_llm("prompt", server.config(stream=True, timeout_s=0.2))
+    assert result.output_text == "one two three four five six"
+    assert result.model_info["stream"]["duration_s"] > 0.2
+
+
+def test_stalled_stream_is_not_retried_after_output_started(waits: list[float]) -> None:
+    received: list[str] = []
+    with StandInLLMServer(output_text="partial output here", stall_after=3, stall_s=0.5) as server:
+        config = server.config(stream=True, timeout_s=0.1)
+        with pytest.raises(LLMRequestError, match="after 14 characters: no data for 0.1s"):
+            invoke_llm("prompt", config, on_delta=lambda delta, _progress: received.append(delta))
+    assert "".join(received) == "partial output"
+    assert server.requests == 1
+    assert waits == []
+
+
+def test_iter_sse_events_handles_comments_and_multiline_data() -> None:
+    stream = [b": keep-alive\n", b"event: update\n", b"data: one\n", b"data: two\n", b"\n", b"data: [DONE]\n", b"\n"]
+    assert list(iter_sse_events(stream)) == [("update", "one\ntwo"), ("message", "[DONE]")]
+
+
+def test_cli_streams_partial_output_into_run_log(tmp_path, monkeypatch) -> None:
+    with StandInLLMServer(output_text="streamed draft text") as server:
+        monkeypatch.setenv("BOTPARTS_LLM_API_KEY", "sk-test")
+        monkeypatch.setenv("BOTPARTS_LLM_API_BASE", server.api_base)
+        monkeypatch.setenv("BOTPARTS_LLM_STREAM", "1")
+        output_path = tmp_path / "runs" / "run-1" / "output.md"
+        result = cli._invoke_llm("prompt", label="Elaboration", partial_output=output_path)
+    assert result.model_info["stream"]["deltas"] == 3
+    assert output_path.read_text(encoding="utf-8") == "streamed draft text"
+
+
+def _breaker_config(**overrides) -> llm_client.LLMConfig:
+    return llm_client.LLMConfig(
+        api_key="test",
+        api_base="http://127.0.0.1:9",
+        model="stub",
+        temperature=0.0,
+        max_output_tokens=None,
+        timeout_s=1.0,
+        provider="openai",
+        **overrides,
+    )
+
+
+def test_breaker_ignores_results_from_calls_started_before_it_opened() -> None:
+    config = _breaker_config(breaker_threshold=1, breaker_cooldown_s=0.0)
+    breaker = llm_client.CircuitBreaker()
+    assert breaker.check(config) is None  # A slow call starts while closed.
+    breaker.record(config, ok=False)
+    assert breaker.opened_at is not None
+
+    probe = breaker.check(config)
+    assert probe is not None
+    breaker.record(config, ok=True)  # The slow call finishes late.
+    assert breaker.opened_at is not None
+    assert breaker.probe is probe
+    breaker.abandon_probe(None)
+    assert breaker.probe is probe
+
+    breaker.record(config, ok=False, probe=probe)
+    assert breaker.probe is None
+    reopened_at = breaker.opened_at
+    breaker.record(config, ok=False)  # Another stale failure does not restart the cooldown.
+    assert breaker.opened_at == reopened_at
+
+    probe = breaker.check(config)
+    breaker.record(config, ok=True, probe=probe)
+    assert breaker.opened_at is None
+    assert breaker.failures == 0
+
+
+
+def test_malformed_stream_event_keeps_partial_output(tmp_path, monkeypatch, waits: list[float]) -> None:
+    real_iter_sse_events = llm_client.iter_sse_events
+
+    def corrupt_fourth_event(lines):
+        for index, (event, data) in enumerate(real_iter_sse_events(lines)):
+            yield event, ("{not json" if index == 3 else data)
+
+    monkeypatch.setattr(llm_client, "iter_sse_events", corrupt_fourth_event)
+    with StandInLLMServer(output_text="partial output here") as server:
+        monkeypatch.setenv("BOTPARTS_LLM_API_KEY", "sk-test")
+        monkeypatch.setenv("BOTPARTS_LLM_API_BASE", server.api_base)
+        monkeypatch.setenv("BOTPARTS_LLM_STREAM", "1")
+        output_path = tmp_path / "runs" / "run-1" / "output.md"
+        with pytest.raises(LLMRequestError, match="after 14 characters: malformed event data"):
+            cli._invoke_llm("prompt", label="Elaboration", partial_output=output_path)
+    assert output_path.read_text(encoding="utf-8") == "partial output"
+    assert server.requests == 1
+    assert waits == []
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+
+from src import llm_client
+from src import llm_ratelimit
+from src.llm_bench import StandInLLMServer
+from src.llm_client import close_connection_pools, invoke_llm, load_llm_config, reset_circuit_breakers
+from src.llm_ratelimit import RateLimiter, estimate_request_tokens, parse_reset_duration, reset_rate_limiters
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    close_connection_pools()
+    reset_circuit_breakers()
+    reset_rate_limiters()
+    yield
+    close_connection_pools()
+    reset_circuit_breakers()
+    reset_rate_limiters()
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    # Fake clock: sleeping advances time instantly.
+    now = [1000.0]
+    recorded: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        recorded.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(llm_ratelimit, "_clock", lambda: now[0])
+    monkeypatch.setattr(llm_ratelimit, "_sleep", fake_sleep)
+    return recorded
+
+
+def test_request_bucket_allows_a_minute_of_burst_then_paces(sleeps: list[float]) -> None:
+    limiter = RateLimiter()
+    limiter.configure(rpm=2, tpm=None)
+    assert limiter.acquire(10) == 0.0
+    assert limiter.acquire(10) == 0.0
+    assert limiter.utilization() == {"requests": 1.0}
+    assert limiter.acquire(10) == pytest.approx(30.0)
+    assert sleeps == [pytest.approx(30.0)]
+
+
+def test_token_bucket_paces_by_estimated_tokens(sleeps: list[float]) -> None:
+    limiter = RateLimiter()
+    limiter.configure(rpm=None, tpm=600)
+    limiter.acquire(500)
+    assert limiter.acquire(200) == pytest.approx(10.0)
+    # A request larger than the whole minute waits for a full bucket, not forever.
+    assert limiter.acquire(5000) == pytest.approx(60.0)
+
+
+def test_invoke_llm_waits_for_rpm_and_reports_utilization(sleeps: list[float]) -> None:
+    with StandInLLMServer() as server:
+        config = server.config(rpm=2, max_output_tokens=50)
+        results = [invoke_llm("prompt", config) for _ in range(3)]
+    assert [result.model_info["rate_limit"]["wait_s"] for result in results] == [0.0, 0.0, 30.0]
+    assert llm_client.rate_limit_utilization(config) == {"requests": 1.0}
+    assert results[0].model_info["rate_limit"]["estimated_tokens"] == 52
+    assert results[1].model_info["rate_limit"]["utilization"] == {"requests": 1.0}
+
+
+def test_rate_limit_headers_enable_and_tighten_limits(sleeps: list[float]) -> None:
+    headers = {"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0"}
+    with StandInLLMServer(response_headers=headers) as server:
+        config = server.config()
+        first = invoke_llm("prompt", config)
+        second = invoke_llm("prompt", config)
+    assert first.model_info["rate_limit"] == {"estimated_tokens": 1026, "wait_s": 0.0, "utilization": {"requests": 1.0}}
+    assert second.model_info["rate_limit"]["wait_s"] == pytest.approx(1.0)
+
+
+def test_429_without_retry_after_waits_for_the_reset_header(monkeypatch) -> None:
+    waits: list[float] = []
+    monkeypatch.setattr(llm_client, "_sleep", waits.append)
+    failure = {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "1m30s"}
+    with StandInLLMServer(failures=[(429, failure)]) as server:
+        result = invoke_llm("prompt", server.config(backoff_max_s=120.0))
+    assert waits == [90.0]
+    assert result.model_info["retry_wait_s"] == 90.0
+
+
+def test_rate_limit_helpers(monkeypatch) -> None:
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("soon") is None
+    assert estimate_request_tokens("abcd efgh", None) == 2 + llm_ratelimit.DEFAULT_OUTPUT_TOKEN_RESERVE
+
+    monkeypatch.setenv("BOTPARTS_LLM_API_KEY", "sk-test")
+    monkeypatch.setenv("BOTPARTS_LLM_RPM", "500")
+    monkeypatch.setenv("BOTPARTS_LLM_TPM", "")
+    config = load_llm_config()
+    assert (config.rpm, config.tpm) == (500.0, None)
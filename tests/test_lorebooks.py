@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from src.emitter import CHANGED_FILES_NAME
+from src.exporter import ExportOptions
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
+
+
+def _seed_with_book_and_variants(workspace: Path) -> None:
+    character_dir = seed_character_sources(workspace, slug="example-bot")
+    entry_dir = character_dir / "fragments" / "entries" / "locations"
+    entry_dir.mkdir(parents=True)
+    (entry_dir / "harbor.md").write_text("---\ntitle: Harbor\n---\n\nA busy harbor.\n", encoding="utf-8")
+    for variant in ("calm", "stern"):
+        variant_dir = character_dir / "variants" / variant
+        variant_dir.mkdir(parents=True)
+        (variant_dir / "spec_v2_fields.md").write_text(json.dumps({"personality": variant}), encoding="utf-8")
+
+
+def _cards(character_root: Path, pattern: str) -> dict[str, dict]:
+    return {path.relative_to(character_root).as_posix(): load_json(path) for path in character_root.rglob(pattern)}
+
+
+def test_shared_layout_stores_inherited_book_once(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed_with_book_and_variants(workspace)
+    export_root = workspace / "dist" / "src" / "export"
+    character_root = export_root / "characters" / "example-bot"
+    build_site_data(workspace, incremental=True)
+    inline_cards = _cards(character_root, "spec_v2.*.json")
+
+    options = ExportOptions(lorebook_layout="shared")
+    summary = build_site_data(workspace, incremental=True, export_options=options)
+    assert summary.lorebook_bytes_referenced > summary.lorebook_bytes_stored
+    shared_cards = _cards(character_root, "spec_v2.*.json")
+    assert shared_cards.keys() == inline_cards.keys()
+    refs = {card["data"]["extensions"]["botparts"]["lorebookRef"] for card in shared_cards.values()}
+    assert len(refs) == 1
+    for name, card in shared_cards.items():
+        book = load_json(export_root / card["data"]["extensions"]["botparts"].pop("lorebookRef"))
+        assert "character_book" not in card["data"]
+        card["data"]["character_book"] = book
+        assert card == inline_cards[name]
+    assert "## Lorebook Store" in (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+
+    build_site_data(workspace, incremental=True, export_options=options)
+    assert (workspace / "dist" / CHANGED_FILES_NAME).read_text(encoding="utf-8") == ""
+
+    build_site_data(workspace, incremental=True)
+    assert not (export_root / "lorebooks").exists()
+    assert _cards(character_root, "spec_v2.*.json") == inline_cards
+
+
+def test_both_layout_keeps_inline_cards(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed_with_book_and_variants(workspace)
+    character_root = workspace / "dist" / "src" / "export" / "characters" / "example-bot"
+    build_site_data(workspace)
+    inline_cards = _cards(character_root, "spec_v2.*.json")
+
+    build_site_data(workspace, export_options=ExportOptions(lorebook_layout="both"))
+    both_cards = _cards(character_root, "spec_v2.*.inline.json")
+    assert {name.replace(".inline", "") for name in both_cards} == set(inline_cards)
+    for name, card in both_cards.items():
+        assert card == inline_cards[name.replace(".inline", "")]
+
+
+def test_precompressed_shared_books_report_matches_clean_build(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    _seed_with_book_and_variants(workspace)
+    options = ExportOptions(precompress=True, lorebook_layout="shared")
+    report_path = workspace / "dist" / "REPORT.md"
+    build_site_data(workspace, export_options=options)
+    clean_report = report_path.read_text(encoding="utf-8")
+
+    build_site_data(workspace, incremental=True, export_options=options)
+    assert report_path.read_text(encoding="utf-8") == clean_report
+    assert "- JSON files with .gz siblings: " in clean_report
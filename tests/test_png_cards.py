@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+import json
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+
+from src import png_cards
+from src.exporter import ExportOptions
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
+
+
+def _tiny_png() -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\xff\x00\x00")
+    return png_cards.PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+
+def _embed(png_bytes: bytes, card_json: str, mode: str) -> bytes:
+    target = io.BytesIO()
+    png_cards.stream_card_png(io.BytesIO(png_bytes), target, png_cards.card_chunk(card_json, mode))
+    return target.getvalue()
+
+
+@pytest.mark.parametrize("mode", ["text", "ztxt", "itxt"])
+def test_card_chunk_round_trips_and_replaces_existing(mode: str) -> None:
+    first = _embed(_tiny_png(), '{"name":"Old"}', "text")
+    second = _embed(first, '{"name":"Échó"}', mode)
+    assert png_cards.read_card_json(second) == '{"name":"Échó"}'
+    assert second.count(b"chara\x00") == 1
+    assert second.endswith(_tiny_png()[-12:])
+
+
+def test_crc_mismatch_is_rejected() -> None:
+    corrupted = bytearray(_tiny_png())
+    corrupted[len(png_cards.PNG_SIGNATURE) + 10] ^= 0xFF
+    with pytest.raises(ValueError, match="CRC mismatch"):
+        _embed(bytes(corrupted), "{}", "text")
+
+
+def test_build_emits_png_cards(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    character_dir = seed_character_sources(workspace, slug="example-bot")
+    variant_dir = character_dir / "variants" / "calm"
+    variant_dir.mkdir(parents=True)
+    (variant_dir / "spec_v2_fields.md").write_text(json.dumps({"personality": "Calm."}), encoding="utf-8")
+    entry_dir = character_dir / "fragments" / "entries" / "locations"
+    entry_dir.mkdir(parents=True)
+    (entry_dir / "harbor.md").write_text("---\ntitle: Harbor\n---\n\nA busy harbor.\n", encoding="utf-8")
+    (workspace / "sources" / "image_inputs" / "example-bot.png").write_bytes(_tiny_png())
+    build_site_data(workspace, export_options=ExportOptions(png_cards="ztxt", lorebook_layout="shared"))
+
+    character_root = workspace / "dist" / "src" / "export" / "characters" / "example-bot"
+    for card_root in (character_root, character_root / "variants" / "calm"):
+        for prose_variant in ("schema-like", "hybrid"):
+            card = json.loads(png_cards.read_card_json((card_root / f"spec_v2.{prose_variant}.png").read_bytes()))
+            assert card["data"]["name"] == load_json(card_root / f"spec_v2.{prose_variant}.json")["data"]["name"]
+            # PNG cards stay self-contained even with a shared lorebook layout.
+            assert "lorebookRef" not in card["data"]["extensions"]["botparts"]
+            assert card["data"]["character_book"]["entries"]
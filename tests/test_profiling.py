@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
+
+
+def test_profile_reports_phases_and_characters(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    summary = build_site_data(workspace, profile=True)
+
+    report_text = (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+    assert "## Performance" in report_text
+    assert "  - example-bot: " in report_text
+
+    profile = load_json(workspace / "dist" / "build_profile.json")
+    assert {"discovery", "manifests", "export", "export.cards", "export.serialize"} <= set(profile["phases"])
+    character = profile["characters"]["example-bot"]
+    assert character["files"] > 0
+    assert character["bytesWritten"] > 0
+    assert profile["filesWritten"] == profile["files"]
+    assert summary.profile is not None
+
+
+def test_default_build_has_no_profile(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+
+    assert "## Performance" not in (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+    assert not (workspace / "dist" / "build_profile.json").exists()
+
+
+def test_parallel_profile_merges_worker_timings(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="alpha")
+    seed_character_sources(workspace, slug="beta")
+    build_site_data(workspace, jobs=2, cprofile=True)
+
+    profile = load_json(workspace / "dist" / "build_profile.json")
+    assert set(profile["characters"]) >= {"alpha", "beta"}
+    assert profile["phases"]["export.cards"]["calls"] >= 4
+    assert (workspace / "dist" / "build_profile.prof").exists()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.emitter import Emitter
+from src.generator import build_site_data
+from src.search import SearchIndex, catalogue_document, tokenize, write_search_index
+from tests.conftest import _copy_repo_for_build, seed_character_sources
+
+
+def test_tokenize_drops_stopwords_and_short_tokens() -> None:
+    assert tokenize("The Harbor-Master's log, vol. 2") == ["harbor", "master", "log", "vol"]
+
+
+def test_bm25_ranks_name_matches_first(tmp_path: Path) -> None:
+    entries = [
+        {"slug": "a-bot", "name": "Ember", "description": "A quiet archivist.", "tags": ["calm"]},
+        {"slug": "b-bot", "name": "Willow", "description": "Keeps the ember of the old forge alive.", "tags": []},
+        {"slug": "c-bot", "name": "Raven", "description": "A courier.", "tags": ["ember"]},
+    ]
+    search_root = tmp_path / "search"
+    write_search_index(
+        Emitter(tmp_path),
+        search_root,
+        [entry["slug"] for entry in entries],
+        [catalogue_document(entry) for entry in entries],
+    )
+    index = SearchIndex(search_root)
+    assert [slug for slug, _ in index.search("ember")] == ["a-bot", "c-bot", "b-bot"]
+    assert index.search("nonexistent") == []
+
+
+def test_lorebook_contents_are_optional(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    character_dir = seed_character_sources(workspace, slug="example-bot")
+    entry_dir = character_dir / "fragments" / "entries" / "locations"
+    entry_dir.mkdir(parents=True)
+    (entry_dir / "lighthouse.md").write_text("---\ntitle: Lighthouse\n---\n\nA zanzibarite lighthouse.\n", encoding="utf-8")
+    search_root = workspace / "dist" / "src" / "data" / "search"
+
+    build_site_data(workspace)
+    assert SearchIndex(search_root).search("zanzibarite") == []
+    assert SearchIndex(search_root).search("example")[0][0] == "example-bot"
+
+    build_site_data(workspace, search_lorebooks=True)
+    assert [slug for slug, _ in SearchIndex(search_root).search("zanzibarite")] == ["example-bot"]
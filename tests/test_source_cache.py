@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from src import authoring
+from src.generator import build_site_data
+from src.source_cache import SourceCache, use_source_cache
+from tests.conftest import _copy_repo_for_build, seed_character_sources
+
+
+def test_source_cache_reuses_parsed_spec_fields(tmp_path: Path) -> None:
+    spec_path = tmp_path / "spec_v2_fields.md"
+    spec_path.write_text(json.dumps({"name": "Echo"}), encoding="utf-8")
+    cache = SourceCache()
+    with use_source_cache(cache):
+        first = authoring.load_spec_fields(spec_path)
+        first["name"] = "Mutated"
+        second = authoring.load_spec_fields(spec_path)
+    assert second == {"name": "Echo"}
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_source_cache_invalidates_on_change(tmp_path: Path) -> None:
+    spec_path = tmp_path / "spec_v2_fields.md"
+    spec_path.write_text(json.dumps({"name": "Echo"}), encoding="utf-8")
+    cache = SourceCache()
+    with use_source_cache(cache):
+        authoring.load_spec_fields(spec_path)
+        spec_path.write_text(json.dumps({"name": "Echo Two"}), encoding="utf-8")
+        stat = spec_path.stat()
+        os.utime(spec_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert authoring.load_spec_fields(spec_path) == {"name": "Echo Two"}
+    assert cache.stats.misses == 2
+
+
+def test_build_reports_cache_stats_when_requested(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    summary = build_site_data(workspace)
+    report_text = (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+    assert "## Source Cache" not in report_text
+    assert summary.cache_stats is not None and summary.cache_stats.hits > 0
+
+    build_site_data(workspace, cache_stats=True)
+    report_text = (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+    assert "## Source Cache" in report_text
+    assert f"- Hits: {summary.cache_stats.hits}" in report_text
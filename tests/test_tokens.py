@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from src import tokens
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
+
+
+def test_approx_estimator_counts_words_and_punctuation() -> None:
+    estimator = tokens.ApproxEstimator()
+    assert estimator.count("") == 0
+    assert estimator.count("Hi, lighthouse keeper!") == 1 + 1 + 3 + 2 + 1
+    assert estimator.count("灯台") == 2
+
+
+def test_counts_are_cached_across_builds(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="example-bot")
+    build_site_data(workspace)
+
+    manifest = load_json(workspace / "dist" / "src" / "export" / "characters" / "example-bot" / "manifest.json")
+    breakdown = manifest["x"]["aiTokenBreakdown"]
+    assert breakdown["estimator"] == tokens.ApproxEstimator.name
+    assert set(breakdown["fields"]) == {*tokens.TOKEN_FIELDS, tokens.LOREBOOK_FIELD}
+    assert breakdown["fields"]["description"] > 0
+    assert manifest["x"]["aiTokens"] == breakdown["total"] == sum(breakdown["fields"].values())
+    catalogue = load_json(workspace / "dist" / "src" / "data" / "catalogue.json")
+    entry = next(item for item in catalogue["entries"] if item["slug"] == "example-bot")
+    assert entry["aiTokenBreakdown"] == breakdown
+
+    cache_path = workspace / "dist" / tokens.TOKEN_CACHE_FILENAME
+    counter = tokens.load_token_counter(cache_path, tokens.ApproxEstimator())
+    assert counter.counts
+    assert counter.count_card({"description": "An example character for generator tests."}, None)["total"]
+    assert counter.hits == 1 and counter.misses == 0
+
+
+def test_parallel_build_matches_serial_counts(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    for slug in ("alpha-bot", "beta-bot"):
+        seed_character_sources(workspace, slug=slug)
+    catalogue_path = workspace / "dist" / "src" / "data" / "catalogue.json"
+    cache_path = workspace / "dist" / tokens.TOKEN_CACHE_FILENAME
+
+    build_site_data(workspace)
+    serial = catalogue_path.read_bytes()
+    serial_cache = cache_path.read_bytes()
+    cache_path.unlink()
+    build_site_data(workspace, jobs=2)
+    assert catalogue_path.read_bytes() == serial
+    assert cache_path.read_bytes() == serial_cache
+
+
+def test_token_cache_keeps_only_texts_still_in_use(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="alpha-bot")
+    beta_dir = seed_character_sources(workspace, slug="beta-bot")
+    cache_path = workspace / "dist" / tokens.TOKEN_CACHE_FILENAME
+    build_site_data(workspace, incremental=True)
+    before = load_json(cache_path)["counts"]
+
+    spec_path = beta_dir / "canonical" / "spec_v2_fields.md"
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    old_key = tokens._text_key(spec["description"])
+    spec["description"] = "A rewritten description."
+    spec_path.write_text(json.dumps(spec), encoding="utf-8")
+    build_site_data(workspace, incremental=True)
+
+    after = load_json(cache_path)["counts"]
+    new_key = tokens._text_key("A rewritten description.")
+    assert new_key in after
+    # alpha-bot was retained from the ledger and still shares the old text.
+    assert old_key in after
+    assert set(after) == set(before) | {new_key}
+
+    alpha_spec = workspace / "sources" / "characters" / "alpha-bot" / "canonical" / "spec_v2_fields.md"
+    alpha = json.loads(alpha_spec.read_text(encoding="utf-8"))
+    alpha["description"] = "Another description."
+    alpha_spec.write_text(json.dumps(alpha), encoding="utf-8")
+    build_site_data(workspace, incremental=True)
+    assert old_key not in load_json(cache_path)["counts"]
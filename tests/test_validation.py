@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from src import validation
+from src.exporter import ExportOptions
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, seed_character_sources
+
+
+def test_validator_reports_json_pointers() -> None:
+    payload = {"slug": "Bad Slug"}
+    warnings, count = validation.validate_payload(payload, validation.MANIFEST_SCHEMA, "bad", "manifest.json")
+    assert any(" at /slug (manifest.schema.json): " in warning for warning in warnings)
+    assert any(" at / (manifest.schema.json): 'name' is a required property" in warning for warning in warnings)
+    assert count == len(warnings)
+
+
+def test_validator_counts_violations_past_the_warning_cap() -> None:
+    payload = {"slug": "bad", "tags": list(range(validation.MAX_VIOLATIONS_PER_DOCUMENT + 5))}
+    warnings, count = validation.validate_payload(payload, validation.MANIFEST_SCHEMA, "bad", "manifest.json")
+    assert len(warnings) == validation.MAX_VIOLATIONS_PER_DOCUMENT + 1
+    assert warnings[-1].endswith("more schema violations in manifest.json omitted.")
+    assert count > validation.MAX_VIOLATIONS_PER_DOCUMENT + 5
+
+
+def test_validate_build_flags_bad_manifest(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="alpha-bot")
+    character_dir = seed_character_sources(workspace, slug="beta-bot")
+    (character_dir / "manifest.json").write_text(
+        json.dumps({"slug": "beta-bot", "name": "Beta Bot", "redistributeAllowed": "maybe"}),
+        encoding="utf-8",
+    )
+    summary = build_site_data(workspace, jobs=2, export_options=ExportOptions(validate=True))
+
+    violations = [warning for warning in summary.warnings if validation.VIOLATION_LABEL in warning]
+    assert violations
+    assert any(warning.startswith("[beta-bot] ") and " at /redistributeAllowed " in warning for warning in violations)
+    # No upstream catalogue schema exists, so only manifests are checked.
+    assert not any(warning.startswith("[catalogue] ") for warning in violations)
+    assert not any(warning.startswith("[alpha-bot] ") for warning in violations)
+    report_text = (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+    assert "## Validation" in report_text
+    assert f"- Violations: {len(violations)}" in report_text
+    assert "- Catalogue: not validated (no upstream catalogue schema" in report_text
+
+    # Retained characters keep their violation count on an incremental rebuild.
+    build_site_data(workspace, incremental=True, export_options=ExportOptions(validate=True))
+    assert f"- Violations: {len(violations)}" in (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
+
+    build_site_data(workspace)
+    assert "## Validation" not in (workspace / "dist" / "REPORT.md").read_text(encoding="utf-8")
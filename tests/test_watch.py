@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src import ledger
+from src import watch
+from src.generator import build_site_data
+from tests.conftest import _copy_repo_for_build, load_json, seed_character_sources
+
+
+def test_affected_sources_maps_paths_to_owners(tmp_path: Path) -> None:
+    characters_root = tmp_path / "sources" / "characters"
+    paths = {
+        characters_root / "alpha" / "canonical" / "spec_v2_fields.md",
+        characters_root / "beta" / "variants" / "calm" / "spec_v2_fields.md",
+    }
+    assert watch.affected_sources(tmp_path, paths) == {"alpha", "beta"}
+    assert watch.affected_sources(tmp_path, paths | {tmp_path / "sources" / "image_inputs" / "alpha.png"}) is None
+    assert watch.affected_sources(tmp_path, {tmp_path / "src" / "spec_v2_template.json"}) is None
+
+
+def test_scan_skips_authoring_runs(tmp_path: Path) -> None:
+    character_dir = seed_character_sources(tmp_path, slug="alpha")
+    before = watch.scan(tmp_path)
+    (character_dir / "runs").mkdir()
+    (character_dir / "runs" / "log.json").write_text("{}", encoding="utf-8")
+    assert watch.changed_paths(before, watch.scan(tmp_path)) == set()
+
+    spec_path = character_dir / "canonical" / "spec_v2_fields.md"
+    spec_path.write_text(spec_path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert watch.changed_paths(before, watch.scan(tmp_path)) == {spec_path}
+
+
+def test_changed_sources_skip_hashing_other_characters(
+    tmp_path: Path, repo_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="alpha")
+    beta_dir = seed_character_sources(workspace, slug="beta")
+    build_site_data(workspace, incremental=True)
+
+    hashed: list[str] = []
+    original = ledger.hash_character_inputs
+
+    def spy(source_dir: Path, *args: object, **kwargs: object) -> str:
+        hashed.append(source_dir.name)
+        return original(source_dir, *args, **kwargs)
+
+    monkeypatch.setattr(ledger, "hash_character_inputs", spy)
+    spec_path = beta_dir / "canonical" / "spec_v2_fields.md"
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    spec["personality"] = "Edited while watching."
+    spec_path.write_text(json.dumps(spec), encoding="utf-8")
+    build_site_data(workspace, incremental=True, changed_sources={"beta"})
+
+    assert hashed == ["beta"]
+    card = load_json(workspace / "dist" / "src" / "export" / "characters" / "beta" / "spec_v2.schema-like.json")
+    assert card["data"]["personality"] == "Edited while watching."
+    assert (workspace / "dist" / "src" / "export" / "characters" / "alpha" / "manifest.json").exists()
+
+
+def test_changed_sources_match_directories_not_slugs(tmp_path: Path, repo_root: Path) -> None:
+    workspace = _copy_repo_for_build(tmp_path, repo_root)
+    seed_character_sources(workspace, slug="alpha")
+    character_dir = seed_character_sources(workspace, slug="beta")
+    renamed_dir = character_dir.with_name("beta-draft")
+    character_dir.rename(renamed_dir)
+    build_site_data(workspace, incremental=True)
+
+    spec_path = renamed_dir / "canonical" / "spec_v2_fields.md"
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    spec["personality"] = "Edited in a renamed directory."
+    spec_path.write_text(json.dumps(spec), encoding="utf-8")
+    changed_sources = watch.affected_sources(workspace, {spec_path})
+    assert changed_sources == {"beta-draft"}
+    build_site_data(workspace, incremental=True, changed_sources=changed_sources)
+
+    card = load_json(workspace / "dist" / "src" / "export" / "characters" / "beta" / "spec_v2.schema-like.json")
+    assert card["data"]["personality"] == "Edited in a renamed directory."
+
+
+def test_watch_debounces_and_rebuilds_owner(tmp_path: Path) -> None:
+    character_dir = seed_character_sources(tmp_path, slug="alpha")
+    spec_path = character_dir / "canonical" / "spec_v2_fields.md"
+    rebuilds: list[set[str] | None] = []
+    ticks = iter(range(100))
+
+    def fake_sleep(_: float) -> None:
+        tick = next(ticks)
+        if tick in (0, 1):
+            # Two saves in a row should collapse into one rebuild.
+            spec_path.write_text(spec_path.read_text(encoding="utf-8") + " ", encoding="utf-8")
+
+    watch.watch(
+        tmp_path,
+        rebuilds.append,
+        should_stop=lambda: len(rebuilds) >= 2,
+        log=lambda _: None,
+        sleep=fake_sleep,
+    )
+    assert rebuilds == [None, {"alpha"}]